@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+GUI performance harness for the Tkinter app 🖥️⏱️
+
+Runs WifeyMOOCApp under a virtual X display (Xvfb) and walks it through whole
+courses with the real display_question / check_answer / next_question calls,
+recording per question:
+
+    render_ms   display_question (or next_question) until Tk has drawn it
+    settle_ms   the same, until the last background thumbnail is in the grid too
+    check_ms    check_answer with the default (untouched) answers, until drawn
+    rss_mb      process RSS afterwards, plus the live Tk images (count / bytes)
+
+Each course runs in a fresh process, so its peak RSS is its own. Timings are
+the median of --repeat passes; the first pass is also kept as *_cold_ms (empty
+caches, modules still being imported).
+
+Usage:
+    python3 benchmarks/bench_gui.py -o gui-before.json
+    python3 benchmarks/bench_gui.py -o gui-after.json --compare gui-before.json
+    python3 benchmarks/bench_gui.py "Sample Exercise/A2-1-PrideAvecMaPetiteAmie.json" -r 5
+
+Needs Xvfb (apt install xvfb), unless --display points at a running X server.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from benchutil import ROOT, load_app
+
+DEFAULT_COURSES = [
+    os.path.join(ROOT, "testfile-complete.json"),
+    os.path.join(ROOT, "Sample Exercise", "A2-1-PrideAvecMaPetiteAmie.json"),
+]
+SETTLE_TIMEOUT_S = 10.0 # Give up waiting for thumbnails after this long
+
+
+def start_xvfb(screen="1280x1024x24"):
+    """Start Xvfb on a free display; returns (process, ':N')"""
+    if not shutil.which("Xvfb"):
+        sys.exit("✗ Xvfb not found. Install it (e.g. apt install xvfb) or pass --display for a running X server")
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-screen", "0", screen, "-nolisten", "tcp"],
+                            pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()  # Written once the server accepts connections
+    if not number:
+        proc.kill()
+        sys.exit("✗ Xvfb failed to start")
+    return proc, f":{number}"
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def run_course(course, repeat):
+    """Walk one course `repeat` times inside this process; returns its report section"""
+    import tkinter as tk
+    from tkinter import messagebox
+
+    started = time.perf_counter()
+    wm = load_app()
+    # Dialogs are modal and would wait for a click forever
+    dialogs = []
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(messagebox, name, lambda title, message, *a, **kw: dialogs.append((title, message)))
+
+    root = tk.Tk()
+    root.geometry("1200x900")
+    app = wm.WifeyMOOCApp(root, autosave=False)
+    root.update()
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    def drawn():
+        root.update()
+
+    def settled():
+        deadline = time.perf_counter() + SETTLE_TIMEOUT_S
+        while app.thumbnails.waiting and time.perf_counter() < deadline:
+            time.sleep(0.002)
+            root.update()
+
+    start = time.perf_counter()
+    app.load_questions_from_file(course)  # Shows question 1
+    drawn()
+    load_ms = (time.perf_counter() - start) * 1000
+    settled()
+
+    passes = []
+    for run in range(repeat):
+        rows = []
+        for index, question in enumerate(app.questions):
+            start = time.perf_counter()
+            if index == 0:
+                if run > 0:
+                    app.current_question = 0
+                    app.score = 0
+                    app.display_question()
+            else:
+                app.next_question()
+            drawn()
+            render_ms = (time.perf_counter() - start) * 1000
+            settled()
+            settle_ms = (time.perf_counter() - start) * 1000
+            if index == 0 and run == 0:
+                render_ms = settle_ms = load_ms  # Question 1 came up with the course itself
+
+            start = time.perf_counter()
+            app.check_answer()
+            drawn()
+            check_ms = (time.perf_counter() - start) * 1000
+
+            images = app.images.stats()
+            rows.append({"render_ms": render_ms, "settle_ms": settle_ms, "check_ms": check_ms,
+                         "rss_mb": current_rss_mb(), "tk_images": images["count"], "tk_image_bytes": images["bytes"]})
+        passes.append(rows)
+
+    questions = []
+    for index, question in enumerate(app.questions):
+        runs = [rows[index] for rows in passes]
+        questions.append({
+            "index": index,
+            "type": question.get("type"),
+            **{key: statistics.median(r[key] for r in runs) for key in ("render_ms", "settle_ms", "check_ms")},
+            **{f"{key[:-3]}_cold_ms": runs[0][key] for key in ("render_ms", "settle_ms", "check_ms")},
+            **{key: runs[-1][key] for key in ("rss_mb", "tk_images", "tk_image_bytes")},
+        })
+
+    app.thumbnails.close()
+    root.destroy()
+    return {
+        "course": os.path.relpath(course, ROOT),
+        "questions": questions,
+        "startup_ms": startup_ms,
+        "load_ms": load_ms,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KB on Linux
+        "dialogs": len(dialogs),
+    }
+
+
+def summarize(courses):
+    """Median timings per question type, over every course"""
+    by_type = {}
+    for course in courses:
+        for q in course["questions"]:
+            by_type.setdefault(q["type"], []).append(q)
+    return {qtype: {"count": len(qs),
+                    **{key: statistics.median(q[key] for q in qs) for key in ("render_ms", "settle_ms", "check_ms")}}
+            for qtype, qs in sorted(by_type.items())}
+
+
+def metadata(repeat, display):
+    def version(module):
+        try:
+            return __import__(module).__version__
+        except Exception:
+            return None
+    try:
+        revision = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT,
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    import tkinter
+    return {
+        "revision": revision,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "tk": str(tkinter.TkVersion),
+        "pillow": version("PIL"),
+        "numpy": version("numpy"),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "display": display,
+    }
+
+
+def compare(report, baseline):
+    """Print per-type medians next to a baseline report"""
+    print(f"\nvs {baseline['meta'].get('revision')} ({baseline['meta'].get('date')})")
+    print(f"{'type':<26} {'render':>18} {'settle':>18} {'check':>18}")
+    for qtype, now in report["by_type"].items():
+        before = baseline["by_type"].get(qtype)
+        cells = []
+        for key in ("render_ms", "settle_ms", "check_ms"):
+            if before and before[key]:
+                cells.append(f"{now[key]:7.1f} ({(now[key] / before[key] - 1) * 100:+5.0f}%)")
+            else:
+                cells.append(f"{now[key]:7.1f}    (new)")
+        print(f"{qtype:<26} {cells[0]:>18} {cells[1]:>18} {cells[2]:>18}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure WifeyMOOCApp render / check latency under Xvfb")
+    parser.add_argument("courses", nargs="*", help="Question files (default: testfile-complete.json and the sample course)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Passes over each course (default: 3)")
+    parser.add_argument("-o", "--output", default="gui-benchmark.json", help="JSON report to write")
+    parser.add_argument("--compare", metavar="REPORT", help="Earlier JSON report to compare against")
+    parser.add_argument("--display", help="Use this X display instead of starting Xvfb")
+    parser.add_argument("--run-course", help=argparse.SUPPRESS)  # Used for the per-course subprocesses
+    args = parser.parse_args()
+
+    if args.run_course:
+        print(json.dumps(run_course(args.run_course, args.repeat)))
+        return
+
+    xvfb = None
+    display = args.display
+    if display is None:
+        xvfb, display = start_xvfb()
+    env = dict(os.environ, DISPLAY=display)
+    try:
+        courses = []
+        for course in (args.courses or DEFAULT_COURSES):
+            course = os.path.abspath(course)
+            print(f"⏱️  {os.path.relpath(course, ROOT)} ...", flush=True)
+            out = subprocess.run([sys.executable, __file__, "--run-course", course, "-r", str(args.repeat)],
+                                 env=env, check=True, capture_output=True, text=True).stdout
+            courses.append(json.loads(out.strip().splitlines()[-1]))
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    report = {"meta": metadata(args.repeat, display), "courses": courses, "by_type": summarize(courses)}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for course in courses:
+        print(f"\n📚 {course['course']}: startup {course['startup_ms']:.0f} ms, "
+              f"load {course['load_ms']:.0f} ms, peak RSS {course['peak_rss_mb']:.1f} MB")
+        for q in course["questions"]:
+            print(f"   Q{q['index'] + 1:<3} {q['type']:<26} render {q['render_ms']:7.1f} ms  "
+                  f"settle {q['settle_ms']:7.1f} ms  check {q['check_ms']:6.1f} ms  {q['tk_images']:3d} Tk images")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    print(f"\n✓ Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
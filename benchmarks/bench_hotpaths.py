@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the non-GUI hot paths 🔥⏱️
+
+Times the code that runs without a window, against synthetic inputs (made with
+gen_synthetic.py) of growing size:
+
+    flashcards   ParleyParser.load_file, FlashcardSession.load_progress,
+                 start_session, record_answer and save_progress, at each --cards size
+    quiz files   load_question_file, at each --items size (questions per type)
+    worksheets   ExerciseToPaper.generate_html (cold and warm image cache) and
+                 generate_docx, at each --items size
+
+For every case it prints p50/p90/p99 latency, throughput, peak traced memory
+and the allocations the result holds on to. A case whose cost per item grows
+more than --scaling times from the smallest to the largest size is flagged, and
+--compare flags p50 regressions against an earlier JSON report.
+
+No display needed. Usage:
+    python3 benchmarks/bench_hotpaths.py
+    python3 benchmarks/bench_hotpaths.py -o hotpaths-before.json
+    python3 benchmarks/bench_hotpaths.py --cards 1000 10000 50000 --items 4 16 64 -o after.json --compare hotpaths-before.json
+    python3 benchmarks/bench_hotpaths.py --only flashcards
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+
+from benchutil import load_app, load_json_to_paper, measure, quiet
+from gen_synthetic import GENERATORS, ImageMaker, make_course, make_history, parse_size, write_deck
+
+SESSION_SIZE = 20 # Cards per start_session, like the flashcard screen asks for
+GROUPS = ("flashcards", "quiz", "paper")
+
+
+def flashcard_cases(app, workdir, cards, attempts, repeat):
+    """(name, result) for each FlashcardSession / ParleyParser path on an M-card deck"""
+    rng = random.Random(cards)
+    deck_path = os.path.join(workdir, f"deck-{cards}.kvtml")
+    deck = write_deck(deck_path, cards, rng)
+    with open(os.path.splitext(deck_path)[0] + ".progress.json", "w", encoding="utf-8") as f:
+        json.dump(make_history(deck, attempts, rng, datetime.datetime.now()), f)
+
+    def parse(_):
+        parser = app.ParleyParser()
+        parser.load_file(deck_path)
+        return parser
+    yield "ParleyParser.load_file", measure(parse, repeat, items=cards)
+
+    session = app.FlashcardSession(parse(None).cards, deck_path)
+
+    def fresh_map():
+        session.progress_map = {}
+        return session
+    yield "FlashcardSession.load_progress", measure(lambda s: s.load_progress() or s.progress_map,
+                                                    repeat, setup=fresh_map, items=cards)
+    yield "FlashcardSession.start_session", measure(lambda s: s.start_session(SESSION_SIZE) or s.session_queue,
+                                                    repeat, setup=lambda: session, items=cards)
+
+    def pick_card():
+        session.current_card = rng.choice(session.all_cards)
+        return session
+    # One answer is far quicker than a clock tick's worth of noise, so take more samples
+    yield "FlashcardSession.record_answer", measure(lambda s: s.record_answer(rng.random() < 0.7),
+                                                    repeat * 10, setup=pick_card)
+    yield "FlashcardSession.save_progress", measure(lambda s: s.save_progress(),
+                                                    repeat, setup=lambda: session, items=cards)
+
+
+def course_cases(app, workdir, items, image_size, groups, repeat, paper_repeat):
+    """(name, result) for loading and printing a course with `items` questions of each type"""
+    rng = random.Random(items)
+    course_dir = os.path.join(workdir, f"course-{items}")
+    os.makedirs(course_dir, exist_ok=True)
+    images = ImageMaker(course_dir, image_size, "jpg", rng, write="paper" in groups)
+    questions = make_course(rng, items, list(GENERATORS), images)
+    course_path = os.path.join(course_dir, "course.json")
+    with open(course_path, "w", encoding="utf-8") as f:
+        json.dump(questions, f, ensure_ascii=False)
+
+    if "quiz" in groups:
+        yield "load_question_file", measure(lambda _: app.load_question_file(course_path), repeat, items=len(questions))
+    if "paper" not in groups:
+        return
+
+    jtp = load_json_to_paper()
+
+    def fresh_paper():
+        with quiet():
+            return jtp.ExerciseToPaper(course_path, image_cache=jtp.ImageEncodingCache(cache_dir=None))
+
+    html_path = os.path.join(course_dir, "course_paper.html")
+
+    def html(paper):
+        with quiet():
+            paper.generate_html(html_path)
+        return paper
+    yield "generate_html (cold)", measure(html, paper_repeat, setup=fresh_paper, items=len(questions))
+    warm = html(fresh_paper())
+    yield "generate_html (warm)", measure(html, paper_repeat, setup=lambda: warm, items=len(questions))
+
+    if jtp.HAS_DOCX:
+        docx_path = os.path.join(course_dir, "course_paper.docx")
+
+        def docx(paper):
+            with quiet():
+                paper.generate_docx(docx_path)
+            return paper
+        yield "generate_docx (cold)", measure(docx, paper_repeat, setup=fresh_paper, items=len(questions))
+
+
+def scaling(rows):
+    """Per-item p50 at the largest size over the smallest one, per case"""
+    by_case = {}
+    for row in rows:
+        by_case.setdefault(row["case"], []).append(row)
+    growth = {}
+    for case, runs in by_case.items():
+        if len(runs) > 1:
+            small, large = min(runs, key=lambda r: r["size"]), max(runs, key=lambda r: r["size"])
+            growth[case] = (large["p50_ms"] / large["items"]) / (small["p50_ms"] / small["items"])
+    return growth
+
+
+def compare(rows, baseline, threshold):
+    """Print p50 changes against a baseline report; returns how many regressed"""
+    before = {(r["case"], r["size"]): r for r in baseline["rows"]}
+    print(f"\nvs {baseline['meta'].get('date')} (regression above +{threshold:.0f}%)")
+    regressions = 0
+    for row in rows:
+        old = before.get((row["case"], row["size"]))
+        if not old or not old["p50_ms"]:
+            continue
+        change = (row["p50_ms"] / old["p50_ms"] - 1) * 100
+        mark = "⚠️ " if change > threshold else "  "
+        regressions += change > threshold
+        print(f"{mark}{row['case']:<32} {row['size']:>7}  {old['p50_ms']:9.2f} → {row['p50_ms']:9.2f} ms  ({change:+5.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the WifeyMOOC loaders, flashcard scheduler and worksheet printer")
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 1000, 10000], help="Deck sizes (default: 100 1000 10000)")
+    parser.add_argument("--attempts", type=int, default=10, help="Past attempts per card in the histories (default: 10)")
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 4, 16],
+                        help=f"Questions of each of the {len(GENERATORS)} types per course (default: 1 4 16)")
+    parser.add_argument("--image-size", type=parse_size, default=(320, 240), metavar="WxH",
+                        help="Size of the course pictures (default: 320x240)")
+    parser.add_argument("--only", choices=GROUPS, nargs="+", help="Only these groups (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Timed runs per case (default: 20)")
+    parser.add_argument("--paper-repeat", type=int, default=3, help="Timed runs per worksheet case (default: 3)")
+    parser.add_argument("--scaling", type=float, default=2.0,
+                        help="Flag cases whose per-item time grows more than this many times (default: 2)")
+    parser.add_argument("-o", "--output", help="Write a JSON report here")
+    parser.add_argument("--compare", metavar="REPORT", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=25.0, help="p50 slowdown (%%) --compare flags (default: 25)")
+    args = parser.parse_args()
+
+    groups = args.only or GROUPS
+    app = load_app()
+    rows = []
+
+    def record(size, cases):
+        for case, result in cases:
+            rows.append({"case": case, "size": size, **result})
+            print(f"   {case:<32} {size:>7}  {result['p50_ms']:9.2f} {result['p90_ms']:9.2f} {result['p99_ms']:9.2f} ms"
+                  f"  {result['items_per_s']:>11,.0f}/s  {result['peak_kb']:>9,.0f} KiB  {result['blocks']:>9,}", flush=True)
+
+    header = f"   {'case':<32} {'size':>7}  {'p50':>9} {'p90':>9} {'p99':>9}     {'throughput':>11}  {'peak':>13}  {'blocks':>9}"
+    with tempfile.TemporaryDirectory(prefix="wifeymooc-bench-") as workdir:
+        if "flashcards" in groups:
+            print(f"🃏 Flashcards ({args.attempts} attempts per card; size = cards)\n{header}")
+            for cards in args.cards:
+                record(cards, flashcard_cases(app, workdir, cards, args.attempts, args.repeat))
+        if "quiz" in groups or "paper" in groups:
+            print(f"\n📚 Courses ({len(GENERATORS)} types; size = questions per type)\n{header}")
+            for items in args.items:
+                record(items, course_cases(app, workdir, items, args.image_size, groups, args.repeat, args.paper_repeat))
+
+    growth = scaling(rows)
+    print("\n📈 Per-item cost, largest size vs smallest")
+    for case, factor in growth.items():
+        mark = "⚠️  grows faster than the input" if factor > args.scaling else "✓"
+        print(f"   {case:<32} {factor:6.2f}x  {mark}")
+
+    if args.output:
+        meta = {"date": datetime.datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "platform": platform.platform(), "cpus": os.cpu_count(), "args": {k: v for k, v in vars(args).items()
+                                                                                   if k not in ("output", "compare")}}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "rows": rows, "scaling": growth}, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(rows, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n✗ {regressions} case(s) slower than the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Image decode benchmark for the Tkinter app 🖼️⏱️
+
+Compares how the app used to load thumbnails (Image.open + resize to the full
+box) with open_image_at_size(), at every size the app displays (64, 100, 120,
+150 and 200px). Each method runs in its own subprocess so its peak RSS isn't
+mixed up with the other one.
+
+Usage:
+    python3 benchmarks/bench_image_decode.py                     # sample course images
+    python3 benchmarks/bench_image_decode.py "photos/*.jpg" -r 5  # your own images
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from benchutil import ROOT, load_app
+
+DEFAULT_IMAGES = [os.path.join(ROOT, "Sample Exercise", "images", "*")]
+SIZES = [(64, 64), (100, 100), (120, 120), (150, 150), (200, None)]
+METHODS = ["open+resize", "open_image_at_size"]
+
+
+def open_and_resize(path, size):
+    """What the display methods did before open_image_at_size"""
+    from PIL import Image
+    img = Image.open(path)
+    if size[1] is None:
+        size = (size[0], int(img.size[1] * size[0] / img.size[0]))
+    return img.resize(size)
+
+
+def run_method(method, images, repeat):
+    """Decode every image at every size `repeat` times; prints one JSON result line"""
+    app = load_app()  # Imported in both methods, so the RSS baseline matches
+    load = open_and_resize if method == "open+resize" else app.open_image_at_size
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = {}
+    for size in SIZES:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for path in images:
+                load(path, size).load()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[f"{size[0]}x{size[1] or 'auto'}"] = best
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+    print(json.dumps({"method": method, "timings": timings,
+                      "peak_rss_mb": peak_kb / 1024, "extra_rss_mb": (peak_kb - baseline_kb) / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare open+resize with open_image_at_size")
+    parser.add_argument("images", nargs="*", help="Image files or glob patterns (default: the sample course images)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per size; the best one counts (default: 3)")
+    parser.add_argument("--method", choices=METHODS, help=argparse.SUPPRESS)  # Used for the subprocesses
+    args = parser.parse_args()
+
+    images = sorted(p for pattern in (args.images or DEFAULT_IMAGES) for p in glob.glob(pattern)
+                    if p.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")))
+    if not images:
+        print("✗ No images found")
+        sys.exit(1)
+
+    if args.method:
+        run_method(args.method, images, args.repeat)
+        return
+
+    print(f"🖼️  {len(images)} images, best of {args.repeat} runs per size\n")
+    results = {}
+    for method in METHODS:
+        out = subprocess.run([sys.executable, __file__, "--method", method, "-r", str(args.repeat), *images],
+                             check=True, capture_output=True, text=True).stdout
+        results[method] = json.loads(out.strip().splitlines()[-1])
+
+    old, new = (results[m] for m in METHODS)
+    print(f"{'size':>10}  {'open+resize':>12}  {'at_size':>12}  {'speedup':>8}")
+    for size, old_s in old["timings"].items():
+        new_s = new["timings"][size]
+        print(f"{size:>10}  {old_s * 1000:>10.1f}ms  {new_s * 1000:>10.1f}ms  {old_s / new_s:>7.2f}x")
+    print(f"\n{'peak RSS':>10}  {old['peak_rss_mb']:>10.1f}MB  {new['peak_rss_mb']:>10.1f}MB")
+    print(f"{'(decoding)':>10}  {old['extra_rss_mb']:>10.1f}MB  {new['extra_rss_mb']:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Startup import benchmark 🚀
+
+Loads wifeymooc-python2.py and json_to_paper.py in fresh interpreters with
+`python -X importtime` and reports how long their imports take, plus the
+heaviest top-level modules. Nothing is run: no window opens and no worksheet
+is built, so this is the cost paid before the first line of main().
+
+Usage:
+    python3 benchmarks/bench_startup.py          # best of 5 runs per script
+    python3 benchmarks/bench_startup.py -r 10 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# script -> (code that loads it, nesting depth of the modules the script itself imports).
+# The app script has a dash in its name, so it's executed by path rather than imported.
+LOADERS = {
+    "wifeymooc-python2.py": (
+        "import importlib.util\n"
+        f"spec = importlib.util.spec_from_file_location('wifeymooc', {os.path.join(ROOT, 'wifeymooc-python2.py')!r})\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n",
+        0,
+    ),
+    "json_to_paper.py": (f"import sys; sys.path.insert(0, {ROOT!r}); import json_to_paper\n", 1),
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(code):
+    """{module: (self_us, cumulative_us, depth)} for one fresh interpreter run"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the WifeyMOOC scripts")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Runs per script; the fastest counts (default: 5)")
+    parser.add_argument("--top", type=int, default=8, help="How many of the heaviest direct imports to list")
+    args = parser.parse_args()
+
+    for script, (code, depth) in LOADERS.items():
+        runs = [import_times(code) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: sum(t[0] for t in times.values()))
+        total_ms = sum(t[0] for t in best.values()) / 1000
+        print(f"📦 {script}: {total_ms:.1f} ms of imports, {len(best)} modules (best of {args.repeat})")
+        top_level = sorted(((t[1], name) for name, t in best.items() if t[2] == depth), reverse=True)
+        for cumulative_us, name in top_level[:args.top]:
+            print(f"   {cumulative_us / 1000:>8.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
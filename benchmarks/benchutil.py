@@ -0,0 +1,93 @@
+"""
+Shared bits for the benchmark scripts 🧰
+
+    load_app()            the Tkinter app module (its file name has a dash in it)
+    load_json_to_paper()  the json_to_paper module
+    measure()             latency percentiles, throughput and allocations of one call
+    quiet()               swallows the scripts' chatty prints while they're timed
+"""
+
+import contextlib
+import importlib.util
+import io
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app():
+    """The app script has a dash in its name, so it's loaded by path"""
+    spec = importlib.util.spec_from_file_location("wifeymooc", os.path.join(ROOT, "wifeymooc-python2.py"))
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def load_json_to_paper():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import json_to_paper
+    return json_to_paper
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(fn, repeat=20, setup=None, items=1, warmup=1):
+    """Time fn(setup()) `repeat` times; returns a dict of latencies (ms), throughput and allocations
+
+    Only fn is timed. `items` is how many things one call handles (cards, questions...),
+    for the items/s throughput. Allocations come from one extra, untimed call under
+    tracemalloc, since tracing slows everything down: peak_kb is the most memory the
+    call had allocated at once, blocks how many allocations its result still holds.
+    Have fn return what it built so those aren't freed before they're counted.
+    """
+    setup = setup or (lambda: None)
+    for _ in range(warmup):
+        fn(setup())
+
+    latencies = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        fn(arg)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    arg = setup()
+    tracemalloc.start()
+    try:
+        result = fn(arg)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        # Only allocations made since start() are traced, so this is what fn left behind
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+
+    median = statistics.median(latencies)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "min_ms": latencies[0],
+        "p50_ms": median,
+        "p90_ms": percentile(latencies, 90),
+        "p99_ms": percentile(latencies, 99),
+        "items_per_s": items / (median / 1000) if median else float("inf"),
+        "peak_kb": peak_kb,
+        "blocks": blocks,
+    }
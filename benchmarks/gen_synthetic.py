@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Synthetic course and deck generator for scale testing 🏭📚
+
+Writes, into one output directory:
+
+    synthetic-course.json     N items of every question type the app supports
+    images/                   the pictures those items use, drawn with Pillow at --image-size
+    synthetic-deck.kvtml      a Parley deck with M cards
+    synthetic-deck.progress.json
+                              a flashcard history for that deck, K attempts per card
+
+Everything comes from a seeded random generator, so the same arguments always
+give the same files and before/after benchmark runs see identical input. The
+pictures are noisy on purpose: flat colours decode far faster than photos do.
+
+Usage:
+    python3 benchmarks/gen_synthetic.py                          # 10 items per type, 200 cards
+    python3 benchmarks/gen_synthetic.py -n 200 --image-size 1920x1080 -o /tmp/big
+    python3 benchmarks/gen_synthetic.py -n 50 --no-images --cards 5000 --attempts 40
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import xml.etree.ElementTree as ET
+
+COURSE_FILE = "synthetic-course.json"
+DECK_FILE = "synthetic-deck.kvtml"
+LEITNER_INTERVALS = {1: 1, 2: 3, 3: 7, 4: 14, 5: 30} # Same boxes as FlashcardSession
+IMAGE_FORMATS = {"jpg": "JPEG", "png": "PNG"}
+
+WORDS = ("chat", "maison", "soleil", "fromage", "vélo", "jardin", "étoile", "musique", "gare", "plage",
+         "crêpe", "livre", "fleur", "marché", "café", "forêt", "bateau", "montagne", "cœur", "nuage",
+         "pomme", "rivière", "école", "lune", "chanson", "fenêtre", "arbre", "ville", "train", "tarte")
+VERBS = ("regarde", "aime", "prend", "cherche", "trouve", "dessine", "achète", "écoute", "attend", "visite")
+SUBJECTS = ("Lola", "Inès", "Yuta", "Mon amie", "Le voisin", "La prof", "Nous", "Vous", "Tu", "Ils")
+ENGLISH = ("cat", "house", "sun", "cheese", "bike", "garden", "star", "music", "station", "beach",
+           "pancake", "book", "flower", "market", "coffee", "forest", "boat", "mountain", "heart", "cloud",
+           "apple", "river", "school", "moon", "song", "window", "tree", "city", "train", "pie")
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def sentence(rng, extra=2):
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {words(rng, rng.randint(1, extra + 1))}."
+
+
+def distinct(make, count):
+    """`count` different strings from make(); numbered if the word bank runs dry"""
+    seen = []
+    for attempt in range(count * 20):
+        text = make()
+        if text not in seen:
+            seen.append(text)
+            if len(seen) == count:
+                return seen
+    return seen + [f"{make()} ({i})" for i in range(len(seen), count)]
+
+
+class ImageMaker:
+    """Draws (or just names) the pictures the questions point at"""
+
+    def __init__(self, out_dir, size, fmt, rng, write=True):
+        self.dir = os.path.join(out_dir, "images")
+        self.size = size
+        self.ext = fmt
+        self.rng = rng
+        self.write = write
+        self.count = 0
+        self.names = set()
+        if write:
+            from PIL import Image, ImageDraw # Only needed when pictures are written
+            self.Image, self.ImageDraw = Image, ImageDraw
+            os.makedirs(self.dir, exist_ok=True)
+
+    def new(self, name, size=None):
+        """Relative path of a fresh picture, as the question JSON refers to it"""
+        if name in self.names: # multi_questions reuse their parent's item number
+            name = f"{name}_{self.count}"
+        self.names.add(name)
+        rel = f"images/{name}.{self.ext}"
+        self.count += 1
+        if self.write:
+            self.draw(os.path.join(self.dir, f"{name}.{self.ext}"), size or self.size, name)
+        return rel
+
+    def draw(self, path, size, label):
+        Image, ImageDraw = self.Image, self.ImageDraw
+        rng = self.rng
+        img = Image.new("RGB", size, tuple(rng.randint(60, 230) for _ in range(3)))
+        draw = ImageDraw.Draw(img)
+        w, h = size
+        for _ in range(12):
+            x0, y0 = rng.randint(0, w - 1), rng.randint(0, h - 1)
+            x1, y1 = rng.randint(x0, w), rng.randint(y0, h)
+            shape = draw.ellipse if rng.random() < 0.5 else draw.rectangle
+            shape((x0, y0, x1, y1), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+        draw.text((10, 10), label, fill="black")
+        # Photo-like grain, so the files decode about as slowly as real pictures
+        noise = Image.effect_noise(size, 40).convert("RGB")
+        img = Image.blend(img, noise, 0.2)
+        img.save(path, IMAGE_FORMATS[self.ext], **({"quality": 85} if self.ext == "jpg" else {}))
+
+
+# --- One function per question type: (rng, item number, ImageMaker) -> question dict ---
+
+def make_mcq_single(rng, n, images):
+    options = distinct(lambda: words(rng, 2), 4)
+    question = {"type": "mcq_single", "question": f"({n}) {sentence(rng)} Quelle est la bonne réponse ?",
+                "options": options, "answer": [rng.randrange(len(options))]}
+    if n % 3 == 0:
+        question["media"] = {"image": images.new(f"mcq_single_{n}")}
+    return question
+
+
+def make_mcq_multiple(rng, n, images):
+    options = distinct(lambda: sentence(rng, 1), 5)
+    return {"type": "mcq_multiple", "question": f"({n}) Cochez toutes les phrases correctes :",
+            "options": options, "answer": sorted(rng.sample(range(len(options)), rng.randint(1, 3)))}
+
+
+def make_list_pick(rng, n, images):
+    options = distinct(lambda: f"{rng.choice(WORDS)} + {rng.choice(WORDS)}", 6)
+    return {"type": "list_pick", "question": f"({n}) Choisissez les bons mélanges :",
+            "options": options, "answer": sorted(rng.sample(range(len(options)), rng.randint(1, 3)))}
+
+
+def make_word_fill(rng, n, images):
+    blanks = rng.randint(2, 5)
+    return {"type": "word_fill", "question": f"({n}) Complétez les phrases :",
+            "sentence_parts": [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} ({rng.choice(WORDS)})" for _ in range(blanks)]
+            + [f"{words(rng, 2)}."],
+            "answers": [rng.choice(WORDS) for _ in range(blanks)]}
+
+
+def make_fill_blanks_dropdown(rng, n, images):
+    blanks = rng.randint(2, 5)
+    options = [[" "] + distinct(lambda: words(rng, 2), 3) for _ in range(blanks)]
+    return {"type": "fill_blanks_dropdown", "question": f"({n}) Choisissez la bonne réponse dans la liste :",
+            "sentence_parts": [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)}... " for _ in range(blanks)] + ["."],
+            "options_for_blanks": options,
+            "answers": [rng.choice(choices[1:]) for choices in options]}
+
+
+def make_match_sentence(rng, n, images):
+    sentences = distinct(lambda: sentence(rng, 1), rng.randint(4, 6))
+    pairs = [{"sentence": text, "image_path": images.new(f"match_sentence_{n}_{i}")}
+             for i, text in enumerate(sentences)]
+    return {"type": "match_sentence", "question": f"({n}) Associez l'image à la phrase :",
+            "pairs": pairs, "answer": {pair["image_path"]: pair["sentence"] for pair in pairs}}
+
+
+def make_match_phrases(rng, n, images):
+    sources = distinct(lambda: f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} ...", 4)
+    endings = distinct(lambda: f"{words(rng, 3)}.", len(sources))
+    return {"type": "match_phrases", "question": f"({n}) Associez les débuts et fins de phrases :",
+            "pairs": [{"source": source, "targets": [" "] + endings} for source in sources],
+            "answer": dict(zip(sources, endings))}
+
+
+def make_order_phrase(rng, n, images):
+    answer = distinct(lambda: sentence(rng), rng.randint(4, 7))
+    shuffled = answer[:]
+    rng.shuffle(shuffled)
+    return {"type": "order_phrase", "question": f"({n}) Remettez les phrases dans l'ordre :",
+            "phrase_shuffled": shuffled, "answer": answer}
+
+
+def make_sequence_audio(rng, n, images):
+    options = distinct(lambda: words(rng, 2), 4)
+    answer = list(range(len(options)))
+    rng.shuffle(answer)
+    return {"type": "sequence_audio", "question": f"({n}) Remettez les sons dans l'ordre :",
+            "audio_options": [{"option": option} for option in options], "answer": answer}
+
+
+def make_categorization(rng, n, images):
+    categories = [" "] + distinct(lambda: rng.choice(WORDS).capitalize(), 3)
+    if n % 2:
+        stimulus = {"image": images.new(f"categorization_{n}")}
+    else:
+        stimulus = {"text": sentence(rng)}
+    return {"type": "categorization", "question": f"({n}) Dans quelle catégorie ?",
+            "stimulus": stimulus, "categories": categories, "correct": rng.choice(categories[1:])}
+
+
+def make_categorization_multiple(rng, n, images):
+    categories = [" "] + distinct(lambda: rng.choice(WORDS).capitalize(), 3)
+    if n % 2:
+        paths = [images.new(f"categorization_multiple_{n}_{i}") for i in range(rng.randint(4, 8))]
+        stimuli = [{"image": path} for path in paths]
+        keys = [os.path.basename(path) for path in paths] # The app keys pictures by file name
+    else:
+        keys = distinct(lambda: sentence(rng, 1), rng.randint(4, 8))
+        stimuli = [{"text": text, "image": None} for text in keys]
+    return {"type": "categorization_multiple", "question": f"({n}) Classez chaque élément :",
+            "stimuli": stimuli, "categories": categories,
+            "answer": {key: rng.choice(categories[1:]) for key in keys}}
+
+
+def make_image_tagging(rng, n, images):
+    w, h = images.size
+
+    def variant(suffix):
+        tags = [{"label": word, "id": f"tag{i}"} for i, word in enumerate(distinct(lambda: rng.choice(WORDS), rng.randint(4, 8)))]
+        return {"media": {"image": images.new(f"image_tagging_{n}{suffix}")}, "tags": tags,
+                "answer": {tag["id"]: [round(rng.uniform(0, w), 2), round(rng.uniform(0, h), 2)] for tag in tags}}
+
+    question = {"type": "image_tagging", "question": f"({n}) Placez chaque étiquette sur l'image :",
+                "button_label": "Autre image", **variant("")}
+    if n % 2:
+        question["alternatives"] = [dict(variant("_alt"), button_label="Retour")]
+    return question
+
+
+SUB_QUESTION_TYPES = ("mcq_single", "mcq_multiple", "list_pick", "word_fill", "fill_blanks_dropdown", "match_phrases")
+
+
+def make_multi_questions(rng, n, images):
+    return {"type": "multi_questions",
+            "questions": [GENERATORS[rng.choice(SUB_QUESTION_TYPES)](rng, n, images) for _ in range(rng.randint(2, 4))]}
+
+
+GENERATORS = {
+    "mcq_single": make_mcq_single,
+    "mcq_multiple": make_mcq_multiple,
+    "list_pick": make_list_pick,
+    "word_fill": make_word_fill,
+    "fill_blanks_dropdown": make_fill_blanks_dropdown,
+    "match_sentence": make_match_sentence,
+    "match_phrases": make_match_phrases,
+    "order_phrase": make_order_phrase,
+    "sequence_audio": make_sequence_audio,
+    "categorization": make_categorization,
+    "categorization_multiple": make_categorization_multiple,
+    "image_tagging": make_image_tagging,
+    "multi_questions": make_multi_questions,
+}
+
+
+def make_course(rng, items, types, images):
+    """`items` questions of each type, interleaved the way a real course mixes them"""
+    return [GENERATORS[qtype](rng, n, images) for n in range(1, items + 1) for qtype in types]
+
+
+# --- Parley deck + flashcard history ---
+
+def write_deck(path, cards, rng):
+    """A KVTML 2 deck like Parley saves, with translation 0 as the front and 1 as the back"""
+    kvtml = ET.Element("kvtml", version="2.0")
+    info = ET.SubElement(kvtml, "information")
+    ET.SubElement(info, "generator").text = "gen_synthetic.py"
+    ET.SubElement(info, "title").text = f"Synthetic deck ({cards} cards)"
+    identifiers = ET.SubElement(kvtml, "identifiers")
+    for ident, (name, locale) in enumerate((("Français", "fr"), ("English", "en"))):
+        identifier = ET.SubElement(identifiers, "identifier", id=str(ident))
+        ET.SubElement(identifier, "name").text = name
+        ET.SubElement(identifier, "locale").text = locale
+    entries = ET.SubElement(kvtml, "entries")
+    deck = []
+    for card_id in range(cards):
+        pick = rng.randrange(len(WORDS))
+        front = f"{WORDS[pick]} {card_id}"
+        back = f"{ENGLISH[pick]} {card_id}"
+        entry = ET.SubElement(entries, "entry", id=str(card_id))
+        example = sentence(rng)
+        for trans_id, (text, text_example) in enumerate(((front, example), (back, ""))):
+            translation = ET.SubElement(entry, "translation", id=str(trans_id))
+            ET.SubElement(translation, "text").text = text
+            if text_example:
+                ET.SubElement(translation, "example").text = text_example
+        deck.append({"id": str(card_id), "front": front, "front_example": example, "back": back, "back_example": ""})
+    ET.indent(kvtml)
+    ET.ElementTree(kvtml).write(path, encoding="UTF-8", xml_declaration=True)
+    return deck
+
+
+def make_history(deck, attempts, rng, now):
+    """Progress entries as FlashcardSession saves them, replaying `attempts` reviews per card"""
+    history = []
+    for card in deck:
+        skill = rng.random() # Some cards are easy, some never stick
+        box = 1
+        when = now - datetime.timedelta(days=attempts * 4 + rng.randint(0, 30))
+        log = []
+        for _ in range(attempts):
+            correct = rng.random() < 0.4 + 0.55 * skill
+            log.append({"date": when.isoformat(), "correct": correct})
+            box = min(box + 1, 5) if correct else 1
+            when += datetime.timedelta(days=LEITNER_INTERVALS[box], hours=rng.randint(0, 48))
+        review = when if attempts else now - datetime.timedelta(days=1)
+        history.append({**card, "front_audio": "", "back_audio": "", "box": box,
+                        "reviewDate": review.isoformat(), "attempts": log})
+    return history
+
+
+def parse_size(text):
+    try:
+        w, h = (int(side) for side in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if w < 16 or h < 16:
+        raise argparse.ArgumentTypeError("images must be at least 16x16")
+    return w, h
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic course, Parley deck and flashcard history")
+    parser.add_argument("-o", "--output", default="synthetic", help="Directory to write into (default: ./synthetic)")
+    parser.add_argument("-n", "--items", type=int, default=10, help="Questions of each type (default: 10)")
+    parser.add_argument("--types", nargs="+", choices=list(GENERATORS), metavar="TYPE",
+                        help="Only these question types (default: all of them)")
+    parser.add_argument("--image-size", type=parse_size, default=(640, 480), metavar="WxH",
+                        help="Size of the generated pictures (default: 640x480)")
+    parser.add_argument("--image-format", choices=list(IMAGE_FORMATS), default="jpg", help="Picture format (default: jpg)")
+    parser.add_argument("--no-images", action="store_true",
+                        help="Reference pictures without writing them (tests the missing-file paths, and is much faster)")
+    parser.add_argument("--cards", type=int, default=200, help="Cards in the Parley deck; 0 skips the deck (default: 200)")
+    parser.add_argument("--attempts", type=int, default=5, help="Review attempts per card in the history (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    if args.items < 0 or args.cards < 0 or args.attempts < 0:
+        sys.exit("✗ --items, --cards and --attempts can't be negative")
+    os.makedirs(args.output, exist_ok=True)
+    rng = random.Random(args.seed)
+
+    images = ImageMaker(args.output, args.image_size, args.image_format, rng, write=not args.no_images)
+    course = make_course(rng, args.items, args.types or list(GENERATORS), images)
+    course_path = os.path.join(args.output, COURSE_FILE)
+    with open(course_path, "w", encoding="utf-8") as f:
+        json.dump(course, f, ensure_ascii=False, indent=2)
+    written = f"{images.count} pictures at {args.image_size[0]}x{args.image_size[1]}" if images.write \
+        else f"{images.count} picture paths (not written)"
+    print(f"📚 {course_path}: {len(course)} questions, {written}")
+
+    if args.cards:
+        deck_path = os.path.join(args.output, DECK_FILE)
+        deck = write_deck(deck_path, args.cards, rng)
+        progress_path = os.path.splitext(deck_path)[0] + ".progress.json"
+        history = make_history(deck, args.attempts, rng, datetime.datetime.now())
+        with open(progress_path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=4)
+        due = sum(1 for p in history if p["reviewDate"] <= datetime.datetime.now().isoformat())
+        print(f"🃏 {deck_path}: {args.cards} cards")
+        print(f"📈 {progress_path}: {args.attempts} attempts per card, {due} due now")
+    print("✓ Done")
+
+
+if __name__ == "__main__":
+    main()
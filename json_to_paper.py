@@ -4,32 +4,446 @@ WifeyMOOC JSON to Paper Exercise Printer
 Converts exercise JSON files into printable HTML + DOCX format
 """
 
+from __future__ import annotations  # Type hints name python-docx classes that are only imported for DOCX output
+
+import argparse
+import io
 import json
 import os
 import sys
 import base64
+import contextlib
+import filecmp
+import functools
+import glob
+import hashlib
+import importlib.util
 import random
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-
-# Try to import python-docx, but make it optional
-try:
-    from docx import Document
-    from docx.shared import Inches, Pt, RGBColor
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.oxml.ns import qn
-    from docx.oxml import OxmlElement
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
+from typing import List, Dict, Any, Tuple, Callable, Iterator, Optional, NamedTuple
+
+# HTML renderers write their fragments through one of these (file.write or list.append)
+HtmlWriter = Callable[[str], Any]
+
+# python-docx is optional, and only imported when a DOCX is actually built
+# (it's the slowest import here by far, and HTML-only runs never need it)
+HAS_DOCX = importlib.util.find_spec("docx") is not None
+
+
+def _import_docx() -> bool:
+    """Import python-docx on first use; False (and HAS_DOCX cleared) if it won't load"""
+    global HAS_DOCX, Document, Inches, Pt, RGBColor, WD_ALIGN_PARAGRAPH, WD_STYLE_TYPE
+    try:
+        from docx import Document
+        from docx.shared import Inches, Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.enum.style import WD_STYLE_TYPE
+    except ImportError:
+        HAS_DOCX = False
+    return HAS_DOCX
+
+
+# Pillow is optional too: without it images are embedded unmodified. Also imported
+# on first use, so runs that find every output up to date never load it.
+HAS_PIL = importlib.util.find_spec("PIL") is not None
+
+
+def _import_pil() -> bool:
+    global HAS_PIL, Image, ImageOps, pil_features
+    try:
+        from PIL import Image, ImageOps, features as pil_features
+    except ImportError:
+        HAS_PIL = False
+    return HAS_PIL
+
+# Box (width, height) in inches that each kind of picture occupies on the printed page
+IMAGE_PRINT_SIZES = {
+    'thumbnail': (2.0, 1.5),   # match_sentence image grid
+    'inline': (6.5, 2.75),     # media and image tagging pictures
+    'stimulus': (6.5, 1.6),    # categorization pictures (shown at most 150px tall)
+    'full_page': (6.7, 9.7),   # reference image pages (A4 minus margins)
+}
+
+# How images are re-encoded for the HTML worksheet; 'fidelity' embeds the original files
+IMAGE_PROFILES = {
+    'size': {'dpi': 110, 'quality': 70, 'format': 'WEBP'},
+    'balanced': {'dpi': 150, 'quality': 82, 'format': 'JPEG'},
+    'fidelity': None,
+}
+DEFAULT_IMAGE_PROFILE = 'balanced'
+
+# Width in inches of each kind of picture in the DOCX (Word keeps the aspect ratio)
+DOCX_IMAGE_WIDTHS = {
+    'full_page': 6.0,   # reference image pages
+    'inline': 5.0,      # media and image tagging pictures
+    'stimulus': 3.0,    # categorization stimuli
+    'thumbnail': 2.0,   # match_sentence images
+}
+
+# Named DOCX styles, created once per document; renderers only pick a style name.
+# name -> (kind, size pt, bold, italic, RGB color, centered)
+DOCX_STYLES = {
+    # Paragraph styles
+    'WM Title': ('paragraph', 24, True, False, (44, 62, 80), True),
+    'WM Subtitle': ('paragraph', 11, False, False, (127, 140, 141), True),
+    'WM Question': ('paragraph', 11, True, False, (44, 62, 80), False),
+    'WM Note': ('paragraph', 10, False, True, (133, 100, 4), False),
+    'WM Option': ('paragraph', None, False, False, None, False),
+    'WM Reference Title': ('paragraph', 14, True, False, (155, 89, 182), True),
+    'WM Reference Label': ('paragraph', 11, True, False, None, False),
+    'WM Reference Question': ('paragraph', 10, False, True, None, False),
+    'WM Answers Title': ('paragraph', 14, True, False, (231, 76, 60), True),
+    'WM Answer': ('paragraph', 11, False, False, None, False),
+    # Character styles
+    'WM Number': ('character', 11, True, False, (52, 152, 219), False),
+    'WM Type': ('character', 10, False, False, (44, 62, 80), False),
+    'WM Answer Number': ('character', None, True, False, (39, 174, 96), False),
+}
+
+MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml'
+}
+
+
+def optimize_image(path: Path, role: str, profile: str, box: Tuple[float, float] = None,
+                   allow_webp: bool = True) -> Tuple[bytes, str]:
+    """Resize an image to its print size and re-encode it
+
+    Returns (image bytes, MIME type). The image is shrunk (never enlarged) to fit
+    the IMAGE_PRINT_SIZES box for `role` (or `box`, in inches) at the profile's DPI.
+    Images with transparency keep it when the profile writes WebP; for JPEG they
+    are flattened onto white paper. allow_webp=False forces JPEG (Word can't show
+    WebP). Falls back to the original bytes when Pillow is missing, the profile is
+    'fidelity', or re-encoding a small JPEG/PNG wouldn't make it any smaller.
+    """
+    settings = IMAGE_PROFILES.get(profile)
+    if not HAS_PIL or settings is None or path.suffix.lower() == '.svg' or not _import_pil():
+        return path.read_bytes(), MIME_TYPES.get(path.suffix.lower(), 'image/jpeg')
+
+    with Image.open(path) as img:
+        original_size = img.size
+        img = ImageOps.exif_transpose(img)
+        box_w, box_h = box or IMAGE_PRINT_SIZES[role]
+        img.thumbnail((round(box_w * settings['dpi']), round(box_h * settings['dpi'])), Image.LANCZOS)
+        resized = img.size != original_size
+
+        fmt = settings['format']
+        if fmt == 'WEBP' and (not allow_webp or not pil_features.check('webp')):
+            fmt = 'JPEG'
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        if fmt == 'JPEG' and has_alpha:
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, 'white')
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        elif img.mode not in ('RGB', 'RGBA', 'L'):
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+
+        out = io.BytesIO()
+        img.save(out, fmt, quality=settings['quality'], optimize=True)
+    if not resized and path.suffix.lower() in ('.jpg', '.jpeg', '.png') and out.tell() >= path.stat().st_size:
+        return path.read_bytes(), MIME_TYPES[path.suffix.lower()]
+    return out.getvalue(), 'image/webp' if fmt == 'WEBP' else 'image/jpeg'
+
+
+# Encoded images are cached by content hash, in memory and on disk between runs
+IMAGE_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "wifeymooc" / "paper"
+IMAGE_CACHE_MEMORY_LIMIT = 64 * 1024 * 1024  # Bytes of encoded image data kept in memory
+IMAGE_CACHE_DISK_LIMIT = 512 * 1024 * 1024  # Bytes kept on disk; least recently used entries go first
+
+# Exercises are rendered on a thread pool (Pillow and hashlib release the GIL while working)
+DEFAULT_RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class ImageEncodingCache:
+    """Content-addressed cache of encoded images (base64 data URIs)
+
+    Entries are keyed by the SHA-256 of the image file plus a variant name, so a
+    picture used by several exercises, or several worksheets, is encoded once.
+    Recently used entries stay in memory up to `memory_limit` bytes. Every entry
+    is also written to `cache_dir`, together with a (path, size, mtime) -> hash
+    index, so a repeated build neither re-encodes nor re-hashes unchanged images.
+    save_index() trims the folder back to `disk_limit` bytes, oldest use first.
+    Pass cache_dir=None for a memory-only cache.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = IMAGE_CACHE_DIR,
+                 memory_limit: int = IMAGE_CACHE_MEMORY_LIMIT,
+                 disk_limit: int = IMAGE_CACHE_DISK_LIMIT):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.memory = OrderedDict()  # key -> encoded str, least recently used first
+        self.memory_bytes = 0
+        self.hashes = {}  # "path|size|mtime_ns" -> content hash
+        self.hashes_dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Renderers share one cache across worker threads
+        if self.cache_dir:
+            try:
+                with open(self.cache_dir / "index.json", 'r', encoding='utf-8') as f:
+                    self.hashes = json.load(f)
+            except (OSError, ValueError):
+                self.hashes = {}
+
+    def content_hash(self, path: Path) -> str:
+        """SHA-256 of a file, memoized on its path, size and modification time"""
+        st = path.stat()
+        stat_key = f"{path.resolve()}|{st.st_size}|{st.st_mtime_ns}"
+        digest = self.hashes.get(stat_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            with self.lock:
+                self.hashes[stat_key] = digest
+                self.hashes_dirty = True
+        return digest
+
+    def get(self, path: Path, variant: str, encode: Callable[[Path], str]) -> str:
+        """Return the cached encoding of `path` for `variant`, calling encode(path) on a miss"""
+        key = f"{self.content_hash(path)}-{variant}"
+        with self.lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return value
+
+        # Encoding happens outside the lock so worker threads don't wait on each other
+        disk_file = self.cache_dir / f"{key}.txt" if self.cache_dir else None
+        if disk_file and disk_file.exists():
+            value = disk_file.read_text(encoding='ascii')
+            hit = True
+            try:
+                os.utime(disk_file)  # Mark as recently used, for trim()
+            except OSError:
+                pass
+        else:
+            value = encode(path)
+            hit = False
+            if disk_file:
+                self._write_atomic(disk_file, value)
+
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._remember(key, value)
+        return value
+
+    def _remember(self, key: str, value: str):
+        if len(value) > self.memory_limit or key in self.memory:
+            return
+        self.memory[key] = value
+        self.memory_bytes += len(value)
+        while self.memory_bytes > self.memory_limit:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _write_atomic(self, target: Path, text: str):
+        try:
+            self._write_atomic_bytes(target, text.encode('ascii'))
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write image cache {target} - {e}")
+
+    @staticmethod
+    def _write_atomic_bytes(target: Path, data: bytes):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def save_index(self):
+        """Persist the path -> content hash index for the next run, then trim the folder"""
+        with self.lock:
+            if not self.cache_dir:
+                return
+            if self.hashes_dirty:
+                # Entries for files that were edited, moved or deleted since will never match again
+                for stat_key in list(self.hashes):
+                    path, size, mtime_ns = stat_key.rsplit('|', 2)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        st = None
+                    if st is None or f"{st.st_size}|{st.st_mtime_ns}" != f"{size}|{mtime_ns}":
+                        del self.hashes[stat_key]
+                self._write_atomic(self.cache_dir / "index.json", json.dumps(self.hashes))
+                self.hashes_dirty = False
+            self.trim()
+
+    def trim(self):
+        """Delete the least recently used encodings and build manifests above disk_limit bytes"""
+        entries = []
+        for folder, pattern in ((self.cache_dir, "*.txt"), (self.cache_dir / "builds", "*.json")):
+            for entry in folder.glob(pattern):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue  # Trimmed by another batch process in the meantime
+                entries.append((st.st_mtime_ns, st.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.disk_limit:
+            return
+        entries.sort()
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.disk_limit:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+            total -= size
+            removed += 1
+        print(f"🧹 Trimmed {removed} old entries from the image cache (limit {self.disk_limit // (1024 * 1024)} MB)")
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """Hash of this script, so editing a template or renderer invalidates build manifests"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+class HtmlStream:
+    """Binary HTML output (an HtmlWriter) that tracks its byte offset
+    
+    Keyed parts are recorded as (offset, length) in the build manifest, so the
+    next build can copy unchanged parts straight out of this file.
+    """
+    
+    def __init__(self, f):
+        self.f = f
+        self.offset = 0
+    
+    def __call__(self, fragment):
+        data = fragment.encode('utf-8') if isinstance(fragment, str) else fragment
+        self.f.write(data)
+        self.offset += len(data)
+
+
+# --- Document model -----------------------------------------------------------
+# compile_worksheet turns the exercise JSON into these once; the HTML and DOCX
+# backends only render blocks, so a new output format doesn't touch the JSON.
+
+# Simple question types show their media image on a reference page instead of inline
+REFERENCE_IMAGE_TYPES = ('mcq_single', 'mcq_multiple', 'list_pick', 'fill_blanks_dropdown',
+                         'word_fill', 'sequence_audio', 'order_phrase')
+
+
+class ImageRef(NamedTuple):
+    source: str            # path as written in the JSON
+    path: Optional[Path]   # resolved file, None if it's missing
+    role: str              # IMAGE_PRINT_SIZES / DOCX_IMAGE_WIDTHS key
+
+
+class Block(NamedTuple):
+    """One piece of an exercise; which fields matter depends on `kind`
+
+    group           children, label (heading), text (layout: the HTML class, '' for none),
+                    inline (heading on the same line as the box opens)
+    note            text
+    image_reference text (file name of a reference page image)
+    image           image, text (alt), label (caption)
+    options         items, multiple (checkboxes instead of radio buttons)
+    sentence        items (sentence parts)
+    choices         label, items (a tuple of choices per blank)
+    field           label, text
+    blank           label, text (an answer line to fill in)
+    list            label, items, text (marker before each item), indent
+    lines           items, text (marker before each item); a plain list, one item per line
+    prompts         items, text (answer blank after each item, may be empty)
+    spacer          (a gap between repeated groups of blocks)
+    image_grid      images, items (their letters)
+    item            children (a boxed group of blocks)
+    text            text
+
+    Any block can carry `docx`: the blocks the DOCX backend renders in its place,
+    where the Word worksheet words or lays the exercise out differently (other
+    headings, longer answer lines, checkboxes). Those may also use three kinds
+    only the DOCX backend has:
+
+    heading         text (a Heading 4 paragraph)
+    paragraphs      items (one paragraph per item, each a tuple of (text, bold) runs)
+    bullets         items (a bulleted list)
+    """
+    kind: str
+    text: str = ''
+    label: str = ''
+    items: tuple = ()
+    image: Optional[ImageRef] = None
+    images: Tuple[ImageRef, ...] = ()
+    multiple: bool = False
+    indent: bool = False
+    inline: bool = False
+    children: tuple = ()
+    docx: Optional[tuple] = None
+
+
+class CompiledExercise(NamedTuple):
+    number: int
+    type: str
+    question: str
+    blocks: Tuple[Block, ...]
+    answer_text: Optional[str]  # None: not in the answer key
+    key: str                    # build-manifest key (content, position and images)
+
+
+class ReferenceImage(NamedTuple):
+    image: ImageRef
+    number: int
+    question: str
+    key: str
+
+
+class WorksheetModel(NamedTuple):
+    exercises: List[CompiledExercise]
+    reference_images: List[ReferenceImage]
+
 
 class ExerciseToPaper:
-    def __init__(self, json_file: str):
+    def __init__(self, json_file: str, image_cache: ImageEncodingCache = None,
+                 image_profile: str = DEFAULT_IMAGE_PROFILE, workers: int = DEFAULT_RENDER_WORKERS,
+                 memory_profile=None):
         self.json_file = json_file
+        self.image_profile = image_profile
+        self.workers = max(1, workers)  # 1 renders everything on the calling thread
+        self.pool = None  # ThreadPoolExecutor while a generate_* call is running
+        self.docx_images = {}  # image path -> bytes (or Future of them) for generate_docx, one per unique image
+        self.previous_build = None  # (open previous HTML file, {part key: [offset, length]}) while splicing
+        self.part_spans = {}  # part key -> [offset, length] in the HTML being written
+        self.build_stats = {'rendered': 0, 'reused': 0}
+        self.docx_styles = {}  # DOCX_STYLES name -> style id in the document being built
         self.exercises = []
         self.base_dir = Path(json_file).parent
-        self.full_page_images = {}  # Track images for full-page references
+        self.model = None  # WorksheetModel, compiled on first use (see compile_worksheet)
+        self.resolved_images = {}  # image path as written in the JSON -> file on disk (or None)
+        # Shared by every renderer, so each picture is encoded once per build
+        self.image_cache = image_cache if image_cache is not None else ImageEncodingCache()
+        self.asset_dir = None  # Set while generate_html writes images as separate files
+        self.written_assets = {}  # "hash-variant" -> file name inside asset_dir
+        self.memory_profile = memory_profile  # wifeymooc_memprofile.MemoryProfile under --profile-memory
         self.load_json()
         
     def load_json(self):
@@ -37,7 +451,10 @@ class ExerciseToPaper:
         try:
             with open(self.json_file, 'r', encoding='utf-8') as f:
                 self.exercises = json.load(f)
+            self.model = None
+            self.resolved_images = {}
             print(f"✓ Loaded {len(self.exercises)} exercises from {self.json_file}")
+            self._memory_checkpoint(f"loaded {len(self.exercises)} exercises")
         except FileNotFoundError:
             print(f"✗ Error: File '{self.json_file}' not found")
             sys.exit(1)
@@ -45,38 +462,65 @@ class ExerciseToPaper:
             print(f"✗ Error: Invalid JSON - {e}")
             sys.exit(1)
     
-    def _load_image_as_base64(self, image_path: str) -> str:
-        """Load an image file and convert to base64 data URI"""
+    def _memory_checkpoint(self, label: str):
+        if self.memory_profile is not None:
+            cache = self.image_cache
+            self.memory_profile.checkpoint(label, {
+                'encoded images in memory': f"{len(cache.memory)} ({cache.memory_bytes / (1024 * 1024):.1f} MB)",
+                'DOCX images held': len(self.docx_images),
+            })
+
+    def _load_image_as_base64(self, image: ImageRef) -> str:
+        """Load an image, optimize it for its role and convert to base64 data URI (memoized in self.image_cache)"""
+        if not image.path:
+            return None
         try:
-            # Try to find the image relative to the JSON file's directory
-            full_path = self.base_dir / image_path
-            if not full_path.exists():
-                # Try relative to current directory
-                full_path = Path(image_path)
-            
-            if not full_path.exists():
-                print(f"⚠️  Warning: Image not found - {image_path}")
-                return None
+            def encode(path: Path) -> str:
+                image_bytes, mime_type = optimize_image(path, image.role, self.image_profile)
+                image_data = base64.b64encode(image_bytes).decode('ascii')
+                return f"data:{mime_type};base64,{image_data}"
             
-            # Determine MIME type
-            suffix = full_path.suffix.lower()
-            mime_types = {
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.gif': 'image/gif',
-                '.webp': 'image/webp',
-                '.svg': 'image/svg+xml'
-            }
-            mime_type = mime_types.get(suffix, 'image/jpeg')
-            
-            # Read and encode image
-            with open(full_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-            
-            return f"data:{mime_type};base64,{image_data}"
+            return self.image_cache.get(image.path, self._image_variant(image.path, image.role), encode)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not load image {image.source} - {e}")
+            return None
+    
+    def _image_variant(self, full_path: Path, role: str) -> str:
+        """Cache variant name for an image encoded for `role` with the current profile"""
+        if IMAGE_PROFILES.get(self.image_profile) and HAS_PIL:
+            return f"{self.image_profile}-{role}"
+        return f"original-{full_path.suffix.lower().lstrip('.') or 'bin'}"
+    
+    def _image_src(self, image: ImageRef) -> str:
+        """Value for an <img src>: a data URI, or a relative file path in external-asset mode"""
+        if self.asset_dir is None:
+            return self._load_image_as_base64(image)
+        
+        full_path, role = image.path, image.role
+        if not full_path:
+            return None
+        try:
+            # Named after the source content + variant, so each image is written once
+            # per folder and the name only changes when the picture itself changes
+            key = f"{self.image_cache.content_hash(full_path)[:20]}-{self._image_variant(full_path, role)}"
+            asset = self.written_assets.get(key)
+            if asset is None:
+                existing = next(self.asset_dir.glob(f"{key}.*"), None)
+                if existing is not None:
+                    asset = existing.name
+                else:
+                    data_uri = self._load_image_as_base64(image)
+                    if not data_uri:
+                        return None
+                    header, image_data = data_uri.split(',', 1)
+                    mime_type = header[len('data:'):].split(';', 1)[0]
+                    ext = next((e for e, m in MIME_TYPES.items() if m == mime_type), '.bin')
+                    asset = f"{key}{ext}"
+                    self.image_cache._write_atomic_bytes(self.asset_dir / asset, base64.b64decode(image_data))
+                self.written_assets[key] = asset
+            return f"{self.asset_dir.name}/{asset}"
         except Exception as e:
-            print(f"⚠️  Warning: Could not load image {image_path} - {e}")
+            print(f"⚠️  Warning: Could not load image {image.source} - {e}")
             return None
     
     def _get_image_path(self, image_path: str) -> Path:
@@ -86,12 +530,225 @@ class ExerciseToPaper:
             full_path = Path(image_path)
         return full_path if full_path.exists() else None
     
-    def generate_html(self, output_file: str = None) -> str:
-        """Generate HTML document for printing"""
+    def _start_pool(self):
+        if self.workers > 1 and self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="paper")
+    
+    def _stop_pool(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+    
+    def _render_in_order(self, parts: List[Tuple[str, Callable[[HtmlWriter], None]]], out: HtmlWriter):
+        """Write keyed HTML parts in list order, rendering them concurrently on the pool
+        
+        A part whose key is in the previous build is copied from the previous HTML
+        file instead of being rendered. Each rendered part fills its own list buffer;
+        at most 2 x workers finished parts wait in memory, so the output still streams.
+        """
+        def fragment(render) -> str:
+            buffer = []
+            render(buffer.append)
+            return ''.join(buffer)
+        
+        def write(key, data):
+            if isinstance(out, HtmlStream):
+                data = data.encode('utf-8') if isinstance(data, str) else data
+                self.part_spans[key] = [out.offset, len(data)]
+            out(data)
+        
+        pending = deque()
+        for key, render in parts:
+            data = self._reuse_part(key)
+            if data is not None:
+                self.build_stats['reused'] += 1
+                pending.append((key, data))
+            elif self.pool is None:
+                self.build_stats['rendered'] += 1
+                pending.append((key, fragment(render)))
+            else:
+                self.build_stats['rendered'] += 1
+                pending.append((key, self.pool.submit(fragment, render)))
+            if len(pending) >= self.workers * 2:
+                key, item = pending.popleft()
+                write(key, item if isinstance(item, (str, bytes)) else item.result())
+        while pending:
+            key, item = pending.popleft()
+            write(key, item if isinstance(item, (str, bytes)) else item.result())
+    
+    # --- Incremental builds ---------------------------------------------------
+    
+    def _build_settings(self, fmt: str) -> str:
+        """Everything besides the exercises that shapes the output; a change means a full rebuild"""
+        return json.dumps([fmt, code_fingerprint(), self.image_profile, HAS_PIL,
+                           self.asset_dir.name if self.asset_dir is not None else None])
+    
+    def _manifest_path(self, output_path: Path) -> Optional[Path]:
+        """Build manifests live in the cache folder, named after the output they describe"""
+        if not self.image_cache.cache_dir:
+            return None
+        name = hashlib.sha256(str(output_path.resolve()).encode('utf-8')).hexdigest()[:24]
+        return self.image_cache.cache_dir / "builds" / f"{name}.json"
+    
+    def _load_manifest(self, output_path: Path, fmt: str) -> Optional[Dict]:
+        """The manifest of the previous build, if it matches the output file still on disk"""
+        manifest_file = self._manifest_path(output_path)
+        if manifest_file is None or not output_path.exists():
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        st = output_path.stat()
+        if (manifest.get('settings') != self._build_settings(fmt)
+                or manifest.get('output') != [st.st_size, st.st_mtime_ns]):
+            return None  # Different settings, or the file was changed by someone else
+        return manifest
+    
+    def built_with_current_settings(self, output_path: Path, fmt: str, output_dir: Optional[str] = None) -> bool:
+        """Whether output_path was last written by this script with the same --images / output mode
+        
+        Answered from the build manifest, so False when there is none (e.g. trimmed from the cache).
+        """
+        previous = self.asset_dir
+        self.asset_dir = Path(output_dir) / "images" if output_dir is not None and fmt == 'html' else None
+        try:
+            return self._load_manifest(output_path, fmt) is not None
+        finally:
+            self.asset_dir = previous
+    
+    def _save_manifest(self, output_path: Path, fmt: str, **fields):
+        manifest_file = self._manifest_path(output_path)
+        if manifest_file is None:
+            return
+        st = output_path.stat()
+        manifest = {'settings': self._build_settings(fmt), 'output': [st.st_size, st.st_mtime_ns], **fields}
+        self.image_cache._write_atomic(manifest_file, json.dumps(manifest, ensure_ascii=True))
+    
+    def _reuse_part(self, key: str) -> Optional[bytes]:
+        """Bytes of an unchanged part from the previous HTML build, or None to render it"""
+        if self.previous_build is None:
+            return None
+        previous_file, spans = self.previous_build
+        span = spans.get(key)
+        if span is None:
+            return None
+        previous_file.seek(span[0])
+        data = previous_file.read(span[1])
+        # In folder mode the images it links to must still be there
+        if self.asset_dir is not None:
+            prefix = re.escape(self.asset_dir.name.encode('utf-8'))
+            for name in re.findall(b'src="' + prefix + b'/([^"]+)"', data):
+                if not (self.asset_dir / name.decode('utf-8')).exists():
+                    return None
+        return data
+    
+    @staticmethod
+    def _shuffled_order(exercise: Dict, count: int) -> List[int]:
+        """Shuffled range(count), seeded from the exercise content
+        
+        The same exercise always comes out in the same order, so regenerated
+        worksheets are reproducible and the HTML and DOCX versions agree.
+        """
+        content = json.dumps(exercise, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        order = list(range(count))
+        random.Random(hashlib.sha256(content).hexdigest()).shuffle(order)
+        return order
+    
+    def _iter_image_refs(self, value: Any) -> Iterator[str]:
+        """Every image path referenced anywhere inside an exercise"""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in ('image', 'image_path') and isinstance(item, str) and item:
+                    yield item
+                else:
+                    yield from self._iter_image_refs(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from self._iter_image_refs(item)
+    
+    def _docx_image_widths(self) -> Dict[Path, float]:
+        """Widest size (inches) each image is shown at in the DOCX
+        
+        Every use of an image then shares one picture part encoded at that width.
+        """
+        widths = {}
+        def need(image):
+            if image is not None and image.path:
+                widths[image.path] = max(widths.get(image.path, 0.0), DOCX_IMAGE_WIDTHS[image.role])
+        def walk(blocks):
+            for block in blocks:
+                need(block.image)
+                for image in block.images:
+                    need(image)
+                walk(block.children)
+                walk(block.docx or ())
+        
+        model = self.compile_worksheet()
+        for reference in model.reference_images:
+            need(reference.image)
+        for exercise in model.exercises:
+            walk(exercise.blocks)
+        return widths
+    
+    def _docx_image_bytes(self, full_path: Path, width: float) -> bytes:
+        """An image downscaled to `width` inches at the profile's DPI, as JPEG/PNG bytes for Word"""
+        if not (IMAGE_PROFILES.get(self.image_profile) and HAS_PIL):
+            return full_path.read_bytes()
+        
+        def encode(path: Path) -> str:
+            image_bytes, mime_type = optimize_image(path, 'inline', self.image_profile,
+                                                    box=(width, width * 20), allow_webp=False)
+            return f"data:{mime_type};base64,{base64.b64encode(image_bytes).decode('ascii')}"
+        
+        data_uri = self.image_cache.get(full_path, f"docx-{self.image_profile}-{width:g}in", encode)
+        return base64.b64decode(data_uri.split(',', 1)[1])
+    
+    def _prefetch_docx_images(self):
+        """Start preparing every image the DOCX needs on the pool, ahead of the (serial) document build"""
+        self.docx_images = {}
+        for full_path, width in self._docx_image_widths().items():
+            if self.pool is not None:
+                self.docx_images[full_path] = self.pool.submit(self._docx_image_bytes, full_path, width)
+            else:
+                self.docx_images[full_path] = (lambda p=full_path, w=width: self._docx_image_bytes(p, w))
+    
+    def _add_picture(self, doc: Document, full_path: Path, width: float):
+        """doc.add_picture with the shared, downscaled copy of the image
+        
+        The same bytes go in for every use of a picture, so python-docx stores it
+        in the package once (it dedups image parts by SHA-1).
+        """
+        image = self.docx_images.get(full_path)
+        if image is None:
+            image = self._docx_image_bytes(full_path, width)
+        elif callable(image):
+            image = image()
+        elif not isinstance(image, bytes):
+            image = image.result()
+        self.docx_images[full_path] = image
+        doc.add_picture(io.BytesIO(image), width=Inches(width))
+    
+    def generate_html(self, output_file: str = None, output_dir: str = None) -> str:
+        """Generate HTML document for printing
+        
+        With output_dir the worksheet is written as a folder instead of one big file:
+        output_dir/<name>.html plus an images/ subfolder holding each optimized image
+        once, named by its content hash. Unchanged images are never rewritten, and the
+        HTML itself is only rewritten when its text changed.
+        """
         if output_file is None:
             output_file = Path(self.json_file).stem + "_paper.html"
+        if output_dir is not None:
+            output_file = Path(output_dir) / Path(output_file).name
+            self.asset_dir = Path(output_dir) / "images"
+            self.asset_dir.mkdir(parents=True, exist_ok=True)
+            self.written_assets = {}
+        else:
+            self.asset_dir = None
         
-        html_content = """<!DOCTYPE html>
+        header = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -481,22 +1138,7 @@ class ExerciseToPaper:
         </div>
 """
         
-        # First pass: collect full-page images
-        self._collect_full_page_images()
-        
-        # Add exercises
-        for idx, exercise in enumerate(self.exercises, 1):
-            html_content += self._exercise_to_html(exercise, idx)
-        
-        # Add full-page images section if there are any
-        if self.full_page_images:
-            html_content += self._generate_full_page_images_section()
-        
-        # Add answers section
-        html_content += self._generate_answers_section()
-        
-        # Close HTML
-        html_content += """
+        footer = """
         <div class="footer">
             <p>© WifeyMOOC - Keep Learning! 💫</p>
         </div>
@@ -504,24 +1146,95 @@ class ExerciseToPaper:
 </body>
 </html>"""
         
-        html_content = html_content.replace("{date}", datetime.now().strftime("%B %d, %Y"))
-        
-        # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
+        # Stream fragments straight into a temp file next to the output, so memory
+        # stays bounded by the biggest single fragment (usually one image) rather
+        # than the whole document
+        output_path = Path(output_file)
+        tmp_file = output_path.with_name(output_path.name + ".tmp")
+        
+        # Unchanged exercises are copied from the previous build of this file (see the manifest)
+        manifest = self._load_manifest(output_path, 'html')
+        if manifest:
+            self.previous_build = (open(output_path, 'rb'), manifest.get('parts', {}))
+        self.part_spans = {}
+        self.build_stats = {'rendered': 0, 'reused': 0}
+        try:
+            with open(tmp_file, 'wb') as f:
+                out = HtmlStream(f)
+                out(header.replace("{date}", datetime.now().strftime("%B %d, %Y")))
+                
+                # One pass over the JSON; the renderers only read the compiled model
+                model = self.compile_worksheet()
+                
+                # Add exercises (rendered in parallel, written in order)
+                self._start_pool()
+                self._render_in_order(
+                    [(exercise.key, lambda w, ex=exercise: self._exercise_to_html(ex, w))
+                     for exercise in model.exercises], out)
+                
+                # Add full-page images section if there are any
+                if model.reference_images:
+                    self._generate_full_page_images_section(out)
+                
+                # Add answers section
+                self._generate_answers_section(out)
+                
+                out(footer)
+            
+            if self.previous_build is not None:
+                self.previous_build[0].close()
+                self.previous_build = None
+            
+            # In folder mode an unchanged HTML file is left alone, to keep mtimes stable
+            if self.asset_dir is not None and output_path.exists() and filecmp.cmp(tmp_file, output_path, shallow=False):
+                os.unlink(tmp_file)
+            else:
+                os.replace(tmp_file, output_path)
+            self._save_manifest(output_path, 'html', parts=self.part_spans)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            raise
+        finally:
+            if self.previous_build is not None:
+                self.previous_build[0].close()
+                self.previous_build = None
+            self._stop_pool()
+            self.asset_dir = None
+        self.image_cache.save_index()
+        
+        if self.build_stats['reused']:
+            total = self.build_stats['reused'] + self.build_stats['rendered']
+            print(f"♻️  Reused {self.build_stats['reused']}/{total} unchanged parts from the previous build")
+        self._memory_checkpoint("HTML saved")
         print(f"✓ HTML worksheet saved to: {output_file}")
         return output_file
     
     def generate_docx(self, output_file: str = None) -> str:
         """Generate DOCX document for editing"""
-        if not HAS_DOCX:
+        if not HAS_DOCX or not _import_docx():
             print("⚠️  Warning: python-docx not installed. Install with: pip install python-docx")
             return None
         
         if output_file is None:
             output_file = Path(self.json_file).stem + "_paper.docx"
         
+        # python-docx can't patch a saved document, so reuse is all or nothing:
+        # if no exercise or image changed since the last build, keep that file
+        model = self.compile_worksheet()
+        docx_key = hashlib.sha256('|'.join(
+            [exercise.key for exercise in model.exercises] +
+            [reference.key for reference in model.reference_images]
+        ).encode('ascii')).hexdigest()
+        manifest = self._load_manifest(Path(output_file), 'docx')
+        if manifest and manifest.get('key') == docx_key:
+            print(f"♻️  DOCX worksheet unchanged: {output_file}")
+            return output_file
+        
+        # Image files load on the pool while the document is built
+        self._start_pool()
+        self._prefetch_docx_images()
+        
         doc = Document()
         
         # Set up A4 page size
@@ -533,31 +1246,20 @@ class ExerciseToPaper:
         section.left_margin = Inches(0.75)
         section.right_margin = Inches(0.75)
         
+        self._add_docx_styles(doc)
+        
         # Add header
-        title = doc.add_paragraph()
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_run = title.add_run("📚 WifeyMOOC Worksheet")
-        title_run.font.size = Pt(24)
-        title_run.font.bold = True
-        title_run.font.color.rgb = RGBColor(44, 62, 80)
-        
-        subtitle = doc.add_paragraph()
-        subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        subtitle_run = subtitle.add_run(f"Exercise Set • Generated on {datetime.now().strftime('%B %d, %Y')}")
-        subtitle_run.font.size = Pt(11)
-        subtitle_run.font.color.rgb = RGBColor(127, 140, 141)
+        self._styled_paragraph(doc, "📚 WifeyMOOC Worksheet", 'WM Title')
+        self._styled_paragraph(doc, f"Exercise Set • Generated on {datetime.now().strftime('%B %d, %Y')}", 'WM Subtitle')
         
         doc.add_paragraph()  # Spacing
         
-        # First pass: collect full-page images
-        self._collect_full_page_images()
-        
         # Add exercises
-        for idx, exercise in enumerate(self.exercises, 1):
-            self._exercise_to_docx(doc, exercise, idx)
+        for exercise in model.exercises:
+            self._exercise_to_docx(doc, exercise)
         
         # Add page break before reference images
-        if self.full_page_images:
+        if model.reference_images:
             doc.add_page_break()
             self._generate_full_page_images_docx(doc)
         
@@ -566,788 +1268,849 @@ class ExerciseToPaper:
         self._generate_answers_docx(doc)
         
         # Save to file
+        self._stop_pool()
+        self.docx_images = {}
         doc.save(output_file)
+        self._save_manifest(Path(output_file), 'docx', key=docx_key)
+        self.image_cache.save_index()
+        self._memory_checkpoint("DOCX saved")
         print(f"✓ DOCX worksheet saved to: {output_file}")
         return output_file
     
-    def _collect_full_page_images(self):
-        """Collect images from simple types (MCQ, list_pick, etc.) for full-page rendering"""
-        self.full_page_images = {}  # Reset
-        for idx, exercise in enumerate(self.exercises, 1):
-            ex_type = exercise.get('type', '')
-            # Only collect images from simple question types
-            if ex_type in ['mcq_single', 'mcq_multiple', 'list_pick', 'fill_blanks_dropdown', 
-                          'word_fill', 'sequence_audio', 'order_phrase']:
-                if exercise.get('media'):
-                    media = exercise['media']
-                    if isinstance(media, dict) and 'image' in media:
-                        image_path = media['image']
-                        question_num = idx
-                        question_text = exercise.get('question', 'N/A')
-                        self.full_page_images[image_path] = {
-                            'question_num': question_num,
-                            'question_text': question_text,
-                            'type': ex_type
-                        }
-    
-    def _exercise_to_html(self, exercise: Dict[str, Any], number: int) -> str:
-        """Convert individual exercise to HTML"""
-        ex_type = exercise.get('type', 'unknown')
-        html = f'''
-        <div class="exercise">
-            <div>
-                <span class="exercise-number">Q{number}</span>
-                <span class="exercise-type">{ex_type.upper()}</span>
-            </div>
-            <div class="question">{exercise.get('question', 'N/A')}</div>
-'''
-        
+    # --- Compiler -------------------------------------------------------------
+
+    def compile_worksheet(self) -> WorksheetModel:
+        """Walk the exercises once and compile them into the document model
+
+        Every backend (HTML, DOCX, ...) renders from this model, so image paths are
+        resolved and hashed here once, and the per-type JSON handling lives in one place.
+        The model is cached until the exercises are reloaded.
+        """
+        if self.model is not None:
+            return self.model
+
+        exercises = []
+        reference_images = {}  # source path -> ReferenceImage (a later question wins, the position stays)
+        for number, exercise in enumerate(self.exercises, 1):
+            ex_type = exercise.get('type', 'unknown')
+            question = exercise.get('question', 'N/A')
+            blocks, reference = self._compile_blocks(exercise, ex_type)
+
+            answer = exercise.get('answer')
+            if answer is None:
+                answer_text = None
+            elif isinstance(answer, list):
+                answer_text = ', '.join(str(a) for a in answer) if answer else 'N/A'
+            elif isinstance(answer, dict):
+                answer_text = ' | '.join([f'{k}: {v}' for k, v in answer.items()])
+            else:
+                answer_text = str(answer)
+
+            # Build-manifest key: the exercise content, its position and the images it uses
+            h = hashlib.sha256(json.dumps(exercise, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            h.update(f"|Q{number}|".encode('utf-8'))
+            for image_path in self._iter_image_refs(exercise):
+                h.update(self._image_fingerprint(self._resolve_image(image_path)).encode('ascii'))
+            exercises.append(CompiledExercise(number, ex_type, question, tuple(blocks), answer_text,
+                                              f"ex-{h.hexdigest()[:32]}"))
+
+            if reference is not None:
+                h = hashlib.sha256(json.dumps([reference.source, number, question], ensure_ascii=False).encode('utf-8'))
+                h.update(self._image_fingerprint(reference.path).encode('ascii'))
+                reference_images[reference.source] = ReferenceImage(reference, number, question,
+                                                                    f"img-{h.hexdigest()[:32]}")
+
+        self.model = WorksheetModel(exercises, list(reference_images.values()))
+        self._memory_checkpoint("compiled worksheet model")
+        return self.model
+
+    def _resolve_image(self, image_path: str) -> Optional[Path]:
+        """_get_image_path, memoized; warns once about each missing image"""
+        if image_path not in self.resolved_images:
+            full_path = self._get_image_path(image_path) if image_path else None
+            if image_path and full_path is None:
+                print(f"⚠️  Warning: Image not found - {image_path}")
+            self.resolved_images[image_path] = full_path
+        return self.resolved_images[image_path]
+
+    def _image_ref(self, image_path: str, role: str) -> ImageRef:
+        return ImageRef(image_path, self._resolve_image(image_path), role)
+
+    def _image_fingerprint(self, full_path: Optional[Path]) -> str:
+        return self.image_cache.content_hash(full_path) if full_path else 'missing'
+
+    def _compile_blocks(self, exercise: Dict, ex_type: str) -> Tuple[List[Block], Optional[ImageRef]]:
+        """Blocks of one exercise, plus the image it shows on the reference pages (if any)"""
+        blocks = []
+        reference = None
+
         # Handle media if present
-        if exercise.get('media'):
-            media = exercise['media']
-            if isinstance(media, dict):
-                if 'video' in media:
-                    html += f'<div class="media-note">🎥 Video: {media["video"]}</div>\n'
-                if 'audio' in media:
-                    html += f'<div class="media-note">🔊 Audio: {media["audio"]}</div>\n'
-                if 'image' in media:
-                    # Check if this is a simple type (MCQ, etc.) that should reference full page
-                    if ex_type in ['mcq_single', 'mcq_multiple', 'list_pick', 'fill_blanks_dropdown',
-                                  'word_fill', 'sequence_audio', 'order_phrase']:
-                        # Reference full-page image instead of embedding
-                        image_filename = Path(media['image']).name
-                        html += f'<div class="image-reference">📄 See image "{image_filename}" on the reference page</div>\n'
-                    elif ex_type not in ['match_sentence', 'image_tagging']:
-                        # For other types (not match_sentence or image_tagging), embed inline
-                        html += self._render_inline_image(media['image'])
-        
-        # Type-specific rendering
-        if ex_type == 'mcq_single':
-            html += self._render_mcq_single(exercise)
-        elif ex_type == 'mcq_multiple':
-            html += self._render_mcq_multiple(exercise)
-        elif ex_type == 'list_pick':
-            html += self._render_list_pick(exercise)
+        media = exercise.get('media')
+        if isinstance(media, dict):
+            if 'video' in media:
+                blocks.append(Block('note', text=f"🎥 Video: {media['video']}"))
+            if 'audio' in media:
+                blocks.append(Block('note', text=f"🔊 Audio: {media['audio']}"))
+            if 'image' in media:
+                if ex_type in REFERENCE_IMAGE_TYPES:
+                    # Simple types point to a full-page copy instead of embedding it
+                    reference = self._image_ref(media['image'], 'full_page')
+                    blocks.append(Block('image_reference', text=Path(media['image']).name))
+                elif ex_type not in ['match_sentence', 'image_tagging']:
+                    filename = Path(media['image']).name
+                    blocks.append(Block('image', image=self._image_ref(media['image'], 'inline'),
+                                        text=filename, label=filename))
+
+        # Type-specific content
+        if ex_type in ('mcq_single', 'mcq_multiple', 'list_pick'):
+            blocks.append(Block('options', items=tuple(exercise.get('options', [])),
+                                multiple=ex_type != 'mcq_single'))
+
         elif ex_type == 'fill_blanks_dropdown':
-            html += self._render_fill_blanks(exercise)
+            children = [Block('sentence', items=tuple(exercise.get('sentence_parts', [])))]
+            docx = list(children)
+            options = exercise.get('options_for_blanks', [])
+            if options:
+                groups = tuple(tuple(str(o) for o in option) if isinstance(option, list) else (str(option),)
+                               for option in options)
+                children.append(Block('choices', label="Available options:", items=groups))
+                docx.append(Block('text', text="Available options:"))
+                for option, group in zip(options, groups):
+                    docx.append(Block('options', items=group))
+                    if isinstance(option, list):
+                        docx.append(Block('spacer'))  # Between blanks
+            blocks.append(Block('group', text='sentence-parts', children=tuple(children), docx=tuple(docx)))
+
         elif ex_type == 'match_phrase':
-            html += self._render_match_phrase(exercise)
+            pairs = exercise.get('pairs', [])
+            endings = [target for pair in pairs for target in pair.get('targets', []) if target.strip()]
+            blocks.append(Block('group', text='pairs-list', label="Complete the following phrases:", children=(
+                Block('prompts', text='___________', items=tuple(pair.get('source', '') for pair in pairs)),
+                Block('list', label="Available endings:", text='• ', items=tuple(endings)),
+            ), docx=(
+                Block('heading', text="Match the phrases:"),
+                Block('text', text="Complete the following phrases:"),
+                Block('paragraphs', items=tuple(((pair.get('source', ''), True), ("  " + "_" * 30, False))
+                                                for pair in pairs)),
+                Block('text', text="\nAvailable endings:"),
+                Block('options', items=tuple(endings)),
+            )))
+
         elif ex_type == 'match_phrases':
-            html += self._render_match_phrases(exercise)
+            children = []
+            docx = [Block('text', text="Associez les débuts et fins de phrases :")]
+            for pair_idx, pair in enumerate(exercise.get('pairs', []), 1):
+                source = f"{pair_idx}. {pair.get('source', '')}"
+                children.append(Block('prompts', text='___________', items=(source,)))
+                docx.append(Block('paragraphs', items=(((source, True), ("  " + "_" * 30, False)),)))
+                targets = tuple(t for t in pair.get('targets', []) if t.strip())
+                if targets:
+                    children.append(Block('list', text='• ', items=targets, indent=True))
+                    docx.append(Block('options', items=targets))
+                children.append(Block('spacer'))
+                docx.append(Block('spacer'))
+            blocks.append(Block('group', text='pairs-list', children=tuple(children), docx=tuple(docx)))
+
         elif ex_type == 'match_sentence':
-            html += self._render_match_sentence(exercise)
+            pairs = exercise.get('pairs', [])
+            # Shuffled (seeded from the exercise, so every output gets the same letters)
+            order = self._shuffled_order(exercise, len(pairs))
+            grid = Block('image_grid',
+                         images=tuple(self._image_ref(pairs[i].get('image_path', ''), 'thumbnail') for i in order),
+                         items=tuple(chr(65 + label_idx) for label_idx in range(len(order))))
+            blocks.append(grid._replace(docx=(Block('text', text="Images:"), grid)))
+            sentences = tuple(f"{idx}. {pair.get('sentence', '')}" for idx, pair in enumerate(pairs, 1))
+            blocks.append(Block('group', text='pairs-list', label="Match sentences with images:", inline=True, children=(
+                Block('prompts', text='___', items=sentences),
+            ), docx=(
+                Block('text', text="Match sentences with images:"),
+                Block('paragraphs', items=tuple(((sentence, True), ("  " + "_" * 15, False)) for sentence in sentences)),
+            )))
+
         elif ex_type == 'order_phrase':
-            html += self._render_order_phrase(exercise)
+            shuffled = tuple(f"{idx}. {p}" for idx, p in enumerate(exercise.get('phrase_shuffled', []), 1))
+            blocks.append(Block('group', text='sentence-parts', label="Shuffle to order:", children=(
+                Block('list', text='___ ', items=shuffled),
+            ), docx=(
+                Block('heading', text="Order the sentences:"),
+                Block('paragraphs', items=tuple((("__ ", True), (phrase, False)) for phrase in shuffled)),
+            )))
+            answer = tuple(enumerate(exercise.get('answer', []), 1))
+            blocks.append(Block('group', text='pairs-list', label="Correct order:", inline=True, children=(
+                Block('prompts', items=tuple(f"{idx}. {p}" for idx, p in answer)),
+            ), docx=(
+                Block('heading', text="\nCorrect order:"),
+                Block('paragraphs', items=tuple(((f"{idx}. ", True), (p, False)) for idx, p in answer)),
+            )))
+
         elif ex_type == 'categorization_multiple':
-            html += self._render_categorization(exercise)
+            categories = ', '.join(c for c in exercise.get('categories', []) if c.strip())
+            children = [Block('field', label="Categories:", text=categories)]
+            docx = [Block('heading', text=f"Categories: {categories}")]
+            for stimulus in exercise.get('stimuli', []):
+                item = []
+                if stimulus.get('text'):
+                    item.append(Block('text', text=stimulus['text']))
+                if stimulus.get('image'):
+                    item.append(Block('image', image=self._image_ref(stimulus['image'], 'stimulus'), text='stimulus'))
+                docx.extend(item)
+                item.append(Block('blank', label="Category:", text='___________'))
+                children.append(Block('item', children=tuple(item)))
+                docx.append(Block('paragraphs', items=((("Category: ", True), ("_" * 15, False)),)))
+                docx.append(Block('spacer'))
+            blocks.append(Block('group', children=tuple(children), docx=tuple(docx)))
+
         elif ex_type == 'word_fill':
-            html += self._render_word_fill(exercise)
+            sentence = Block('sentence', items=tuple(exercise.get('sentence_parts', [])))
+            blanks = range(1, len(exercise.get('answers', [])) + 1)
+            blocks.append(Block('group', text='sentence-parts', children=(sentence,) + tuple(
+                Block('blank', label=f"Blank {idx}:", text='___________') for idx in blanks
+            ), docx=(
+                sentence,
+                Block('spacer'),
+                Block('paragraphs', items=tuple(((f"Answer {idx}: ", True), ("_" * 20, False)) for idx in blanks)),
+            )))
+
         elif ex_type == 'sequence_audio':
-            html += self._render_sequence(exercise)
+            options = []
+            for idx, option in enumerate(exercise.get('audio_options', []), 1):
+                options.append(option.get('option', f'Item {idx}') if isinstance(option, dict) else option)
+            blocks.append(Block('group', text='sentence-parts', children=(
+                Block('list', text='___ ', items=tuple(f"{idx}. {opt_text}" for idx, opt_text in enumerate(options, 1))),
+            ), docx=(
+                Block('heading', text="Put items in order:"),
+                Block('paragraphs', items=tuple((("__ ", True), (opt_text, False)) for opt_text in options)),
+            )))
+
         elif ex_type == 'image_tagging':
-            html += self._render_image_tagging(exercise)
+            children = []
+            media = exercise.get('media', {})
+            if media.get('image'):
+                children.append(Block('image', image=self._image_ref(media['image'], 'inline'), text='tagging'))
+            docx = list(children)
+            button_label = exercise.get('button_label', 'N/A')
+            labels = tuple(tag.get('label', 'N/A') for tag in exercise.get('tags', []))
+            children.append(Block('field', label="Button:", text=button_label))
+            children.append(Block('group', text='category-list', label="Label with:", inline=True, children=(
+                Block('lines', text='• ', items=labels),
+            )))
+            docx += [Block('heading', text=f"Button: {button_label}"),
+                     Block('text', text="Label the diagram with:"),
+                     Block('bullets', items=labels)]
+            blocks.append(Block('group', children=tuple(children), docx=tuple(docx)))
+
         elif ex_type == 'multi_questions':
-            html += self._render_multi_questions(exercise)
+            questions = tuple(enumerate((q.get('question', 'N/A') for q in exercise.get('questions', [])), 1))
+            blocks.append(Block('group', text='pairs-list', children=(
+                Block('prompts', text='_________', items=tuple(f"Q{q_idx}: {text}" for q_idx, text in questions)),
+            ), docx=(
+                Block('heading', text="Sub-questions:"),
+                Block('paragraphs', items=tuple(((f"Q{q_idx}: ", True), (text, False)) for q_idx, text in questions)),
+            )))
+
         else:
-            html += '<div class="media-note">⚠️ Exercise type not yet formatted for printing</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
-    def _exercise_to_docx(self, doc: Document, exercise: Dict[str, Any], number: int):
+            # Only the HTML flags it; the DOCX just leaves the question without answer space
+            blocks.append(Block('note', text="⚠️ Exercise type not yet formatted for printing", docx=()))
+
+        return blocks, reference
+
+    # --- HTML backend -----------------------------------------------------------
+
+    def _exercise_to_html(self, exercise: CompiledExercise, out: HtmlWriter):
+        """Convert individual exercise to HTML"""
+        out(f'''
+        <div class="exercise">
+            <div>
+                <span class="exercise-number">Q{exercise.number}</span>
+                <span class="exercise-type">{exercise.type.upper()}</span>
+            </div>
+            <div class="question">{exercise.question}</div>
+''')
+        self._blocks_to_html(exercise.blocks, out)
+        out('</div>\n')
+        self._memory_checkpoint(f"HTML Q{exercise.number} ({exercise.type})")
+
+    def _blocks_to_html(self, blocks: Tuple[Block, ...], out: HtmlWriter):
+        for block in blocks:
+            getattr(self, f"_html_{block.kind}")(block, out)
+
+    def _html_group(self, block: Block, out: HtmlWriter):
+        out(f'<div class="{block.text}">' if block.text else '<div>')
+        if not block.inline:
+            out('\n')
+        if block.label:
+            out(f'<strong>{block.label}</strong>\n')
+        self._blocks_to_html(block.children, out)
+        out('</div>\n')
+
+    def _html_note(self, block: Block, out: HtmlWriter):
+        out(f'<div class="media-note">{block.text}</div>\n')
+
+    def _html_image_reference(self, block: Block, out: HtmlWriter):
+        out(f'<div class="image-reference">📄 See image "{block.text}" on the reference page</div>\n')
+
+    def _html_image(self, block: Block, out: HtmlWriter):
+        image_src = self._image_src(block.image)
+        if image_src and block.image.role == 'stimulus':
+            out(f'<img src="{image_src}" alt="{block.text}">\n')
+        elif image_src and block.label:
+            out(f'''<div class="media-image">
+    <img src="{image_src}" alt="{block.text}">
+    <div class="media-image-caption">{block.label}</div>
+</div>\n''')
+        elif image_src:
+            out(f'<div class="media-image"><img src="{image_src}" alt="{block.text}"></div>\n')
+        elif block.label:
+            out(f'<div class="media-note">🖼️ Image: {block.image.source}</div>\n')
+
+    def _html_options(self, block: Block, out: HtmlWriter):
+        input_type = 'checkbox' if block.multiple else 'radio'
+        out('<div class="option-list">\n')
+        for idx, option in enumerate(block.items):
+            out(f'<div class="option"><input type="{input_type}" id="q_opt_{idx}" name="question"> <label for="q_opt_{idx}">{option}</label></div>\n')
+        out('</div>\n')
+
+    def _html_sentence(self, block: Block, out: HtmlWriter):
+        for part in block.items:
+            out(part)
+        out('\n')
+
+    def _html_choices(self, block: Block, out: HtmlWriter):
+        choices = ', '.join(choice for group in block.items for choice in group)
+        out(f'<div class="category-list"><strong>{block.label}</strong> {choices}</div>\n')
+
+    def _html_field(self, block: Block, out: HtmlWriter):
+        out(f'<div class="category-list"><strong>{block.label}</strong> {block.text}</div>\n')
+
+    def _html_blank(self, block: Block, out: HtmlWriter):
+        out(f'<div class="category-list">{block.label} {block.text}</div>\n')
+
+    def _html_list(self, block: Block, out: HtmlWriter):
+        style = ' style="margin-left: 20px;"' if block.indent else ''
+        if block.label:  # Follows other content in its box
+            out(f'<br><strong>{block.label}</strong>\n')
+        for item in block.items:
+            out(f'<div class="option"{style}>{block.text}{item}</div>\n')
+
+    def _html_lines(self, block: Block, out: HtmlWriter):
+        for item in block.items:
+            out(f'{block.text}{item}<br>\n')
+
+    def _html_prompts(self, block: Block, out: HtmlWriter):
+        target = f'<div class="pair-target">{block.text}</div>' if block.text else ''
+        for item in block.items:
+            out(f'<div class="pair"><div class="pair-source">{item}</div>{target}</div>\n')
+
+    def _html_spacer(self, block: Block, out: HtmlWriter):
+        out('\n')
+
+    def _html_image_grid(self, block: Block, out: HtmlWriter):
+        out('<div class="image-grid">\n')
+        for label, image in zip(block.items, block.images):
+            image_src = self._image_src(image)
+            if image_src:
+                out(f'<div class="image-item"><img src="{image_src}" alt="Option {label}"><div class="image-label">({label})</div></div>\n')
+        out('</div>\n')
+
+    def _html_item(self, block: Block, out: HtmlWriter):
+        out('<div class="categorization-item">\n')
+        for child in block.children:
+            if child.kind == 'blank':  # The answer line of a boxed item
+                out(f'<div class="categorization-input">{child.label} {child.text}</div>\n')
+            else:
+                self._blocks_to_html((child,), out)
+        out('</div>\n')
+
+    def _html_text(self, block: Block, out: HtmlWriter):
+        out(f'<div class="categorization-text">{block.text}</div>\n')
+
+    def _generate_full_page_images_section(self, out: HtmlWriter):
+        """Generate full-page images section for HTML"""
+        out('<div class="full-page-images">\n')
+        out('<div class="full-page-images-header">🖼️ REFERENCE IMAGES</div>\n')
+
+        self._render_in_order(
+            [(reference.key, lambda w, ref=reference: self._full_page_image_item(ref, w))
+             for reference in self.compile_worksheet().reference_images], out)
+
+        out('</div>\n')
+
+    def _full_page_image_item(self, reference: ReferenceImage, out: HtmlWriter):
+        """One reference image page for HTML"""
+        image_src = self._image_src(reference.image)
+        if image_src:
+            question_num = reference.number
+            image_filename = Path(reference.image.source).name
+
+            out(f'<div class="full-page-image-item">\n')
+            out(f'<div class="full-page-image-label">Question {question_num}: {image_filename}</div>\n')
+            out(f'<p style="margin-bottom: 10px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">{reference.question}</p>\n')
+            out(f'<img src="{image_src}" alt="Question {question_num} image">\n')
+            out('</div>\n')
+
+    def _generate_answers_section(self, out: HtmlWriter):
+        """Generate answers section for HTML"""
+        out('<div class="answers-section">\n')
+        out('<div class="answers-header">📋 ANSWER KEY</div>\n')
+
+        for exercise in self.compile_worksheet().exercises:
+            if exercise.answer_text is None:
+                continue
+            out(f'<div class="answer-item">\n')
+            out(f'<div class="answer-number">Question {exercise.number}</div>\n')
+            out(f'<div class="answer-text">{exercise.answer_text}</div>\n')
+            out('</div>\n')
+
+        out('</div>\n')
+
+    # --- DOCX backend -----------------------------------------------------------
+
+    def _add_docx_styles(self, doc: Document):
+        """Create the DOCX_STYLES in the document (they also show up in Word's style gallery)
+
+        Only the style ids are kept (in self.docx_styles): assigning a style through
+        python-docx scans every style in the document each time, which made style
+        names slower than the per-run formatting they replace.
+        """
+        self.docx_styles = {}
+        for name, (kind, size, bold, italic, color, centered) in DOCX_STYLES.items():
+            style_type = WD_STYLE_TYPE.PARAGRAPH if kind == 'paragraph' else WD_STYLE_TYPE.CHARACTER
+            style = doc.styles.add_style(name, style_type)
+            if kind == 'paragraph':
+                style.base_style = doc.styles['Normal']
+                style.quick_style = True
+                if centered:
+                    style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            if size:
+                style.font.size = Pt(size)
+            if bold:
+                style.font.bold = True
+            if italic:
+                style.font.italic = True
+            if color:
+                style.font.color.rgb = RGBColor(*color)
+            self.docx_styles[name] = style.style_id
+        # Built-in styles the renderers use too
+        for name in ('Heading 4', 'List Bullet'):
+            self.docx_styles[name] = doc.styles[name].style_id
+
+    def _styled_paragraph(self, doc: Document, text: str, style_name: str):
+        """doc.add_paragraph(text) with one of the DOCX_STYLES (or Heading 4 / List Bullet) applied"""
+        para = doc.add_paragraph(text)
+        para._p.style = self.docx_styles[style_name]
+        return para
+
+    def _styled_run(self, para, text: str, style_name: str):
+        """para.add_run(text) with one of the DOCX_STYLES (character styles) applied"""
+        run = para.add_run(text)
+        run._r.style = self.docx_styles[style_name]
+        return run
+
+    def _exercise_to_docx(self, doc: Document, exercise: CompiledExercise):
         """Convert individual exercise to DOCX"""
-        ex_type = exercise.get('type', 'unknown')
-        
         # Add exercise header
         header = doc.add_paragraph()
-        q_num = header.add_run(f"Q{number}")
-        q_num.font.size = Pt(11)
-        q_num.font.bold = True
-        q_num.font.color.rgb = RGBColor(52, 152, 219)
-        
-        q_type = header.add_run(f" [{ex_type.upper()}]")
-        q_type.font.size = Pt(10)
-        q_type.font.color.rgb = RGBColor(44, 62, 80)
-        
+        self._styled_run(header, f"Q{exercise.number}", 'WM Number')
+        self._styled_run(header, f" [{exercise.type.upper()}]", 'WM Type')
+
         # Add question
-        q_para = doc.add_paragraph(exercise.get('question', 'N/A'))
-        q_para.style = 'Normal'
-        q_run = q_para.runs[0]
-        q_run.font.size = Pt(11)
-        q_run.font.bold = True
-        q_run.font.color.rgb = RGBColor(44, 62, 80)
-        
-        # Handle media
-        if exercise.get('media'):
-            media = exercise['media']
-            if isinstance(media, dict):
-                if 'video' in media:
-                    note = doc.add_paragraph(f"🎥 Video: {media['video']}")
-                    self._style_note_paragraph(note)
-                if 'audio' in media:
-                    note = doc.add_paragraph(f"🔊 Audio: {media['audio']}")
-                    self._style_note_paragraph(note)
-                if 'image' in media:
-                    # Check if should reference or embed
-                    if ex_type in ['mcq_single', 'mcq_multiple', 'list_pick', 'fill_blanks_dropdown',
-                                  'word_fill', 'sequence_audio', 'order_phrase']:
-                        # Reference full-page image
-                        image_filename = Path(media['image']).name
-                        note = doc.add_paragraph(f"📄 See image \"{image_filename}\" on the reference page")
-                        self._style_note_paragraph(note)
-                    elif ex_type not in ['match_sentence', 'image_tagging']:
-                        # Embed image
-                        self._add_image_to_docx(doc, media['image'])
-        
-        # Type-specific rendering
-        if ex_type == 'mcq_single':
-            self._render_mcq_single_docx(doc, exercise)
-        elif ex_type == 'mcq_multiple':
-            self._render_mcq_multiple_docx(doc, exercise)
-        elif ex_type == 'list_pick':
-            self._render_list_pick_docx(doc, exercise)
-        elif ex_type == 'fill_blanks_dropdown':
-            self._render_fill_blanks_docx(doc, exercise)
-        elif ex_type == 'match_phrase':
-            self._render_match_phrase_docx(doc, exercise)
-        elif ex_type == 'match_phrases':
-            self._render_match_phrases_docx(doc, exercise)
-        elif ex_type == 'match_sentence':
-            self._render_match_sentence_docx(doc, exercise)
-        elif ex_type == 'order_phrase':
-            self._render_order_phrase_docx(doc, exercise)
-        elif ex_type == 'categorization_multiple':
-            self._render_categorization_docx(doc, exercise)
-        elif ex_type == 'word_fill':
-            self._render_word_fill_docx(doc, exercise)
-        elif ex_type == 'sequence_audio':
-            self._render_sequence_docx(doc, exercise)
-        elif ex_type == 'image_tagging':
-            self._render_image_tagging_docx(doc, exercise)
-        elif ex_type == 'multi_questions':
-            self._render_multi_questions_docx(doc, exercise)
-        
+        self._styled_paragraph(doc, exercise.question, 'WM Question')
+
+        self._blocks_to_docx(doc, exercise.blocks)
+
         doc.add_paragraph()  # Spacing
-    
-    def _style_note_paragraph(self, para):
-        """Style a note paragraph"""
-        para.style = 'Normal'
-        for run in para.runs:
-            run.font.size = Pt(10)
-            run.font.italic = True
-            run.font.color.rgb = RGBColor(133, 100, 4)
-    
-    def _add_image_to_docx(self, doc: Document, image_path: str, width: float = 5.0):
-        """Add an image to DOCX document"""
-        try:
-            full_path = self._get_image_path(image_path)
-            if full_path:
-                doc.add_picture(str(full_path), width=Inches(width))
+        self._memory_checkpoint(f"DOCX Q{exercise.number} ({exercise.type})")
+
+    def _blocks_to_docx(self, doc: Document, blocks: Tuple[Block, ...]):
+        for block in blocks:
+            if block.docx is not None:
+                self._blocks_to_docx(doc, block.docx)
             else:
-                doc.add_paragraph(f"[Image not found: {image_path}]")
-        except Exception as e:
-            doc.add_paragraph(f"[Could not add image: {image_path}]")
-    
+                getattr(self, f"_docx_{block.kind}")(doc, block)
+
     def _add_checkbox_to_docx(self, para: Document, text: str, checked: bool = False):
         """Add a checkbox to a paragraph in DOCX"""
         checkbox_symbol = "☑" if checked else "☐"
-        p = para.add_paragraph(f"{checkbox_symbol} {text}")
+        p = self._styled_paragraph(para, f"{checkbox_symbol} {text}", 'WM Option')
         return p
-    
-    def _render_mcq_single_docx(self, doc: Document, exercise: Dict):
-        """Render MCQ single choice in DOCX with checkboxes"""
-        for option in exercise.get('options', []):
-            self._add_checkbox_to_docx(doc, option)
-    
-    def _render_mcq_multiple_docx(self, doc: Document, exercise: Dict):
-        """Render MCQ multiple choice in DOCX with checkboxes"""
-        for option in exercise.get('options', []):
-            self._add_checkbox_to_docx(doc, option)
-    
-    def _render_list_pick_docx(self, doc: Document, exercise: Dict):
-        """Render list pick in DOCX with checkboxes"""
-        for option in exercise.get('options', []):
+
+    def _add_image_to_docx(self, doc: Document, image: ImageRef):
+        """Add an image to DOCX document"""
+        try:
+            if image.path:
+                self._add_picture(doc, image.path, DOCX_IMAGE_WIDTHS[image.role])
+            else:
+                doc.add_paragraph(f"[Image not found: {image.source}]")
+        except Exception as e:
+            doc.add_paragraph(f"[Could not add image: {image.source}]")
+
+    def _docx_group(self, doc: Document, block: Block):
+        if block.label:
+            self._styled_paragraph(doc, block.label, 'Heading 4')
+        self._blocks_to_docx(doc, block.children)
+
+    def _docx_heading(self, doc: Document, block: Block):
+        self._styled_paragraph(doc, block.text, 'Heading 4')
+
+    def _docx_paragraphs(self, doc: Document, block: Block):
+        for runs in block.items:
+            p = doc.add_paragraph()
+            for text, bold in runs:
+                run = p.add_run(text)
+                if bold:
+                    run.bold = True
+
+    def _docx_bullets(self, doc: Document, block: Block):
+        for item in block.items:
+            self._styled_paragraph(doc, item, 'List Bullet')
+
+    def _docx_note(self, doc: Document, block: Block):
+        self._styled_paragraph(doc, block.text, 'WM Note')
+
+    def _docx_image_reference(self, doc: Document, block: Block):
+        self._styled_paragraph(doc, f"📄 See image \"{block.text}\" on the reference page", 'WM Note')
+
+    def _docx_image(self, doc: Document, block: Block):
+        self._add_image_to_docx(doc, block.image)
+
+    def _docx_options(self, doc: Document, block: Block):
+        for option in block.items:
             self._add_checkbox_to_docx(doc, option)
-    
-    def _render_fill_blanks_docx(self, doc: Document, exercise: Dict):
-        """Render fill blanks in DOCX with dropdown options"""
-        # Show the sentence with blanks
-        parts = exercise.get('sentence_parts', [])
-        
-        # Show sentence text with blanks formatted clearly
+
+    def _docx_sentence(self, doc: Document, block: Block):
         p = doc.add_paragraph()
-        for part in parts:
+        for part in block.items:
             p.add_run(part)
-        
-        # Show available options with proper spacing
-        options = exercise.get('options_for_blanks', [])
-        if options:
-            doc.add_paragraph("Available options:")
-            for option in options:
-                if isinstance(option, list):
-                    # If option is a list of choices for that blank
-                    for choice in option:
-                        self._add_checkbox_to_docx(doc, choice)
-                    doc.add_paragraph()  # Spacing between blanks
-                else:
-                    self._add_checkbox_to_docx(doc, str(option))
-    
-    def _render_match_phrase_docx(self, doc: Document, exercise: Dict):
-        """Render match phrase (singular) in DOCX - student sees starting phrases and matching options"""
-        doc.add_paragraph("Match the phrases:", style='Heading 4')
-        pairs = exercise.get('pairs', [])
-        
-        # Show starting phrases
-        doc.add_paragraph("Complete the following phrases:", style='Normal')
-        for pair in pairs:
-            source = pair.get('source', '')
-            p = doc.add_paragraph()
-            p.add_run(source).bold = True
-            p.add_run("  " + "_" * 30)
-        
-        # Show available endings
-        doc.add_paragraph("\nAvailable endings:", style='Normal')
-        all_targets = []
-        for pair in pairs:
-            targets = pair.get('targets', [])
-            all_targets.extend(targets)
-        
-        for target in all_targets:
-            if target.strip():  # Skip empty options
-                self._add_checkbox_to_docx(doc, target)
-    
-    def _render_match_phrases_docx(self, doc: Document, exercise: Dict):
-        """Render match phrases in DOCX with all targets visible for each source"""
-        doc.add_paragraph("Associez les débuts et fins de phrases :")
-        pairs = exercise.get('pairs', [])
-        
-        # Show each starting phrase with its available targets
-        for pair_idx, pair in enumerate(pairs, 1):
-            source = pair.get('source', '')
-            targets = pair.get('targets', [])
-            
-            # Show the source with blank line for answer
+
+    def _docx_choices(self, doc: Document, block: Block):
+        doc.add_paragraph(block.label)
+        for group in block.items:
+            for choice in group:
+                self._add_checkbox_to_docx(doc, choice)
+            if len(group) > 1:
+                doc.add_paragraph()  # Spacing between blanks
+
+    def _docx_field(self, doc: Document, block: Block):
+        p = doc.add_paragraph()
+        p.add_run(block.label).bold = True
+        p.add_run(f" {block.text}")
+
+    def _docx_blank(self, doc: Document, block: Block):
+        self._docx_field(doc, block)
+
+    def _docx_list(self, doc: Document, block: Block):
+        if block.label:
+            self._styled_paragraph(doc, block.label, 'Heading 4')
+        for item in block.items:
+            p = self._styled_paragraph(doc, f"{block.text}{item}", 'WM Option')
+            if block.indent:
+                p.paragraph_format.left_indent = Inches(0.3)
+
+    def _docx_lines(self, doc: Document, block: Block):
+        for item in block.items:
+            self._styled_paragraph(doc, f"{block.text}{item}", 'WM Option')
+
+    def _docx_prompts(self, doc: Document, block: Block):
+        for item in block.items:
             p = doc.add_paragraph()
-            p.add_run(f"{pair_idx}. {source}").bold = True
-            p.add_run("  " + "_" * 30)
-            
-            # Show available targets for this pair as checkboxes
-            if targets:
-                for target in targets:
-                    if target.strip():  # Skip empty options
-                        self._add_checkbox_to_docx(doc, target)
-            
-            doc.add_paragraph()  # Spacing between pairs
-    
-    def _render_match_sentence_docx(self, doc: Document, exercise: Dict):
-        """Render match sentence in DOCX with images displayed individually"""
-        pairs = exercise.get('pairs', [])
-        
-        # Display images individually on separate lines
-        doc.add_paragraph("Images:")
-        images_with_indices = [(idx, pair.get('image_path', '')) for idx, pair in enumerate(pairs)]
-        random_order = list(range(len(pairs)))
-        random.shuffle(random_order)
-        shuffled_images = [images_with_indices[i] for i in random_order]
-        
-        for label_idx, (orig_idx, image_path) in enumerate(shuffled_images):
-            full_path = self._get_image_path(image_path)
-            if full_path:
-                label = chr(65 + label_idx)
-                # Add label
-                label_para = doc.add_paragraph(f"({label})")
-                # Add image
-                try:
-                    doc.add_picture(str(full_path), width=Inches(2.0))
-                except:
-                    doc.add_paragraph(f"[Image not found: {image_path}]")
+            p.add_run(item).bold = True
+            if block.text:
+                p.add_run("  " + block.text)
+
+    def _docx_spacer(self, doc: Document, block: Block):
+        doc.add_paragraph()
+
+    def _docx_image_grid(self, doc: Document, block: Block):
+        for label, image in zip(block.items, block.images):
+            if image.path:
+                doc.add_paragraph(f"({label})")
+                self._add_image_to_docx(doc, image)
                 doc.add_paragraph()  # Spacing between images
-        
-        # Add matching section
-        doc.add_paragraph("Match sentences with images:")
-        for idx, pair in enumerate(pairs, 1):
-            sentence = pair.get('sentence', '')
-            p = doc.add_paragraph()
-            p.add_run(f"{idx}. {sentence}").bold = True
-            p.add_run("  " + "_" * 15)
-    
-    def _render_order_phrase_docx(self, doc: Document, exercise: Dict):
-        """Render order phrase in DOCX"""
-        doc.add_paragraph("Order the sentences:", style='Heading 4')
-        for idx, phrase in enumerate(exercise.get('phrase_shuffled', []), 1):
-            p = doc.add_paragraph()
-            p.add_run("__ ").bold = True
-            p.add_run(f"{idx}. {phrase}")
-        
-        # Add correct answer sequence
-        doc.add_paragraph("\nCorrect order:", style='Heading 4')
-        for idx, phrase in enumerate(exercise.get('answer', []), 1):
-            p = doc.add_paragraph()
-            p.add_run(f"{idx}. ").bold = True
-            p.add_run(phrase)
-    
-    def _render_categorization_docx(self, doc: Document, exercise: Dict):
-        """Render categorization in DOCX"""
-        categories = exercise.get('categories', [])
-        cat_text = ', '.join(c for c in categories if c.strip())
-        doc.add_paragraph(f"Categories: {cat_text}", style='Heading 4')
-        
-        stimuli = exercise.get('stimuli', [])
-        for stimulus in stimuli:
-            text = stimulus.get('text', '')
-            image = stimulus.get('image', '')
-            
-            if text:
-                p = doc.add_paragraph(text)
-            
-            if image:
-                self._add_image_to_docx(doc, image, width=3.0)
-            
-            p = doc.add_paragraph()
-            p.add_run("Category: ").bold = True
-            p.add_run("_" * 15)
-            doc.add_paragraph()  # Spacing
-    
-    def _render_word_fill_docx(self, doc: Document, exercise: Dict):
-        """Render word fill in DOCX"""
-        parts = exercise.get('sentence_parts', [])
-        p = doc.add_paragraph()
-        for part in parts:
-            p.add_run(part)
-        
+
+    def _docx_item(self, doc: Document, block: Block):
+        self._blocks_to_docx(doc, block.children)
         doc.add_paragraph()  # Spacing
-        
-        for idx in range(len(exercise.get('answers', []))):
-            blank = doc.add_paragraph()
-            blank.add_run(f"Answer {idx+1}: ").bold = True
-            blank.add_run("_" * 20)
-    
-    def _render_sequence_docx(self, doc: Document, exercise: Dict):
-        """Render sequence in DOCX"""
-        doc.add_paragraph("Put items in order:", style='Heading 4')
-        options = exercise.get('audio_options', [])
-        for idx, option in enumerate(options, 1):
-            opt_text = option.get('option', f'Item {idx}') if isinstance(option, dict) else option
-            p = doc.add_paragraph()
-            p.add_run("__ ").bold = True
-            p.add_run(opt_text)
-    
-    def _render_image_tagging_docx(self, doc: Document, exercise: Dict):
-        """Render image tagging in DOCX"""
-        media = exercise.get('media', {})
-        image_path = media.get('image', '')
-        
-        if image_path:
-            self._add_image_to_docx(doc, image_path, width=5.0)
-        
-        doc.add_paragraph(f"Button: {exercise.get('button_label', 'N/A')}", style='Heading 4')
-        doc.add_paragraph("Label the diagram with:")
-        
-        tags = exercise.get('tags', [])
-        for tag in tags:
-            doc.add_paragraph(tag.get('label', 'N/A'), style='List Bullet')
-    
-    def _render_multi_questions_docx(self, doc: Document, exercise: Dict):
-        """Render multi questions in DOCX"""
-        doc.add_paragraph("Sub-questions:", style='Heading 4')
-        for q_idx, question in enumerate(exercise.get('questions', []), 1):
-            p = doc.add_paragraph()
-            p.add_run(f"Q{q_idx}: ").bold = True
-            p.add_run(question.get('question', 'N/A'))
-    
-    def _generate_full_page_images_section(self) -> str:
-        """Generate full-page images section for HTML"""
-        html = '<div class="full-page-images">\n'
-        html += '<div class="full-page-images-header">🖼️ REFERENCE IMAGES</div>\n'
-        
-        for image_path, metadata in self.full_page_images.items():
-            data_uri = self._load_image_as_base64(image_path)
-            if data_uri:
-                question_num = metadata['question_num']
-                question_text = metadata['question_text']
-                image_filename = Path(image_path).name
-                
-                html += f'<div class="full-page-image-item">\n'
-                html += f'<div class="full-page-image-label">Question {question_num}: {image_filename}</div>\n'
-                html += f'<p style="margin-bottom: 10px; color: #7f8c8d; font-size: 0.9em; font-style: italic;">{question_text}</p>\n'
-                html += f'<img src="{data_uri}" alt="Question {question_num} image">\n'
-                html += '</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
+
+    def _docx_text(self, doc: Document, block: Block):
+        doc.add_paragraph(block.text)
+
     def _generate_full_page_images_docx(self, doc: Document):
         """Generate full-page images section for DOCX"""
-        title = doc.add_paragraph()
-        title_run = title.add_run("🖼️ REFERENCE IMAGES")
-        title_run.font.size = Pt(14)
-        title_run.font.bold = True
-        title_run.font.color.rgb = RGBColor(155, 89, 182)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
+        self._styled_paragraph(doc, "🖼️ REFERENCE IMAGES", 'WM Reference Title')
+
         doc.add_paragraph()  # Spacing
-        
-        for image_path, metadata in self.full_page_images.items():
-            full_path = self._get_image_path(image_path)
-            if full_path:
-                question_num = metadata['question_num']
-                question_text = metadata['question_text']
-                image_filename = Path(image_path).name
-                
+
+        for reference in self.compile_worksheet().reference_images:
+            if reference.image.path:
+                image_filename = Path(reference.image.source).name
+
                 # Title
-                title_para = doc.add_paragraph()
-                title_run = title_para.add_run(f"Question {question_num}: {image_filename}")
-                title_run.font.bold = True
-                title_run.font.size = Pt(11)
-                
+                self._styled_paragraph(doc, f"Question {reference.number}: {image_filename}", 'WM Reference Label')
+
                 # Question text
-                q_para = doc.add_paragraph(question_text)
-                for run in q_para.runs:
-                    run.font.italic = True
-                    run.font.size = Pt(10)
-                
+                self._styled_paragraph(doc, reference.question, 'WM Reference Question')
+
                 # Image
                 try:
-                    doc.add_picture(str(full_path), width=Inches(6.0))
+                    self._add_picture(doc, reference.image.path, DOCX_IMAGE_WIDTHS['full_page'])
                 except:
                     doc.add_paragraph(f"[Could not load image: {image_filename}]")
-                
+
                 doc.add_paragraph()  # Spacing
-    
-    def _generate_answers_section(self) -> str:
-        """Generate answers section for HTML"""
-        html = '<div class="answers-section">\n'
-        html += '<div class="answers-header">📋 ANSWER KEY</div>\n'
-        
-        for idx, exercise in enumerate(self.exercises, 1):
-            answer = exercise.get('answer')
-            if answer is None:
-                continue
-            
-            html += f'<div class="answer-item">\n'
-            html += f'<div class="answer-number">Question {idx}</div>\n'
-            
-            if isinstance(answer, list):
-                answer_text = ', '.join(str(a) for a in answer) if answer else 'N/A'
-            elif isinstance(answer, dict):
-                answer_text = ' | '.join([f'{k}: {v}' for k, v in answer.items()])
-            else:
-                answer_text = str(answer)
-            
-            html += f'<div class="answer-text">{answer_text}</div>\n'
-            html += '</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
+
     def _generate_answers_docx(self, doc: Document):
         """Generate answers section for DOCX"""
-        title = doc.add_paragraph()
-        title_run = title.add_run("📋 ANSWER KEY")
-        title_run.font.size = Pt(14)
-        title_run.font.bold = True
-        title_run.font.color.rgb = RGBColor(231, 76, 60)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
+        self._styled_paragraph(doc, "📋 ANSWER KEY", 'WM Answers Title')
+
         doc.add_paragraph()  # Spacing
-        
-        for idx, exercise in enumerate(self.exercises, 1):
-            answer = exercise.get('answer')
-            if answer is None:
+
+        for exercise in self.compile_worksheet().exercises:
+            if exercise.answer_text is None:
                 continue
-            
-            # Question number
-            q_para = doc.add_paragraph()
-            q_run = q_para.add_run(f"Q{idx}")
-            q_run.font.bold = True
-            q_run.font.color.rgb = RGBColor(39, 174, 96)
-            
-            # Answer
-            if isinstance(answer, list):
-                answer_text = ', '.join(str(a) for a in answer) if answer else 'N/A'
-            elif isinstance(answer, dict):
-                answer_text = ' | '.join([f'{k}: {v}' for k, v in answer.items()])
-            else:
-                answer_text = str(answer)
-            
-            a_run = q_para.add_run(f": {answer_text}")
-            a_run.font.size = Pt(11)
+
+            q_para = self._styled_paragraph(doc, '', 'WM Answer')
+            self._styled_run(q_para, f"Q{exercise.number}", 'WM Answer Number')
+            q_para.add_run(f": {exercise.answer_text}")
+
+
+# --- Batch mode ---------------------------------------------------------------
+
+OUTPUT_FORMATS = {'html': ['html'], 'docx': ['docx'], 'both': ['html', 'docx']}
+
+
+def find_exercise_files(patterns: List[str]) -> List[Path]:
+    """Expand files, directories (searched recursively) and glob patterns into JSON files
     
-    def _render_inline_image(self, image_path: str) -> str:
-        """Render an image inline with base64 encoding for HTML"""
-        data_uri = self._load_image_as_base64(image_path)
-        if data_uri:
-            filename = Path(image_path).name
-            return f'''<div class="media-image">
-    <img src="{data_uri}" alt="{filename}">
-    <div class="media-image-caption">{filename}</div>
-</div>\n'''
+    Generated/saved files (progress saves, autosaves, image cache index) are left out.
+    """
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(Path(pattern).rglob("*.json"))
         else:
-            return f'<div class="media-note">🖼️ Image: {image_path}</div>\n'
-    
-    def _render_mcq_single(self, exercise: Dict) -> str:
-        """Render MCQ single choice for HTML"""
-        html = '<div class="option-list">\n'
-        for idx, option in enumerate(exercise.get('options', [])):
-            html += f'<div class="option"><input type="radio" id="q_opt_{idx}" name="question"> <label for="q_opt_{idx}">{option}</label></div>\n'
-        html += '</div>\n'
-        return html
-    
-    def _render_mcq_multiple(self, exercise: Dict) -> str:
-        """Render MCQ multiple choice for HTML"""
-        html = '<div class="option-list">\n'
-        for idx, option in enumerate(exercise.get('options', [])):
-            html += f'<div class="option"><input type="checkbox" id="q_opt_{idx}" name="question"> <label for="q_opt_{idx}">{option}</label></div>\n'
-        html += '</div>\n'
-        return html
-    
-    def _render_list_pick(self, exercise: Dict) -> str:
-        """Render list pick for HTML"""
-        html = '<div class="option-list">\n'
-        for idx, option in enumerate(exercise.get('options', [])):
-            html += f'<div class="option"><input type="checkbox" id="q_opt_{idx}" name="question"> <label for="q_opt_{idx}">{option}</label></div>\n'
-        html += '</div>\n'
-        return html
-    
-    def _render_fill_blanks(self, exercise: Dict) -> str:
-        """Render fill blanks for HTML with dropdown options displayed"""
-        html = '<div class="sentence-parts">\n'
-        parts = exercise.get('sentence_parts', [])
-        
-        # Show sentence with blanks
-        for part in parts:
-            html += part
-        html += '\n'
-        
-        # Show available options
-        options = exercise.get('options_for_blanks', [])
-        if options:
-            html += '<div class="category-list"><strong>Available options:</strong> '
-            option_list = []
-            for option in options:
-                if isinstance(option, list):
-                    option_list.extend(option)
-                else:
-                    option_list.append(str(option))
-            html += ', '.join(option_list)
-            html += '</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
-    def _render_match_phrase(self, exercise: Dict) -> str:
-        """Render match phrase (singular) for HTML - student sees starting phrases and matching options"""
-        html = '<div class="pairs-list">\n'
-        html += '<strong>Complete the following phrases:</strong>\n'
-        pairs = exercise.get('pairs', [])
-        
-        # Show starting phrases
-        for pair in pairs:
-            source = pair.get('source', '')
-            html += f'<div class="pair"><div class="pair-source">{source}</div><div class="pair-target">___________</div></div>\n'
-        
-        # Show available endings
-        html += '<br><strong>Available endings:</strong>\n'
-        all_targets = []
-        for pair in pairs:
-            targets = pair.get('targets', [])
-            all_targets.extend(targets)
-        
-        for target in all_targets:
-            if target.strip():  # Skip empty options
-                html += f'<div class="option">• {target}</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
-    def _render_match_phrases(self, exercise: Dict) -> str:
-        """Render match phrases for HTML with targets visible for each source"""
-        html = '<div class="pairs-list">\n'
-        pairs = exercise.get('pairs', [])
-        
-        for pair_idx, pair in enumerate(pairs, 1):
-            source = pair.get('source', '')
-            targets = pair.get('targets', [])
-            
-            # Show source with blank
-            html += f'<div class="pair"><div class="pair-source">{pair_idx}. {source}</div><div class="pair-target">___________</div></div>\n'
-            
-            # Show available targets for this pair
-            if targets:
-                for target in targets:
-                    if target.strip():  # Skip empty options
-                        html += f'<div class="option" style="margin-left: 20px;">• {target}</div>\n'
-            html += '\n'
-        
-        html += '</div>\n'
-        return html
-    
-    def _render_match_sentence(self, exercise: Dict) -> str:
-        """Render match sentence for HTML"""
-        html = '<div class="image-grid">\n'
-        pairs = exercise.get('pairs', [])
-        
-        # Shuffle images
-        indices = list(range(len(pairs)))
-        random.shuffle(indices)
-        
-        for label_idx, orig_idx in enumerate(indices):
-            pair = pairs[orig_idx]
-            image_path = pair.get('image_path', '')
-            data_uri = self._load_image_as_base64(image_path)
-            
-            if data_uri:
-                label = chr(65 + label_idx)
-                html += f'<div class="image-item"><img src="{data_uri}" alt="Option {label}"><div class="image-label">({label})</div></div>\n'
-        
-        html += '</div>\n'
-        
-        # Add sentences to match
-        html += '<div class="pairs-list"><strong>Match sentences with images:</strong>\n'
-        for idx, pair in enumerate(pairs, 1):
-            sentence = pair.get('sentence', '')
-            html += f'<div class="pair"><div class="pair-source">{idx}. {sentence}</div><div class="pair-target">___</div></div>\n'
-        html += '</div>\n'
-        
-        return html
-    
-    def _render_order_phrase(self, exercise: Dict) -> str:
-        """Render order phrase for HTML"""
-        html = '<div class="sentence-parts">\n'
-        html += '<strong>Shuffle to order:</strong>\n'
-        phrases = exercise.get('phrase_shuffled', [])
-        
-        for idx, phrase in enumerate(phrases, 1):
-            html += f'<div class="option">___ {idx}. {phrase}</div>\n'
-        
-        html += '</div>\n'
-        html += '<div class="pairs-list"><strong>Correct order:</strong>\n'
-        answers = exercise.get('answer', [])
-        for idx, phrase in enumerate(answers, 1):
-            html += f'<div class="pair"><div class="pair-source">{idx}. {phrase}</div></div>\n'
-        html += '</div>\n'
-        
-        return html
-    
-    def _render_categorization(self, exercise: Dict) -> str:
-        """Render categorization for HTML"""
-        html = '<div>\n'
-        categories = exercise.get('categories', [])
-        cat_text = ', '.join(c for c in categories if c.strip())
-        html += f'<div class="category-list"><strong>Categories:</strong> {cat_text}</div>\n'
-        
-        for stimulus in exercise.get('stimuli', []):
-            html += '<div class="categorization-item">\n'
-            
-            if stimulus.get('text'):
-                html += f'<div class="categorization-text">{stimulus["text"]}</div>\n'
+            matches = sorted(Path(m) for m in glob.glob(pattern, recursive=True)) or [Path(pattern)]
+        for path in matches:
+            if path.name.endswith(('.autosave.json', '_progress.json')) or path.name == 'index.json':
+                continue
+            if path not in found:
+                found.append(path)
+    return found
+
+
+def worksheet_outputs(json_file: Path, formats: List[str], output_dir: Optional[Path] = None,
+                      root: Optional[Path] = None) -> Dict[str, Path]:
+    """Where the worksheets for json_file go: next to it, or mirrored under output_dir"""
+    folder = json_file.parent
+    if output_dir is not None:
+        try:
+            folder = output_dir / json_file.parent.relative_to(root)
+        except (TypeError, ValueError):
+            folder = output_dir
+    return {fmt: folder / f"{json_file.stem}_paper.{fmt}" for fmt in formats}
+
+
+def _convert_one(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Batch worker (runs in a child process): convert one JSON file unless its outputs are fresh"""
+    json_file = Path(job['json_file'])
+    outputs = {fmt: Path(path) for fmt, path in job['outputs'].items()}
+    result = {'json_file': str(json_file), 'status': 'built', 'seconds': 0.0, 'log': ''}
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            converter = ExerciseToPaper(str(json_file), image_profile=job['image_profile'],
+                                        workers=job['workers'])
+            if not isinstance(converter.exercises, list) or not all(
+                    isinstance(ex, dict) and 'type' in ex for ex in converter.exercises):
+                result['status'] = 'not an exercise file'
+                return result
             
-            if stimulus.get('image'):
-                data_uri = self._load_image_as_base64(stimulus['image'])
-                if data_uri:
-                    html += f'<img src="{data_uri}" alt="stimulus">\n'
+            # Fresh = every output is newer than the JSON, every image it uses, and this script,
+            # and its build manifest says it was made with the same --images and output mode
+            if not job['force'] and all(out.exists() for out in outputs.values()):
+                inputs = [json_file, Path(__file__)]
+                inputs += [p for p in map(converter._get_image_path, converter._iter_image_refs(converter.exercises)) if p]
+                newest_input = max(p.stat().st_mtime for p in inputs)
+                if min(out.stat().st_mtime for out in outputs.values()) > newest_input and all(
+                        converter.built_with_current_settings(out, fmt, str(out.parent) if job['external_images'] else None)
+                        for fmt, out in outputs.items()):
+                    result['status'] = 'up to date'
+                    return result
             
-            html += '<div class="categorization-input">Category: ___________</div>\n'
-            html += '</div>\n'
-        
-        html += '</div>\n'
-        return html
-    
-    def _render_word_fill(self, exercise: Dict) -> str:
-        """Render word fill for HTML"""
-        html = '<div class="sentence-parts">\n'
-        parts = exercise.get('sentence_parts', [])
-        
-        for part in parts:
-            html += part
-        
-        html += '\n'
-        for idx in range(len(exercise.get('answers', []))):
-            html += f'<div class="category-list">Blank {idx+1}: ___________</div>\n'
-        
-        html += '</div>\n'
-        return html
+            for fmt, out in outputs.items():
+                out.parent.mkdir(parents=True, exist_ok=True)
+                if fmt == 'html':
+                    converter.generate_html(str(out), output_dir=str(out.parent) if job['external_images'] else None)
+                elif converter.generate_docx(str(out)) is None:
+                    result['status'] = 'built (no DOCX: python-docx missing)'
+    except (Exception, SystemExit) as e:
+        result['status'] = 'failed'
+        result['error'] = str(e) or type(e).__name__
+    finally:
+        result['seconds'] = time.perf_counter() - start
+        result['log'] = log.getvalue()
+    return result
+
+
+def run_batch(patterns: List[str], formats: List[str], output_dir: Optional[str] = None,
+              image_profile: str = DEFAULT_IMAGE_PROFILE, processes: int = None,
+              workers: int = 1, force: bool = False) -> int:
+    """Convert many exercise files in parallel across cores; returns the number of failures"""
+    files = find_exercise_files(patterns)
+    if not files:
+        print("✗ No exercise JSON files found")
+        return 1
     
-    def _render_sequence(self, exercise: Dict) -> str:
-        """Render sequence for HTML"""
-        html = '<div class="sentence-parts">\n'
-        
-        for idx, option in enumerate(exercise.get('audio_options', []), 1):
-            opt_text = option.get('option', f'Item {idx}') if isinstance(option, dict) else option
-            html += f'<div class="option">___ {idx}. {opt_text}</div>\n'
-        
-        html += '</div>\n'
-        return html
+    root = Path(os.path.commonpath([str(f.parent.resolve()) for f in files]))
+    jobs = []
+    for json_file in files:
+        outputs = worksheet_outputs(json_file.resolve(), formats, Path(output_dir) if output_dir else None, root)
+        jobs.append({
+            'json_file': str(json_file),
+            'outputs': {fmt: str(path) for fmt, path in outputs.items()},
+            'image_profile': image_profile,
+            'workers': workers,
+            'force': force,
+            'external_images': output_dir is not None,
+        })
     
-    def _render_image_tagging(self, exercise: Dict) -> str:
-        """Render image tagging for HTML"""
-        html = '<div>\n'
-        
-        media = exercise.get('media', {})
-        if media.get('image'):
-            data_uri = self._load_image_as_base64(media['image'])
-            if data_uri:
-                html += f'<div class="media-image"><img src="{data_uri}" alt="tagging"></div>\n'
-        
-        button_label = exercise.get('button_label', 'N/A')
-        html += f'<div class="category-list"><strong>Button:</strong> {button_label}</div>\n'
-        html += '<div class="category-list"><strong>Label with:</strong>\n'
-        
-        for tag in exercise.get('tags', []):
-            label = tag.get('label', 'N/A')
-            html += f'• {label}<br>\n'
-        
-        html += '</div>\n</div>\n'
-        return html
+    processes = processes or os.cpu_count() or 1
+    print(f"📚 Converting {len(jobs)} exercise file(s) with {processes} process(es)...")
+    start = time.perf_counter()
+    results = []
+    from concurrent.futures import ProcessPoolExecutor  # Batch mode only
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_convert_one, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            icon = {'built': '✓', 'up to date': '⏭️ ', 'failed': '✗'}.get(result['status'], '⚠️ ')
+            print(f"{icon} {result['json_file']} - {result['status']} ({result['seconds']:.2f}s)")
+            if result['status'] == 'failed':
+                print(f"   {result.get('error')}")
+                print(''.join(f"   {line}\n" for line in result['log'].splitlines()[-5:]), end='')
+    wall = time.perf_counter() - start
     
-    def _render_multi_questions(self, exercise: Dict) -> str:
-        """Render multi questions for HTML"""
-        html = '<div class="pairs-list">\n'
-        
-        for q_idx, question in enumerate(exercise.get('questions', []), 1):
-            q_text = question.get('question', 'N/A')
-            html += f'<div class="pair"><div class="pair-source">Q{q_idx}: {q_text}</div><div class="pair-target">_________</div></div>\n'
-        
-        html += '</div>\n'
-        return html
+    built = [r for r in results if r['status'].startswith('built')]
+    skipped = [r for r in results if r['status'] == 'up to date']
+    failed = [r for r in results if r['status'] == 'failed']
+    busy = sum(r['seconds'] for r in results)
+    print(f"\n⏱️  Batch summary")
+    print(f"   Built:      {len(built)}")
+    print(f"   Up to date: {len(skipped)}")
+    print(f"   Failed:     {len(failed)}")
+    print(f"   Other:      {len(results) - len(built) - len(skipped) - len(failed)}")
+    print(f"   Wall time:  {wall:.2f}s (worker time {busy:.2f}s, {busy / wall if wall else 0:.1f}x parallel)")
+    if built:
+        print("   Slowest:")
+        for r in sorted(built, key=lambda r: r['seconds'], reverse=True)[:5]:
+            print(f"     {r['seconds']:6.2f}s  {r['json_file']}")
+    return len(failed)
 
 
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
-        print("Usage: python json_to_paper.py <json_file> [output_base_name]")
-        print("\nExample:")
-        print("  python json_to_paper.py testfile-complete.json")
-        print("  python json_to_paper.py testfile-complete.json my_worksheet")
-        print("\nGenerates: my_worksheet_paper.html and my_worksheet_paper.docx")
-        sys.exit(1)
-    
-    json_file = sys.argv[1]
-    output_base = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(
+        description="Turn a WifeyMOOC JSON exercise file into printable HTML + DOCX worksheets",
+        epilog="Generates: <output_base>_paper.html and <output_base>_paper.docx",
+    )
+    parser.add_argument("json_file", nargs="?", help="exercise JSON file")
+    parser.add_argument("output_base", nargs="?", default=None,
+                        help="base name for the generated files (default: derived from json_file)")
+    parser.add_argument("--images", choices=sorted(IMAGE_PROFILES), default=DEFAULT_IMAGE_PROFILE,
+                        help="image quality profile: size (smallest), balanced (default) "
+                             "or fidelity (embed originals untouched)")
+    parser.add_argument("--output-dir", metavar="DIR", default=None,
+                        help="write the worksheets into DIR, with HTML images as separate "
+                             "files in DIR/images instead of inlined data URIs")
+    parser.add_argument("-j", "--jobs", type=int, default=None, metavar="N",
+                        help=f"render exercises and load images with N threads per file "
+                             f"(default: {DEFAULT_RENDER_WORKERS}, or 1 with --batch; 1 = no threads)")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="both",
+                        help="which worksheets to generate (default: both)")
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", nargs="+", metavar="PATH",
+                       help="convert every exercise JSON under these directories / files / globs "
+                            "(e.g. 'units/**/*.json'); worksheets go next to each JSON, or under --output-dir")
+    batch.add_argument("--processes", type=int, default=None, metavar="N",
+                       help="files converted in parallel (default: number of CPU cores)")
+    batch.add_argument("--force", action="store_true",
+                       help="rebuild even if the worksheets are newer than the JSON and its images "
+                            "and were built with the same --images")
+    parser.add_argument("--profile-memory", nargs="?", const="memory-profile.txt", default=None, metavar="REPORT",
+                        help="trace allocations with tracemalloc and write per-exercise diffs and a peak "
+                             "summary to REPORT (default: memory-profile.txt); much slower, single file only")
+    args = parser.parse_args()
     
-    converter = ExerciseToPaper(json_file)
+    if args.batch:
+        if args.json_file or args.output_base:
+            parser.error("--batch takes its inputs itself; don't pass json_file/output_base as well")
+        if args.profile_memory:
+            parser.error("--profile-memory traces a single file; run it without --batch")
+        # Parallelism comes from the processes, so each file renders single-threaded unless -j says otherwise
+        failures = run_batch(args.batch, OUTPUT_FORMATS[args.format], output_dir=args.output_dir,
+                             image_profile=args.images, processes=args.processes,
+                             workers=args.jobs or 1, force=args.force)
+        sys.exit(1 if failures else 0)
+    if not args.json_file:
+        parser.error("a json_file (or --batch PATH...) is required")
+
+    json_file = args.json_file
+    output_base = args.output_base
+    formats = OUTPUT_FORMATS[args.format]
+
+    if args.images != 'fidelity' and not HAS_PIL:
+        print("⚠️  Pillow not installed, embedding original images (pip install Pillow)")
+
+    workers = args.jobs or DEFAULT_RENDER_WORKERS
+    memory_profile = None
+    if args.profile_memory:
+        from wifeymooc_memprofile import MemoryProfile  # Profiling runs only
+        # Imported up front, so their module code isn't in every snapshot
+        if 'docx' in formats and HAS_DOCX:
+            _import_docx()
+        if HAS_PIL:
+            _import_pil()
+        memory_profile = MemoryProfile(args.profile_memory)
+        if workers > 1:
+            # Exercises rendered side by side would mix up their allocations
+            print("🧠 Profiling memory: rendering on one thread")
+            workers = 1
+
+    converter = ExerciseToPaper(json_file, image_profile=args.images, workers=workers,
+                                memory_profile=memory_profile)
     
     # Generate HTML
-    if output_base:
-        html_output = f"{output_base}_paper.html"
-    else:
-        html_output = None
-    html_file = converter.generate_html(html_output)
+    html_file = None
+    if 'html' in formats:
+        if output_base:
+            html_output = f"{output_base}_paper.html"
+        else:
+            html_output = None
+        html_file = converter.generate_html(html_output, output_dir=args.output_dir)
     
     # Generate DOCX
-    if output_base:
-        docx_output = f"{output_base}_paper.docx"
-    else:
-        docx_output = None
-    docx_file = converter.generate_docx(docx_output)
+    docx_file = None
+    if 'docx' in formats:
+        if output_base:
+            docx_output = f"{output_base}_paper.docx"
+        else:
+            docx_output = None
+        if args.output_dir:
+            docx_output = str(Path(args.output_dir) / Path(docx_output or Path(json_file).stem + "_paper.docx").name)
+        docx_file = converter.generate_docx(docx_output)
     
     print(f"\n✨ Worksheets ready!")
-    print(f"📄 HTML: {html_file}")
+    if html_file:
+        print(f"📄 HTML: {html_file}")
     if docx_file:
         print(f"📝 DOCX: {docx_file}")
-        print(f"\n💡 Use DOCX for editing, HTML for printing to PDF")
-    else:
+        if html_file:
+            print(f"\n💡 Use DOCX for editing, HTML for printing to PDF")
+    elif 'docx' in formats:
         print(f"⚠️  Install python-docx for DOCX support: pip install python-docx")
+    if memory_profile is not None:
+        print(f"🧠 Memory profile: {memory_profile.close()}")
 
 
 if __name__ == "__main__":
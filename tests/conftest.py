@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the tests 🧪
+
+The app script has a dash in its name, so it's loaded by path, once per session.
+Nothing here needs a display: app objects are built without their Tk widgets.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    spec = importlib.util.spec_from_file_location("wifeymooc", os.path.join(ROOT, "wifeymooc-python2.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,34 @@
+import os
+import time
+
+from json_to_paper import ImageEncodingCache
+
+
+def test_trim_drops_least_recently_used_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ImageEncodingCache(cache_dir=cache_dir, disk_limit=250)
+    images = []
+    for i in range(4):
+        image = tmp_path / f"img{i}.png"
+        image.write_bytes(bytes([i]) * 10)
+        images.append(image)
+        cache.get(image, "print", lambda path: "x" * 100)
+    # Oldest first, with the first image used again just now
+    for age, entry in enumerate(sorted(cache_dir.glob("*.txt"), key=lambda e: e.stat().st_mtime_ns)):
+        os.utime(entry, ns=(time.time_ns() - (10 - age) * 10**9,) * 2)
+    ImageEncodingCache(cache_dir=cache_dir, memory_limit=0).get(images[0], "print", lambda path: "never called")
+
+    cache.save_index()
+    kept = {entry.name.split("-")[0] for entry in cache_dir.glob("*.txt")}
+    assert kept == {cache.content_hash(images[0]), cache.content_hash(images[3])}
+
+
+def test_index_forgets_files_that_changed(tmp_path):
+    image = tmp_path / "img.png"
+    image.write_bytes(b"before")
+    cache = ImageEncodingCache(cache_dir=tmp_path / "cache")
+    cache.content_hash(image)
+    image.write_bytes(b"after, and longer")
+    cache.content_hash(image)
+    cache.save_index()
+    assert len(ImageEncodingCache(cache_dir=tmp_path / "cache").hashes) == 1
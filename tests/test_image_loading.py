@@ -0,0 +1,35 @@
+import pytest
+from PIL import Image
+
+
+def save(path, img, **params):
+    img.save(path, **params)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def sources(tmp_path_factory):
+    """Big pictures in the modes reduce() can't take directly"""
+    tmp_path = tmp_path_factory.mktemp("images")
+    rgb = Image.effect_noise((800, 600), 60).convert("RGB")
+    palette = rgb.convert("P", palette=Image.Palette.ADAPTIVE, colors=64)
+    return {
+        "palette png": save(tmp_path / "palette.png", palette),
+        "transparent palette png": save(tmp_path / "transparent.png", palette, transparency=0),
+        "gif": save(tmp_path / "anim.gif", palette, save_all=True, append_images=[palette.rotate(90)]),
+        "1-bit png": save(tmp_path / "scan.png", rgb.convert("1")),
+        "16-bit png": save(tmp_path / "depth.png", rgb.convert("L").convert("I;16")),
+        "jpeg": save(tmp_path / "photo.jpg", rgb, quality=80),
+    }
+
+
+@pytest.mark.parametrize("kind", ["palette png", "transparent palette png", "gif", "1-bit png", "16-bit png", "jpeg"])
+@pytest.mark.parametrize("size, expected", [((100, None), (100, 75)), ((400, 400), (400, 300)), ((1600, None), (1600, 1200))])
+def test_open_image_at_size_handles_every_mode(app_module, sources, kind, size, expected):
+    img = app_module.open_image_at_size(sources[kind], size)
+    assert img.size == expected
+
+
+def test_transparency_survives_shrinking(app_module, sources):
+    img = app_module.open_image_at_size(sources["transparent palette png"], (100, None))
+    assert img.mode == "RGBA"
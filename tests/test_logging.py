@@ -0,0 +1,28 @@
+import io
+import logging
+
+
+def test_crash_report_shows_arguments_as_they_were_logged(app_module):
+    ring = app_module.RingBufferHandler(capacity=10)
+    ring.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("wifeymooc.test-ring")
+    logger.addHandler(ring)
+    logger.setLevel(logging.DEBUG)
+    try:
+        positions = {"tag1": [1, 2]}
+        logger.debug("Image tagging positions: %s", positions)
+        positions["tag1"] = [999, 999]
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Grading failed for %s", positions)
+    finally:
+        logger.removeHandler(ring)
+
+    assert all(record.args is None and record.exc_info is None for record in ring.records)
+    report = io.StringIO()
+    ring.dump(report)
+    lines = report.getvalue().splitlines()
+    assert lines[0] == "DEBUG Image tagging positions: {'tag1': [1, 2]}"
+    assert lines[1] == "ERROR Grading failed for {'tag1': [999, 999]}"
+    assert "ValueError: boom" in report.getvalue()
@@ -0,0 +1,53 @@
+"""The worksheet HTML and DOCX must not change by accident
+
+The golden files were rendered by the json_to_paper.py of the first commit
+(HTML) and of the commit before the document model (DOCX, which by then had
+its named styles), with the date blanked out. Regenerate them only for
+intended changes to the printed worksheets.
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from conftest import ROOT
+from json_to_paper import ExerciseToPaper, ImageEncodingCache
+
+GOLDEN = Path(__file__).parent / "golden"
+WORKSHEETS = [
+    (Path(ROOT) / "testfile-complete.json", "testfile-complete"),
+    (GOLDEN / "edge-cases.json", "edge-cases"),
+]
+
+
+def undated(text):
+    return re.sub(r"Generated on [A-Za-z]+ \d+, \d+", "Generated on DATE", text)
+
+
+def docx_text(path):
+    """One line per paragraph: [style] text, with **bold** runs marked"""
+    import docx
+    lines = []
+    for para in docx.Document(str(path)).paragraphs:
+        runs = "".join(f"**{run.text}**" if run.bold else run.text for run in para.runs)
+        lines.append(f"[{para.style.name}] " + runs.replace("\n", "\\n"))
+    return undated("\n".join(lines) + "\n")
+
+
+@pytest.mark.parametrize("json_file, name", WORKSHEETS)
+@pytest.mark.parametrize("workers", [1, 4])
+def test_html_matches_golden(json_file, name, workers, tmp_path):
+    paper = ExerciseToPaper(str(json_file), image_cache=ImageEncodingCache(cache_dir=None), workers=workers)
+    output = tmp_path / "paper.html"
+    paper.generate_html(str(output))
+    assert undated(output.read_text(encoding="utf-8")) == (GOLDEN / f"{name}_paper.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("json_file, name", WORKSHEETS)
+def test_docx_matches_golden(json_file, name, tmp_path):
+    pytest.importorskip("docx")
+    paper = ExerciseToPaper(str(json_file), image_cache=ImageEncodingCache(cache_dir=None), workers=1)
+    output = tmp_path / "paper.docx"
+    paper.generate_docx(str(output))
+    assert docx_text(output) == (GOLDEN / f"{name}_paper.docx.txt").read_text(encoding="utf-8")
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def headless_app(app_module, monkeypatch):
+    """A WifeyMOOCApp with just the quiz and autosave state, no window"""
+    app = object.__new__(app_module.WifeyMOOCApp)
+    app.autosaver = app_module.ProgressAutosaver(delay=0)
+    app.questions = []
+    app.current_question = 0
+    app.score = 0
+    app.student_answers = {}
+    app.progress_file = None
+    app.current_question_file = None
+    app.json_dir = None
+    app.tag_positions_dict = {}
+    app.dirty_tag_keys = set()
+    app.journal_path = None
+    app.memory_profile = None
+    app.is_flashcard_mode = False
+    monkeypatch.setattr(app, "display_question", lambda: None, raising=False)
+    yield app
+    app.autosaver.close()
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def test_opening_another_quiz_leaves_the_loaded_progress_file_alone(headless_app, app_module, tmp_path):
+    quiz_a = write_json(tmp_path / "a.json", [{"type": "mcq_single", "question": "A?", "options": ["x", "y"], "answer": [0]}])
+    quiz_b = write_json(tmp_path / "b.json", {"questions": [
+        {"type": "mcq_single", "question": "B1?", "options": ["x", "y"], "answer": [1]},
+        {"type": "mcq_single", "question": "B2?", "options": ["x", "y"], "answer": [0]},
+    ]})
+    progress_a = write_json(tmp_path / "a.progress.json", {
+        "question_file": quiz_a, "current_question": 0, "score": 1,
+        "student_answers": {"0": [0]}, "tag_positions_dict": {"0_0": {"tag": [1, 2]}},
+    })
+    with open(progress_a, encoding="utf-8") as f:
+        saved_a = f.read()
+
+    app = headless_app
+    app.load_progress_from_file(progress_a)
+    assert app.autosave_path() == progress_a
+    assert app.student_answers == {"0": [0]}
+
+    app.load_questions_from_file(quiz_b)
+    assert app.questions[0]["question"] == "B1?"
+    assert (app.current_question, app.score, app.student_answers, app.tag_positions_dict) == (0, 0, {}, {})
+    assert app.progress_file is None
+    assert app.autosave_path() == os.path.splitext(quiz_b)[0] + app_module.AUTOSAVE_SUFFIX
+
+    app.current_question = 1
+    app.student_answers[1] = [0]
+    app.score = 1
+    app.autosave()
+    assert app.autosaver.flush()
+
+    with open(progress_a, encoding="utf-8") as f:
+        assert f.read() == saved_a
+    assert not os.path.exists(progress_a + app_module.JOURNAL_SUFFIX)
+    state = app_module.load_progress_state(app.autosave_path())
+    assert state["question_file"] == quiz_b
+    assert state["student_answers"] == {"1": [0]}
+    assert state["tag_positions_dict"] == {}
@@ -0,0 +1,33 @@
+"""Tests that need a real Tk window; skipped when there is no display"""
+
+import json
+import tkinter as tk
+
+import pytest
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_accent_palette_survives_a_flashcard_round_trip(app_module, root, tmp_path):
+    quiz = tmp_path / "quiz.json"
+    quiz.write_text(json.dumps([{"type": "word_fill", "question": "Complétez :",
+                                 "sentence_parts": ["Je ", "."], "answers": ["suis"]}]), encoding="utf-8")
+    app = app_module.WifeyMOOCApp(root, question_file=str(quiz), autosave=False)
+    assert app.accent_frame.winfo_exists()
+
+    app.switch_to_flashcard_mode()
+    app.switch_to_quiz_mode()
+    app.display_question()
+    root.update()
+    assert app.accent_frame.winfo_exists()
+    assert app.accent_frame.winfo_parent() == str(app.container)
+    app.thumbnails.close()
@@ -1,17 +1,63 @@
 import argparse
+import collections
+import logging
+import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog
-from PIL import Image, ImageTk
+from tkinter import font as tkfont
+import copy
 import json
 import os
-import subprocess
-import platform
 import random
-import xml.etree.ElementTree as ET 
 import datetime
+import math
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Heavy modules are imported on first use (see _import_pil / _import_numpy), so the
+# window is up before they load: Pillow when the first image is shown, NumPy (optional,
+# it vectorizes image tagging grading for big diagrams) when tags are first graded.
+# Parley's XML parser and subprocess are imported inside the methods that use them.
+Image = ImageTk = None
+np = None
+HAS_NUMPY = None # None until _import_numpy() has tried; set False to force the pure-Python grading
+
+
+def _import_pil():
+    """Pillow's Image and ImageTk, imported the first time they're needed."""
+    global Image, ImageTk
+    if ImageTk is None:
+        from PIL import Image, ImageTk
+    return Image, ImageTk
+
+
+def _import_numpy():
+    """The numpy module, or None if it isn't installed (or HAS_NUMPY was set False)."""
+    global np, HAS_NUMPY
+    if HAS_NUMPY is None:
+        try:
+            import numpy as np
+            HAS_NUMPY = True
+        except ImportError:
+            HAS_NUMPY = False
+    return np if HAS_NUMPY else None
+
+
+def warm_up_imports():
+    """Load the heavy modules in the background once the window is showing."""
+    try:
+        _import_pil()
+        _import_numpy()
+    except Exception:
+        log.debug("Background import failed; it will be retried on first use", exc_info=True)
 
 # Constants
-DEBUG = True # Print debug info for image tagging
+DEFAULT_LOG_LEVEL = "WARNING" # Override with --log-level DEBUG for image tagging / grading traces
+LOG_RING_SIZE = 500 # Recent log records kept in memory for crash reports
+CRASH_REPORT_FILE = os.path.join(os.path.expanduser("~"), "wifeymooc-crash.log")
 ENABLE_SKIP_BUTTON = True
 PADDING_X = 6
 PADDING_Y = 3
@@ -23,8 +69,789 @@ FONT_OPTION = ("Arial", 12)
 FONT_TAG = ("Arial", 14, "bold")
 FONT_FEEDBACK = ("Arial", 12)
 FONT_EXAMPLE = ("Arial", 16, "italic")
+FONT_SENTENCE = ("Arial", 14) # fill_blanks_dropdown / word_fill passages
+SENTENCE_WRAP_PX = 850 # Width those passages wrap at
+ACCENT_ROWS = [
+    ['é', 'è', 'ê', 'ë', 'à', 'â', 'î', 'ï', 'ô', 'û', 'ù', 'ç', 'œ', 'æ'],
+    ['É', 'È', 'Ê', 'Ë', 'À', 'Â', 'Î', 'Ï', 'Ô', 'Û', 'Ù', 'Ç', 'Œ', 'Æ']
+]
 CANVAS_MIN_WIDTH = 200
 CANVAS_MIN_HEIGHT = 200
+DRAG_FRAME_MS = 16 # Tag drag motion is applied at most once per display frame (~60 Hz)
+TAG_TOLERANCE = 50 # Default max distance (px) between a placed tag and its answer position
+UNPLACED_TAG_POS = (-10000, -10000) # Where a tag that was never placed is assumed to be
+SPATIAL_GRID_CELL = 64 # Cell size (px) of the image tagging spatial index
+AUTOSAVE_DELAY_S = 1.0 # Quiz autosave waits this long after the last graded answer before writing
+AUTOSAVE_SUFFIX = ".autosave.json" # Autosave next to the quiz file when no progress file is open
+JOURNAL_SUFFIX = ".log" # Append-only answer events, stored next to the progress checkpoint
+JOURNAL_COMPACT_EVERY = 50 # Fold the event log into the checkpoint after this many events
+IMAGE_REDUCING_GAP = 2.0 # Cheap downscaling stops this many times above the target size; a LANCZOS resize does the rest
+IMAGE_REDUCE_MODES = {"RGB", "RGBA", "L", "LA", "I", "F", "CMYK"} # Modes Image.reduce() supports
+THUMBNAIL_WORKERS = min(4, os.cpu_count() or 1) # Threads decoding grid thumbnails
+THUMBNAIL_CACHE_SIZE = 256 # Decoded thumbnails kept in memory, per (file, size)
+THUMBNAIL_POLL_MS = 30 # How often finished thumbnails are put into the grid while some are pending
+MEMORY_PROFILE_CARD_BATCH = 10 # --profile-memory checkpoints every this many flashcard answers
+
+# Per-subsystem loggers, all children of "wifeymooc" so one level controls them.
+# Always log with %-style arguments (log.debug("x=%s", x)), never f-strings:
+# the message is only formatted if a handler actually needs the text.
+log = logging.getLogger("wifeymooc")
+parley_log = logging.getLogger("wifeymooc.parley")
+flashcard_log = logging.getLogger("wifeymooc.flashcards")
+quiz_log = logging.getLogger("wifeymooc.quiz")
+tag_log = logging.getLogger("wifeymooc.tagging")
+check_log = logging.getLogger("wifeymooc.check")
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last few log records in memory so a crash report can show what led up to it.
+
+    Each record is stored with its message already built, so the report shows
+    arguments (answers, tag positions...) as they were when they were logged,
+    and the buffer doesn't keep those objects alive. Timestamps and the rest of
+    the line are only formatted when a report is written.
+    """
+    def __init__(self, capacity=LOG_RING_SIZE):
+        super().__init__(logging.DEBUG)
+        self.records = collections.deque(maxlen=capacity)
+        self.exc_formatter = logging.Formatter()
+
+    def emit(self, record):
+        # A copy: the other handlers get the record too
+        record = copy.copy(record)
+        try:
+            record.msg = record.getMessage()
+        except Exception:
+            record.msg = f"<unformattable: {record.msg!r} % {record.args!r}>"
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    def dump(self, stream):
+        formatter = self.formatter or logging.Formatter()
+        for record in list(self.records):
+            try:
+                stream.write(formatter.format(record) + "\n")
+            except Exception:
+                stream.write(f"<unformattable record from {record.name}: {record.msg!r}>\n")
+
+
+ring_handler = RingBufferHandler()
+
+
+def setup_logging(level_name=DEFAULT_LOG_LEVEL):
+    """Console output at the requested level, plus a DEBUG-level ring buffer for crash reports."""
+    level = getattr(logging, str(level_name).upper(), None)
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {level_name}")
+
+    formatter = logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+    console = logging.StreamHandler()
+    console.setLevel(level)
+    console.setFormatter(formatter)
+    ring_handler.setFormatter(formatter)
+
+    log.handlers[:] = [console, ring_handler]
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    sys.excepthook = report_crash
+
+
+def report_crash(exc_type, exc_value, exc_tb):
+    """Log an uncaught exception and write it, with the recent log history, to CRASH_REPORT_FILE."""
+    log.critical("Unhandled exception", exc_info=(exc_type, exc_value, exc_tb))
+    try:
+        with open(CRASH_REPORT_FILE, 'w', encoding='utf-8') as f:
+            f.write(f"Wifey MOOC crash report - {datetime.datetime.now().isoformat()}\n\n")
+            ring_handler.dump(f)
+        log.critical("Crash report written to %s", CRASH_REPORT_FILE)
+    except OSError:
+        log.exception("Could not write crash report to %s", CRASH_REPORT_FILE)
+
+
+class SpatialGrid:
+    """Uniform grid index over canvas coordinates, holding points or boxes by key.
+
+    Used for tag hit testing and for finding the answer position nearest to a
+    misplaced tag, without scanning every tag on large diagrams.
+    """
+    def __init__(self, cell=SPATIAL_GRID_CELL):
+        self.cell = cell
+        self.cells = {} # (col, row) -> set of keys
+        self.boxes = {} # key -> (x0, y0, x1, y1); points have x0 == x1 and y0 == y1
+        self.bounds = None # (min col, min row, max col, max row) ever occupied, so nearest() knows when to stop
+
+    def _cell_range(self, x0, y0, x1, y1):
+        c0, r0 = int(x0 // self.cell), int(y0 // self.cell)
+        c1, r1 = int(x1 // self.cell), int(y1 // self.cell)
+        return [(c, r) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+
+    def insert(self, key, x0, y0, x1=None, y1=None):
+        if key in self.boxes:
+            self.remove(key)
+        box = (x0, y0, x0 if x1 is None else x1, y0 if y1 is None else y1)
+        self.boxes[key] = box
+        for cell in self._cell_range(*box):
+            self.cells.setdefault(cell, set()).add(key)
+        c0, r0 = int(box[0] // self.cell), int(box[1] // self.cell)
+        c1, r1 = int(box[2] // self.cell), int(box[3] // self.cell)
+        if self.bounds is None:
+            self.bounds = (c0, r0, c1, r1)
+        else:
+            b = self.bounds
+            self.bounds = (min(b[0], c0), min(b[1], r0), max(b[2], c1), max(b[3], r1))
+
+    def remove(self, key):
+        box = self.boxes.pop(key, None)
+        if box is None:
+            return
+        for cell in self._cell_range(*box):
+            keys = self.cells.get(cell)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+        if not self.cells:
+            self.bounds = None
+
+    def at(self, x, y):
+        """Keys whose box contains (x, y)."""
+        keys = self.cells.get((int(x // self.cell), int(y // self.cell)), ())
+        return [k for k in keys if self._distance(self.boxes[k], x, y) == 0]
+
+    @staticmethod
+    def _distance(box, x, y):
+        x0, y0, x1, y1 = box
+        dx = max(x0 - x, 0, x - x1)
+        dy = max(y0 - y, 0, y - y1)
+        return math.hypot(dx, dy)
+
+    def _ring(self, col, row, ring):
+        """Cells on the square ring `ring` cells out from (col, row)."""
+        if ring == 0:
+            yield col, row
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield c, row - ring
+            yield c, row + ring
+        for r in range(row - ring + 1, row + ring):
+            yield col - ring, r
+            yield col + ring, r
+
+    def nearest(self, x, y, exclude=()):
+        """(key, distance) of the box nearest to (x, y), searching outward ring by ring.
+
+        Stops as soon as the best distance found beats anything the next ring
+        could hold, so a lookup only visits the cells around (x, y).
+        """
+        if not self.cells:
+            return None, math.inf
+        col, row = int(x // self.cell), int(y // self.cell)
+        # remove() never shrinks the bounds, which at worst costs a few empty rings
+        c0, r0, c1, r1 = self.bounds
+        max_ring = max(col - c0, c1 - col, row - r0, r1 - row, 0)
+
+        best_key, best_dist = None, math.inf
+        for ring in range(max_ring + 1):
+            for cell in self._ring(col, row, ring):
+                for key in self.cells.get(cell, ()):
+                    if key in exclude:
+                        continue
+                    dist = self._distance(self.boxes[key], x, y)
+                    if dist < best_dist:
+                        best_key, best_dist = key, dist
+            # Anything in the next ring is at least ring * cell away
+            if best_dist <= ring * self.cell:
+                break
+        return best_key, best_dist
+
+
+class TextMetrics:
+    """Pixel size of text in a given font, without creating canvas items.
+
+    Uses tkinter.font.Font.measure/metrics and memoizes every (font, text) pair,
+    so laying out many labels (or re-laying them out on every alternative switch)
+    costs one Tk call per distinct label. Fonts belong to a Tk root, so the caches
+    start over if a different root asks.
+    """
+    def __init__(self):
+        self.root = None
+        self.fonts = {} # font spec -> tkfont.Font
+        self.linespace = {} # font spec -> line height in px
+        self.sizes = {} # (font spec, text) -> (width, height)
+
+    def _font(self, font, widget):
+        root = widget._root() if widget is not None else tk._default_root
+        if root is not self.root:
+            self.root = root
+            self.fonts.clear()
+            self.linespace.clear()
+            self.sizes.clear()
+        f = self.fonts.get(font)
+        if f is None:
+            f = self.fonts[font] = tkfont.Font(root=root, font=font)
+            self.linespace[font] = f.metrics("linespace")
+        return f
+
+    def size(self, text, font, widget=None):
+        """(width, height) in px of text (may contain newlines) drawn in font."""
+        key = (font, text)
+        size = self.sizes.get(key) if widget is None or widget._root() is self.root else None
+        if size is None:
+            f = self._font(font, widget)
+            lines = text.split("\n")
+            size = (max(f.measure(line) for line in lines), self.linespace[font] * len(lines))
+            self.sizes[key] = size
+        return size
+
+    def width(self, text, font, widget=None):
+        return self.size(text, font, widget)[0]
+
+    def line_height(self, font, widget=None):
+        self._font(font, widget)
+        return self.linespace[font]
+
+
+text_metrics = TextMetrics() # Shared by every layout that needs text sizes
+
+
+def tag_tolerances(question, fallback=TAG_TOLERANCE):
+    """Per-tag tolerances: a tag's own "tolerance", else the question's, else fallback."""
+    default = question.get('tolerance', fallback)
+    return {tag.get('id'): tag.get('tolerance', default) for tag in question.get('tags', [])}, default
+
+
+def grade_tag_positions(expected, placed, tolerances=None, default_tolerance=TAG_TOLERANCE):
+    """Compare placed tag positions against the answer.
+
+    Returns (tag_ids, distances, within_tolerance) in answer order. Tags that were
+    never placed count as sitting at UNPLACED_TAG_POS. With NumPy the distances are
+    computed in one vectorized pass.
+    """
+    tolerances = tolerances or {}
+    tag_ids = list(expected)
+    if _import_numpy() is not None:
+        exp = np.array([expected[t][:2] for t in tag_ids], dtype=float).reshape(-1, 2)
+        act = np.array([placed.get(t, UNPLACED_TAG_POS)[:2] for t in tag_ids], dtype=float).reshape(-1, 2)
+        tol = np.array([tolerances.get(t, default_tolerance) for t in tag_ids], dtype=float)
+        distances = np.hypot(exp[:, 0] - act[:, 0], exp[:, 1] - act[:, 1])
+        return tag_ids, distances, distances <= tol
+
+    distances = []
+    within = []
+    for tag_id in tag_ids:
+        cx, cy = expected[tag_id][:2]
+        ux, uy = placed.get(tag_id, UNPLACED_TAG_POS)[:2]
+        dist = math.hypot(cx - ux, cy - uy)
+        distances.append(dist)
+        within.append(dist <= tolerances.get(tag_id, default_tolerance))
+    return tag_ids, distances, within
+
+
+def grade_tag_positions_batch(expected, placements, tolerances=None, default_tolerance=TAG_TOLERANCE):
+    """Grade many learners' placements of the same question at once.
+
+    Returns a list with one bool per placement dict. Requires NumPy for the
+    vectorized path and falls back to grade_tag_positions otherwise.
+    """
+    if _import_numpy() is None:
+        return [all(grade_tag_positions(expected, p, tolerances, default_tolerance)[2]) for p in placements]
+    tolerances = tolerances or {}
+    tag_ids = list(expected)
+    exp = np.array([expected[t][:2] for t in tag_ids], dtype=float).reshape(1, -1, 2)
+    act = np.array([[p.get(t, UNPLACED_TAG_POS)[:2] for t in tag_ids] for p in placements], dtype=float)
+    act = act.reshape(len(placements), len(tag_ids), 2)
+    tol = np.array([tolerances.get(t, default_tolerance) for t in tag_ids], dtype=float)
+    distances = np.hypot(*np.moveaxis(exp - act, -1, 0))
+    return (distances <= tol).all(axis=1).tolist()
+
+
+def nearest_tag_targets(expected, placed, tag_ids):
+    """For each tag in tag_ids, the id of the answer position closest to where it was placed."""
+    targets = SpatialGrid()
+    for tag_id, pos in expected.items():
+        targets.insert(tag_id, pos[0], pos[1])
+    nearest = {}
+    for tag_id in tag_ids:
+        if tag_id in placed:
+            nearest[tag_id] = targets.nearest(*placed[tag_id][:2])[0]
+    return nearest
+
+
+class TagDragEngine:
+    """Draggable tag labels on an image tagging canvas.
+
+    A label's rectangle and text share one canvas group tag, so a drag is a single
+    canvas.move. Motion events only accumulate a delta that is applied at most once
+    every DRAG_FRAME_MS, and presses are hit-tested against a SpatialGrid of tag boxes.
+    """
+    def __init__(self, canvas, on_drop=None):
+        self.canvas = canvas
+        self.on_drop = on_drop # Called as on_drop(tag_id, x, y) when a tag is released
+        self.groups = {} # tag_id -> canvas group tag shared by its rect and text
+        self.rects = {} # tag_id -> rectangle item id
+        self.item_to_tag = {} # canvas item id -> tag_id
+        self.hit_grid = SpatialGrid() # tag_id -> current tag box, for hit testing
+        self.dragging = None
+        self.last_x = 0
+        self.last_y = 0
+        self.pending_dx = 0
+        self.pending_dy = 0
+        self.flush_job = None
+
+        canvas.bind("<Button-1>", self.start_drag)
+        canvas.bind("<B1-Motion>", self.drag)
+        canvas.bind("<ButtonRelease-1>", self.end_drag)
+
+    def add_tag(self, tag_id, label, x0, y0):
+        canvas = self.canvas
+        # Group tags are generated rather than taken from tag_id: a numeric id would be
+        # read by Tk as an item id, and characters like "!" or "&" as tag operators.
+        group = f"tag-{len(self.groups)}"
+
+        # Calculate text size (memoized, no temporary canvas item)
+        text_w, text_h = text_metrics.size(label, FONT_TAG, canvas)
+
+        # Create tag rectangle and text
+        rect_id = canvas.create_rectangle(
+            x0, y0, x0 + text_w + 2 * PADDING_X, y0 + text_h + 2 * PADDING_Y,
+            fill="black", outline="yellow", tags=(group, "draggable")
+        )
+
+        text_id = canvas.create_text(
+            x0 + PADDING_X, y0 + PADDING_Y, text=label,
+            font=FONT_TAG, fill="yellow", anchor=tk.NW, tags=(group, "draggable")
+        )
+
+        self.groups[tag_id] = group
+        self.rects[tag_id] = rect_id
+        self.item_to_tag[rect_id] = tag_id
+        self.item_to_tag[text_id] = tag_id
+        self.hit_grid.insert(tag_id, x0, y0, x0 + text_w + 2 * PADDING_X, y0 + text_h + 2 * PADDING_Y)
+
+    def tag_at(self, x, y):
+        """The topmost tag under (x, y); later tags are stacked above earlier ones."""
+        hits = self.hit_grid.at(x, y)
+        if not hits:
+            return None
+        return max(hits, key=lambda tag_id: self.rects[tag_id])
+
+    def start_drag(self, event):
+        canvas_x = self.canvas.canvasx(event.x)
+        canvas_y = self.canvas.canvasy(event.y)
+        tag_id = self.tag_at(canvas_x, canvas_y)
+        if tag_id is None:
+            return
+
+        self.dragging = tag_id
+        self.last_x = canvas_x
+        self.last_y = canvas_y
+        self.pending_dx = 0
+        self.pending_dy = 0
+
+    def drag(self, event):
+        if self.dragging is None:
+            return
+
+        canvas_x = self.canvas.canvasx(event.x)
+        canvas_y = self.canvas.canvasy(event.y)
+        self.pending_dx += canvas_x - self.last_x
+        self.pending_dy += canvas_y - self.last_y
+        self.last_x = canvas_x
+        self.last_y = canvas_y
+
+        if self.flush_job is None:
+            self.flush_job = self.canvas.after(DRAG_FRAME_MS, self.flush)
+
+    def flush(self):
+        """Apply the motion accumulated since the last frame in one canvas.move."""
+        self.flush_job = None
+        if self.dragging is not None and (self.pending_dx or self.pending_dy):
+            try:
+                self.canvas.move(self.groups[self.dragging], self.pending_dx, self.pending_dy)
+            except tk.TclError:
+                pass # Canvas was destroyed mid-drag (alternative switch)
+        self.pending_dx = 0
+        self.pending_dy = 0
+
+    def end_drag(self, event):
+        if self.dragging is None:
+            return
+
+        self.drag(event)
+        if self.flush_job is not None:
+            self.canvas.after_cancel(self.flush_job)
+        self.flush()
+
+        tag_id = self.dragging
+        self.dragging = None
+        try:
+            bbox = self.canvas.bbox(self.rects[tag_id])
+        except tk.TclError:
+            return
+        if not bbox:
+            return
+        self.hit_grid.insert(tag_id, *bbox)
+        if self.on_drop:
+            self.on_drop(tag_id, bbox[0], bbox[1])
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file in the same directory, then rename it over path.
+
+    Readers (and a crash mid-write) only ever see the old file or the complete new one.
+    """
+    dir_name = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".wifeymooc-", suffix=".tmp", dir=dir_name)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def apply_progress_event(state, event):
+    """Apply one progress journal event to a progress state dict (the Save Progress format).
+
+    Events carry absolute values, so replaying one twice is harmless. Kinds:
+    "checkpoint" replaces the whole state, "answer" records a graded answer,
+    "goto" only moves current_question. Both of the latter may carry the
+    tag_positions_dict entries changed since the previous event.
+    """
+    kind = event.get("type")
+    if kind == "checkpoint":
+        state.clear()
+        state.update(copy.deepcopy(event["state"]))
+        return state
+
+    if kind == "answer":
+        # Keys become strings in JSON anyway; match what a full save round-trips to.
+        state.setdefault("student_answers", {})[str(event["question"])] = event["answer"]
+        state["score"] = event["score"]
+    if "current_question" in event:
+        state["current_question"] = event["current_question"]
+    for key, positions in event.get("tag_positions", {}).items():
+        state.setdefault("tag_positions_dict", {})[key] = positions
+    return state
+
+
+def load_progress_state(path):
+    """Read a progress checkpoint and replay its event journal on top of it."""
+    state = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    journal_path = path + JOURNAL_SUFFIX
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted append; everything before it is valid.
+                    quiz_log.warning("Ignoring truncated progress journal entry in %s", journal_path)
+                    break
+                apply_progress_event(state, event)
+    return state
+
+
+def load_question_file(path):
+    """Read a quiz file: a list of questions, or an object with a "questions" list."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data.get("questions", [])
+    raise ValueError("Invalid JSON format! Must be an array or an object with a 'questions' key.")
+
+
+class ProgressJournal:
+    """Progress persistence as a checkpoint file plus an append-only log of answer events.
+
+    Appending an event costs one short line however long the course is. Every
+    `compact_every` events the materialized state is written as a new checkpoint
+    (write_json_atomic) and the log is emptied.
+    """
+    def __init__(self, path, compact_every=JOURNAL_COMPACT_EVERY):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.state = None # Loaded from disk lazily, unless a checkpoint event comes first
+        self.events_since_checkpoint = 0
+
+    def write(self, events):
+        lines = []
+        for event in events:
+            if event.get("type") == "checkpoint":
+                # Anything queued before a checkpoint is superseded by it
+                lines = []
+                self.state = apply_progress_event({}, event)
+                self.compact()
+                continue
+            if self.state is None:
+                self.state = load_progress_state(self.path)
+                # Start from a clean log so a torn line on disk can't swallow new events
+                self.compact()
+            apply_progress_event(self.state, event)
+            lines.append(json.dumps(event, separators=(',', ':')) + "\n")
+
+        if lines:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self.events_since_checkpoint += len(lines)
+
+        if self.events_since_checkpoint >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        # Checkpoint first, then truncate: a crash in between only replays events the checkpoint already has.
+        write_json_atomic(self.path, self.state)
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+        self.events_since_checkpoint = 0
+        quiz_log.debug("Compacted progress journal into %s", self.path)
+
+
+class ProgressAutosaver:
+    """Saves quiz progress on a background thread so grading never waits on disk.
+
+    record() just queues a progress event. The worker waits until no new event
+    has arrived for `delay` seconds (debounce), then appends everything queued
+    to the ProgressJournal of that path in a single write.
+    """
+    def __init__(self, delay=AUTOSAVE_DELAY_S, compact_every=JOURNAL_COMPACT_EVERY):
+        self.delay = delay
+        self.compact_every = compact_every
+        self.cond = threading.Condition()
+        self.pending = [] # (path, event) waiting to be written
+        self.journals = {} # path -> ProgressJournal, only touched by the worker thread
+        self.due = 0.0
+        self.writing = False
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name="wifeymooc-autosave", daemon=True)
+        self.thread.start()
+
+    def record(self, path, event):
+        with self.cond:
+            self.pending.append((path, event))
+            self.due = time.monotonic() + self.delay
+            self.cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Write all pending events right away and wait for them, e.g. before exiting."""
+        with self.cond:
+            self.due = 0.0
+            self.cond.notify_all()
+            return self.cond.wait_for(lambda: not self.pending and not self.writing, timeout)
+
+    def close(self, timeout=5.0):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.stopped and (not self.pending or time.monotonic() < self.due):
+                    self.cond.wait(None if not self.pending else self.due - time.monotonic())
+                if not self.pending:
+                    return
+                batch, self.pending = self.pending, []
+                self.writing = True
+            try:
+                by_path = {}
+                for path, event in batch:
+                    by_path.setdefault(path, []).append(event)
+                for path, events in by_path.items():
+                    journal = self.journals.get(path)
+                    if journal is None:
+                        journal = self.journals[path] = ProgressJournal(path, self.compact_every)
+                    try:
+                        journal.write(events)
+                        quiz_log.debug("Autosaved %d progress events to %s", len(events), path)
+                    except Exception:
+                        # Start again from what is on disk rather than trust a half-applied state
+                        self.journals.pop(path, None)
+                        quiz_log.exception("Autosave to %s failed", path)
+            finally:
+                with self.cond:
+                    self.writing = False
+                    self.cond.notify_all()
+
+
+def open_image_at_size(path, size=None, upscale=True, reducing_gap=IMAGE_REDUCING_GAP):
+    """Open an image already scaled to fit in size (w, h), keeping its aspect ratio.
+
+    Every display method loads pictures through here. A None width or height
+    leaves that side free (e.g. (200, None) is "200px wide"), and no size at all
+    means the original pixels. Big sources are never fully decoded just to be
+    shrunk: JPEGs are decoded at 1/2, 1/4 or 1/8 scale (draft mode), then an
+    integer reduce() gets within reducing_gap of the target and only the last
+    step is a real LANCZOS resample; the same steps thumbnail(reducing_gap=...)
+    takes, except that small images can be scaled up too. Palette and 1-bit
+    images (GIFs, many PNGs, scans) are converted to RGB(A) / L first, and modes
+    reduce() can't handle (e.g. 16-bit greyscale) just get the plain resize.
+    """
+    _import_pil()
+    img = Image.open(path)
+    if size is None:
+        img.load()
+        return img
+    box_w = size[0] or math.inf
+    box_h = size[1] or math.inf
+    scale = min(box_w / img.width, box_h / img.height)
+    if scale >= 1 and not upscale:
+        img.load()
+        return img
+    target = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    if target == img.size:
+        img.load()
+        return img
+
+    if scale < 1:
+        if img.mode == "P":
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        elif img.mode == "1":
+            img = img.convert("L")
+    if scale < 1 and img.mode in IMAGE_REDUCE_MODES:
+        # JPEG only; a no-op for other formats
+        img.draft(img.mode, (target[0] * reducing_gap, target[1] * reducing_gap))
+        factor = int(min(img.width / target[0], img.height / target[1]) / reducing_gap)
+        if factor > 1:
+            img = img.reduce(factor)
+    resample = getattr(Image, "Resampling", Image).LANCZOS if hasattr(Image, "Resampling") else Image.ANTIALIAS
+    return img.resize(target, resample)
+
+
+class ThumbnailLoader:
+    """Decodes grid thumbnails on a worker pool and hands them back on the Tk thread.
+
+    request() returns right away; the callback later gets a PIL image (or None if
+    the file could not be read). Workers never touch Tk: a root.after poll picks up
+    finished thumbnails, so a grid fills in progressively instead of blocking until
+    the last image is decoded. Thumbnails are cached per (file, mtime, size), and a
+    cached one is handed over immediately.
+    """
+    def __init__(self, root, workers=THUMBNAIL_WORKERS, cache_size=THUMBNAIL_CACHE_SIZE):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wifeymooc-thumb")
+        self.cache = collections.OrderedDict() # (path, mtime_ns, size) -> PIL image, oldest first
+        self.cache_size = cache_size
+        self.waiting = {} # key -> callbacks for thumbnails still being decoded
+        self.done = queue.Queue() # (key, image) from the workers
+        self.poll_job = None
+
+    def request(self, path, size, callback):
+        try:
+            key = (path, os.stat(path).st_mtime_ns, tuple(size))
+        except OSError:
+            callback(None)
+            return
+        img = self.cache.get(key)
+        if img is not None:
+            self.cache.move_to_end(key)
+            callback(img)
+            return
+        if key in self.waiting:
+            self.waiting[key].append(callback)
+            return
+        self.waiting[key] = [callback]
+        self.pool.submit(self._decode, key)
+        if self.poll_job is None:
+            self.poll_job = self.root.after(THUMBNAIL_POLL_MS, self._poll)
+
+    def _decode(self, key):
+        try:
+            img = open_image_at_size(key[0], key[2])
+        except Exception:
+            quiz_log.warning("Could not load thumbnail of %s", key[0], exc_info=True)
+            img = None
+        self.done.put((key, img))
+
+    def _poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                key, img = self.done.get_nowait()
+            except queue.Empty:
+                break
+            if img is not None:
+                self.cache[key] = img
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            for callback in self.waiting.pop(key, []):
+                try:
+                    callback(img)
+                except tk.TclError:
+                    pass # Its widget went away (the learner moved on)
+        if self.waiting:
+            self.poll_job = self.root.after(THUMBNAIL_POLL_MS, self._poll)
+
+    def close(self):
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TkImageRegistry:
+    """Owns every Tk image the app shows and deletes them when their view goes away.
+
+    Images are created through photo(owner, ...) and grouped by owner, a path like
+    "question" or "question/tagging". release(owner) deletes the owner's images and
+    those of its sub-owners from Tk right away, instead of waiting for the widgets
+    that referenced them to be garbage collected. stats() reports what is live.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.owned = {} # owner -> [Tk images]
+
+    def photo(self, owner, img=None, **kwargs):
+        """ImageTk.PhotoImage(img), or a blank tk.PhotoImage(**kwargs) without img, owned by owner."""
+        if img is not None:
+            _import_pil()
+        photo = ImageTk.PhotoImage(img) if img is not None else tk.PhotoImage(master=self.root, **kwargs)
+        self.owned.setdefault(owner, []).append(photo)
+        return photo
+
+    def release(self, owner):
+        """Delete the Tk images of owner and of every "owner/..." sub-owner."""
+        prefix = owner + "/"
+        released = 0
+        for key in [k for k in self.owned if k == owner or k.startswith(prefix)]:
+            for photo in self.owned.pop(key):
+                try:
+                    self.root.tk.call("image", "delete", str(photo))
+                except tk.TclError:
+                    pass # Already gone (e.g. the interpreter is shutting down)
+                released += 1
+        if released:
+            log.debug("Released %d Tk images of %s", released, owner)
+
+    def stats(self):
+        """Live image count and the bytes Tk holds for them (4 bytes per pixel)."""
+        photos = [photo for photos in self.owned.values() for photo in photos]
+        return {
+            "count": len(photos),
+            "bytes": sum(photo.width() * photo.height() * 4 for photo in photos),
+            "owners": {owner: len(photos) for owner, photos in self.owned.items()},
+        }
+
 
 class ParleyParser:
     """A magical little parser to read words from .kvtml files!"""
@@ -33,6 +860,7 @@ class ParleyParser:
         self.title = ""
 
     def load_file(self, file_path):
+        import xml.etree.ElementTree as ET # Only Parley decks need it
         try:
             tree = ET.parse(file_path)
             root = tree.getroot()
@@ -68,8 +896,8 @@ class ParleyParser:
                             'back_audio': back_audio # And the other sound!
                         })
             return True
-        except Exception as e:
-            print(f"Oh no! Error parsing Parley file: {e}")
+        except Exception:
+            parley_log.exception("Oh no! Error parsing Parley file %s", file_path)
             return False
 
 class FlashcardSession:
@@ -122,6 +950,7 @@ class FlashcardSession:
     def save_progress(self):
         with open(self.progress_file_path, 'w', encoding='utf-8') as f:
             json.dump(list(self.progress_map.values()), f, indent=4)
+        flashcard_log.debug("Saved progress for %d cards to %s", len(self.progress_map), self.progress_file_path)
 
     def start_session(self, session_size):
         self.session_queue = []
@@ -189,9 +1018,11 @@ class FlashcardSession:
 
 
 class WifeyMOOCApp:
-    def __init__(self, root, question_file=None, progress_file=None):
+    def __init__(self, root, question_file=None, progress_file=None, autosave=True):
         self.root = root
         self.root.title("Wifey MOOC")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.autosaver = ProgressAutosaver() if autosave else None
         self.questions = []
         self.current_question = 0
         self.score = 0
@@ -200,10 +1031,16 @@ class WifeyMOOCApp:
         self.current_question_file = None
         self.json_dir = None # Directory of the JSON file
         self.tag_positions_dict = {}
-        self.tag_items = {} # For canvas tag items {tag_id: (rect_id, text_id)}
-        self.drag_data = {"tag_id": None, "x": 0, "y": 0}
+        self.dirty_tag_keys = set() # tag_positions_dict keys changed since the last autosave event
+        self.journal_path = None # Progress file the autosaver has a checkpoint for
+        self.tag_drag = None # TagDragEngine of the standalone image tagging canvas
+        self.thumbnails = ThumbnailLoader(root) # Grid images for match_sentence / categorization_multiple
+        self.images = TkImageRegistry(root) # Every Tk image shown; the "question" ones go in clear_widgets
+        self.preview_count = 0
         self.last_focused_entry = None
+        self.accent_frame = None # word_fill accent buttons, built on first use and then reused
         self.lesson_pdf_path = None # ✨ ADD THIS LINE ✨
+        self.memory_profile = None # wifeymooc_memprofile.MemoryProfile under --profile-memory
         
         # NEW: Multi-question support
         self.current_multi_question_widgets = {}
@@ -232,36 +1069,41 @@ class WifeyMOOCApp:
     def load_questions_from_file(self, file_path):
         if self.is_flashcard_mode: self.switch_to_quiz_mode() # <-- Add this line!
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Handle both old format (list) and new format (dict)
-            if isinstance(data, list):
-                self.questions = data
-            elif isinstance(data, dict):
-                self.questions = data.get("questions", [])
-            else:
-                messagebox.showerror("Error", "Invalid JSON format! Must be an array or an object with a 'questions' key.")
-                return
-
+            self.questions = load_question_file(file_path)
             self.current_question_file = file_path
             self.json_dir = os.path.dirname(file_path)
+            self.reset_quiz_state()
+            quiz_log.info("Loaded %d questions from %s", len(self.questions), file_path)
+            self.memory_checkpoint(f"loaded {len(self.questions)} questions")
             self.display_question()
         except Exception as e:
+            quiz_log.exception("Failed to load questions from %s", file_path)
             messagebox.showerror("Error", f"Failed to load questions:\n{e}")
 
+    def reset_quiz_state(self):
+        """Forget the answers and progress file of the previous quiz.
+
+        Otherwise the autosaver would keep writing to the progress file loaded
+        for another quiz, with that quiz's answers mixed in.
+        """
+        self.current_question = 0
+        self.score = 0
+        self.student_answers = {}
+        self.tag_positions_dict = {}
+        self.dirty_tag_keys.clear()
+        self.progress_file = None
+        self.journal_path = None
+
     def load_progress_from_file(self, file_path):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_progress_state(file_path)
             
             quiz_path = data.get('question_file')
             if not quiz_path or not os.path.exists(quiz_path):
                 messagebox.showerror("Load Error", "Quiz file missing or not specified in progress file.")
                 return
 
-            with open(quiz_path, 'r', encoding='utf-8') as f_q:
-                self.questions = json.load(f_q)
+            self.questions = load_question_file(quiz_path)
 
             self.current_question_file = quiz_path
             self.json_dir = os.path.dirname(quiz_path) # Store the directory of the JSON file
@@ -270,16 +1112,61 @@ class WifeyMOOCApp:
             self.score = data.get('score', 0)
             self.tag_positions_dict = data.get("tag_positions_dict", {})
             self.progress_file = file_path
+            quiz_log.info("Resumed %s at question %d from %s", quiz_path, self.current_question, file_path)
+            self.memory_checkpoint(f"resumed progress ({len(self.questions)} questions)")
             self.display_question()
         except Exception as e:
+            quiz_log.exception("Failed to load progress from %s", file_path)
             messagebox.showerror("Load Error", f"Failed to load progress:\n{e}")
 
+    def memory_checkpoint(self, label, when_idle=False):
+        """Record a --profile-memory checkpoint; with when_idle, once Tk has drawn what's pending."""
+        if self.memory_profile is None:
+            return
+        if when_idle:
+            self.root.after_idle(self.memory_checkpoint, label)
+            return
+        # Besides what tracemalloc sees: image pixels live in Tk and Pillow, outside it
+        images = self.images.stats()
+        thumbnail_bytes = sum(img.width * img.height * len(img.getbands()) for img in self.thumbnails.cache.values())
+        extra = {
+            "Tk images": f"{images['count']} ({images['bytes'] / (1024 * 1024):.1f} MB of pixels)",
+            "cached thumbnails": f"{len(self.thumbnails.cache)} ({thumbnail_bytes / (1024 * 1024):.1f} MB of pixels)",
+            "tag positions": f"{sum(len(tags) for tags in self.tag_positions_dict.values())} "
+                             f"in {len(self.tag_positions_dict)} questions",
+            "student answers": len(self.student_answers),
+        }
+        if self.flashcard_session:
+            progress = self.flashcard_session.progress_map.values()
+            extra["flashcard attempts"] = f"{sum(len(p['attempts']) for p in progress)} over {len(progress)} cards"
+        self.memory_profile.checkpoint(label, extra)
+
     def resolve_media_path(self, path):
         """Resolve the media path relative to the JSON file directory."""
         if self.json_dir and not os.path.isabs(path):
             return os.path.join(self.json_dir, path)
         return path
 
+    def thumbnail_label(self, parent, path, size, missing_text='[Image not found]'):
+        """A Label that shows the image at path scaled to fit size, once it's decoded.
+
+        Until then it holds a blank placeholder of the same size, so the grid
+        doesn't jump around while it fills in.
+        """
+        placeholder = self.images.photo("question", width=size[0], height=size[1])
+        lbl = tk.Label(parent, image=placeholder)
+
+        def show(img):
+            if not lbl.winfo_exists():
+                return
+            if img is None:
+                lbl.config(image='', text=missing_text, fg='red')
+                return
+            lbl.config(image=self.images.photo("question", img))
+
+        self.thumbnails.request(self.resolve_media_path(path), size, show)
+        return lbl
+
     def create_menu(self):
         menubar = tk.Menu(self.root)
         filemenu = tk.Menu(menubar, tearoff=0)
@@ -310,6 +1197,7 @@ class WifeyMOOCApp:
     def create_widgets(self):
         self.container = tk.Frame(self.root)
         self.container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.accent_frame = None # It lived in the old container, which is gone now
 
         self.question_label = tk.Label(
             self.container,
@@ -325,6 +1213,7 @@ class WifeyMOOCApp:
 
         options_holder = tk.Frame(self.container)
         options_holder.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.options_holder = options_holder
 
         self.options_canvas = tk.Canvas(options_holder, highlightthickness=0)
         self.options_canvas.grid(row=0, column=0, sticky="nsew")
@@ -457,6 +1346,14 @@ class WifeyMOOCApp:
         
         for widget in self.options_frame.winfo_children():
             widget.destroy()
+        self.images.release("question")
+        if self.accent_frame is not None:
+            self.accent_frame.pack_forget()
+        self.tag_bg_img = None
+        self.media_img = None
+        if log.isEnabledFor(logging.DEBUG):
+            stats = self.images.stats()
+            log.debug("Tk images still live: %d (%d bytes)", stats["count"], stats["bytes"])
         
         # Clear multi-question data
         self.current_multi_question_widgets.clear()
@@ -485,6 +1382,7 @@ class WifeyMOOCApp:
 
         self.flashcard_session = FlashcardSession(parser.cards, file_path)
         self.flashcard_session.start_session(session_size)
+        self.memory_checkpoint(f"loaded deck ({len(parser.cards)} cards)")
         self.is_flashcard_mode = True
         self.root.title(f"Flashcards! - {parser.title}")
         self.switch_to_flashcard_mode()
@@ -493,6 +1391,7 @@ class WifeyMOOCApp:
     def setup_flashcard_ui(self):
         self.container = tk.Frame(self.root)
         self.container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.accent_frame = None # Destroyed along with the quiz container
 
         self.fc_progress_label = tk.Label(self.container, text="", font=("Arial", 12))
         self.fc_progress_label.pack(pady=10)
@@ -529,6 +1428,11 @@ class WifeyMOOCApp:
     def show_next_card(self):
         card = self.flashcard_session.get_next_card()
         self.is_card_flipped = False
+        if self.memory_profile is not None:
+            session = self.flashcard_session
+            answered = session.total_session_cards() - session.cards_remaining() - (1 if card else 0)
+            if card is None or (answered and answered % MEMORY_PROFILE_CARD_BATCH == 0):
+                self.memory_checkpoint(f"flashcards: {answered} answered", when_idle=True)
         if card:
             self.update_flashcard_ui()
         else:
@@ -602,6 +1506,63 @@ class WifeyMOOCApp:
             return
         self.load_questions_from_file(path)
 
+    def progress_snapshot(self):
+        """The quiz state as saved in progress files. Nested data is copied so it can be written from another thread."""
+        return {
+            "current_question": self.current_question,
+            "student_answers": copy.deepcopy(self.student_answers),
+            "score": self.score,
+            "question_file": self.current_question_file,
+            "tag_positions_dict": copy.deepcopy(self.tag_positions_dict),
+        }
+
+    def autosave_path(self):
+        if self.progress_file:
+            return self.progress_file
+        if self.current_question_file:
+            return os.path.splitext(self.current_question_file)[0] + AUTOSAVE_SUFFIX
+        return None
+
+    def autosave(self, answered=True):
+        """Queue a progress event for the background autosaver.
+
+        Called after each graded answer, and with answered=False when the learner
+        moves on. Only the answer, score, position and tag positions changed since
+        the previous event are recorded; the first event for a file is a full checkpoint.
+        """
+        if not self.autosaver or not self.questions:
+            return
+        path = self.autosave_path()
+        if not path:
+            return
+
+        if path != self.journal_path:
+            self.journal_path = path
+            self.dirty_tag_keys.clear()
+            self.autosaver.record(path, {"type": "checkpoint", "state": self.progress_snapshot()})
+            return
+
+        event = {"type": "goto", "current_question": self.current_question}
+        if answered:
+            event.update({
+                "type": "answer",
+                "question": self.current_question,
+                "answer": copy.deepcopy(self.student_answers.get(self.current_question)),
+                "score": self.score,
+            })
+        if self.dirty_tag_keys:
+            event["tag_positions"] = {key: copy.deepcopy(self.tag_positions_dict[key])
+                                      for key in self.dirty_tag_keys if key in self.tag_positions_dict}
+            self.dirty_tag_keys.clear()
+        self.autosaver.record(path, event)
+
+    def on_close(self):
+        self.thumbnails.close()
+        if self.autosaver:
+            self.autosaver.flush()
+            self.autosaver.close()
+        self.root.destroy()
+
     def save_progress(self):
         if not self.questions:
             messagebox.showwarning("Save Progress", "No quiz loaded.")
@@ -611,23 +1572,20 @@ class WifeyMOOCApp:
             messagebox.showwarning("Save Progress", "No question file path stored.")
             return
 
-        data = {
-            "current_question": self.current_question,
-            "student_answers": self.student_answers,
-            "score": self.score,
-            "question_file": self.current_question_file,
-            "tag_positions_dict": self.tag_positions_dict,
-        }
+        data = self.progress_snapshot()
 
         save_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         if not save_path:
             return
 
         try:
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(save_path, data)
+            # A full save supersedes any autosave journal kept for that file
+            if os.path.exists(save_path + JOURNAL_SUFFIX):
+                os.remove(save_path + JOURNAL_SUFFIX)
             messagebox.showinfo("Save Progress", "Progress saved successfully.")
         except Exception as e:
+            quiz_log.exception("Could not save progress to %s", save_path)
             messagebox.showerror("Save Error", f"Could not save progress:\n{e}")
 
     def load_progress(self):
@@ -717,6 +1675,7 @@ class WifeyMOOCApp:
         # ✨ END of REPLACEMENT ✨
 
         qtype = question_block.get('type')
+        self.memory_checkpoint(f"question {self.current_question + 1} ({qtype})", when_idle=True)
 
         # NEW: Handle multi_questions type
         if qtype == "multi_questions":
@@ -901,15 +1860,7 @@ class WifeyMOOCApp:
             
             # Handle image
             if 'image_path' in pair:
-                try:
-                    img = Image.open(self.resolve_media_path(pair['image_path']))
-                    img = img.resize((100, 100))
-                    tkimg = ImageTk.PhotoImage(img)
-                    img_label = tk.Label(pair_frame, image=tkimg)
-                    img_label.image = tkimg  # Keep reference
-                    img_label.pack()
-                except Exception:
-                    tk.Label(pair_frame, text='[Image not found]', fg='red').pack()
+                self.thumbnail_label(pair_frame, pair['image_path'], (100, 100)).pack()
             
             # Create dropdown with all sentence options
             var = tk.StringVar()
@@ -1047,15 +1998,7 @@ class WifeyMOOCApp:
                 tk.Label(stim_frame, text=obj_id, font=FONT_OPTION, wraplength=100).pack()
             elif 'image' in stimulus:
                 obj_id = os.path.basename(stimulus['image'])
-                try:
-                    img = Image.open(self.resolve_media_path(stimulus['image']))
-                    img = img.resize((60, 60))
-                    tkimg = ImageTk.PhotoImage(img)
-                    img_label = tk.Label(stim_frame, image=tkimg)
-                    img_label.image = tkimg
-                    img_label.pack()
-                except Exception:
-                    tk.Label(stim_frame, text='[Image not found]', fg='red').pack()
+                self.thumbnail_label(stim_frame, stimulus['image'], (60, 60)).pack()
             else:
                 obj_id = f'obj_{idx}'
             
@@ -1104,13 +2047,14 @@ class WifeyMOOCApp:
             return
 
         try:
-            img = Image.open(self.resolve_media_path(img_path))
             # FIXED: USE ORIGINAL SIZE - NO SCALING FOR IMAGE TAGGING!
+            img = open_image_at_size(self.resolve_media_path(img_path))
             canvas_w, canvas_h = img.size
-            tag_bg_img = ImageTk.PhotoImage(img)
+            # The previous alternative's background goes as soon as this one replaces it
+            self.images.release(f"question/tagging-{key}")
+            tag_bg_img = self.images.photo(f"question/tagging-{key}", img)
             
-            if DEBUG:
-                print(f"[DEBUG] Image tagging multi-question: Using original size {canvas_w}x{canvas_h}")
+            tag_log.debug("Image tagging multi-question: Using original size %sx%s", canvas_w, canvas_h)
                 
         except Exception as e:
             tk.Label(parent_frame, text=f"Failed to load image: {e}", fg='red').pack()
@@ -1147,9 +2091,6 @@ class WifeyMOOCApp:
 
         # Display background image at original size
         canvas.create_image(0, 0, anchor=tk.NW, image=tag_bg_img)
-        
-        # Keep reference to prevent garbage collection
-        canvas.image = tag_bg_img
 
         # Initialize tag positions for this multi-question
         tag_positions_key = f"{key}_{alt_idx}"
@@ -1157,7 +2098,13 @@ class WifeyMOOCApp:
             self.tag_positions_dict[tag_positions_key] = {}
         
         curr_tag_pos = self.tag_positions_dict[tag_positions_key]
-        tag_items = {}
+
+        def on_drop(tag_id, x, y):
+            curr_tag_pos[tag_id] = [x, y]
+            self.dirty_tag_keys.add(tag_positions_key)
+            tag_log.debug("Multi-question %s: Tag '%s' moved to (%s, %s)", key, tag_id, x, y)
+
+        drag_engine = TagDragEngine(canvas, on_drop)
 
         # Create draggable tags
         for i, tag in enumerate(tags):
@@ -1172,96 +2119,20 @@ class WifeyMOOCApp:
                 y0 = TAG_START_Y + i * 30  # Smaller spacing for multi-questions
                 curr_tag_pos[tag_id] = [x0, y0]
 
-            # Calculate text size
-            temp_text_id = canvas.create_text(0, 0, text=label, font=FONT_TAG, anchor=tk.NW)
-            bbox = canvas.bbox(temp_text_id)
-            text_w = bbox[2] - bbox[0]
-            text_h = bbox[3] - bbox[1]
-            canvas.delete(temp_text_id)
-
-            # Create tag rectangle and text
-            rect_id = canvas.create_rectangle(
-                x0, y0, x0 + text_w + 2 * PADDING_X, y0 + text_h + 2 * PADDING_Y,
-                fill="black", outline="yellow", tags=(tag_id, "draggable")
-            )
-
-            text_id = canvas.create_text(
-                x0 + PADDING_X, y0 + PADDING_Y, text=label,
-                font=FONT_TAG, fill="yellow", anchor=tk.NW, tags=(tag_id, "draggable")
-            )
-
-            tag_items[tag_id] = (rect_id, text_id)
+            drag_engine.add_tag(tag_id, label, x0, y0)
 
         # Store canvas and tag items for this multi-question
         self.current_multi_question_vars[key]['canvas'] = canvas
-        self.current_multi_question_vars[key]['tag_items'] = tag_items
+        self.current_multi_question_vars[key]['tag_drag'] = drag_engine
         self.current_multi_question_vars[key]['tag_positions'] = curr_tag_pos
 
-        # Tag dragging functionality
-        drag_data = {"tag_id": None, "x": 0, "y": 0}
-        
-        def start_drag(event):
-            canvas_x = canvas.canvasx(event.x)
-            canvas_y = canvas.canvasy(event.y)
-            item = canvas.find_closest(canvas_x, canvas_y)[0]
-            
-            tag_id = None
-            for tid, (rect_id, text_id) in tag_items.items():
-                if item == rect_id or item == text_id:
-                    tag_id = tid
-                    break
-
-            if tag_id:
-                drag_data["tag_id"] = tag_id
-                drag_data["x"] = canvas_x
-                drag_data["y"] = canvas_y
-
-        def drag(event):
-            if not drag_data["tag_id"]:
-                return
-
-            canvas_x = canvas.canvasx(event.x)
-            canvas_y = canvas.canvasy(event.y)
-            dx = canvas_x - drag_data["x"]
-            dy = canvas_y - drag_data["y"]
-
-            tag_id = drag_data["tag_id"]
-            if tag_id in tag_items:
-                rect_id, text_id = tag_items[tag_id]
-                canvas.move(rect_id, dx, dy)
-                canvas.move(text_id, dx, dy)
-
-            drag_data["x"] = canvas_x
-            drag_data["y"] = canvas_y
-
-        def end_drag(event):
-            if drag_data["tag_id"]:
-                tag_id = drag_data["tag_id"]
-                if tag_id in tag_items:
-                    rect_id, text_id = tag_items[tag_id]
-                    bbox = canvas.bbox(rect_id)
-                    if bbox:
-                        x, y = bbox[0], bbox[1]
-                        curr_tag_pos[tag_id] = [x, y]
-                        
-                        if DEBUG:
-                            print(f"[DEBUG] Multi-question {key}: Tag '{tag_id}' moved to ({x}, {y})")
-
-            drag_data["tag_id"] = None
-
-        # Bind drag events
-        canvas.bind("<Button-1>", start_drag)
-        canvas.bind("<B1-Motion>", drag)
-        canvas.bind("<ButtonRelease-1>", end_drag)
-
     def _switch_multi_image_alternative(self, key, alternatives, parent_frame, question):
         """Switch to next alternative for multi-question image tagging"""
         current_alt = self.current_multi_question_vars[f'{key}_alt_idx']
         next_alt = (current_alt + 1) % len(alternatives)
         self.current_multi_question_vars[f'{key}_alt_idx'] = next_alt
         
-        if DEBUG:
-            print(f"[DEBUG] Multi-question {key}: Switching from alternative {current_alt} to {next_alt}")
+        tag_log.debug("Multi-question %s: Switching from alternative %s to %s", key, current_alt, next_alt)
         
         # Clear and redisplay
         for widget in parent_frame.winfo_children():
@@ -1328,11 +2199,9 @@ class WifeyMOOCApp:
         if "image" in opt_dict and opt_dict["image"]:
             try:
                 img_path = self.resolve_media_path(opt_dict["image"])
-                img = Image.open(img_path)
-                img = img.resize((64, 64), Image.Resampling.LANCZOS if hasattr(Image, 'Resampling') else Image.ANTIALIAS)
-                photo = ImageTk.PhotoImage(img)
+                img = open_image_at_size(img_path, (64, 64))
+                photo = self.images.photo("question", img)
                 img_label = tk.Label(frame, image=photo)
-                img_label.image = photo  # Keep a reference
                 img_label.pack(side=tk.LEFT, padx=5)
             except Exception as e:
                 # Fallback if image fails to load
@@ -1347,58 +2216,77 @@ class WifeyMOOCApp:
 
     def _display_word_fill(self, question):
         self.add_media_buttons(question.get('media'))
-
-        # Accent buttons
-        accent_rows = [
-            ['é', 'è', 'ê', 'ë', 'à', 'â', 'î', 'ï', 'ô', 'û', 'ù', 'ç', 'œ', 'æ'],
-            ['É', 'È', 'Ê', 'Ë', 'À', 'Â', 'Î', 'Ï', 'Ô', 'Û', 'Ù', 'Ç', 'Œ', 'Æ']
-        ]
-
-        accent_frame = tk.Frame(self.options_frame)
-        accent_frame.pack(anchor=tk.W, pady=2)
-
+        self.show_accent_palette()
         self.last_focused_entry = None
 
-        def insert_accent(ch):
-            if self.last_focused_entry:
-                self.last_focused_entry.insert(tk.INSERT, ch)
-
-        for row in accent_rows:
-            rframe = tk.Frame(accent_frame)
-            rframe.pack(anchor=tk.W)
-            for ch in row:
-                btn = tk.Button(rframe, text=ch, width=2, font=FONT_OPTION, command=lambda c=ch: insert_accent(c))
-                btn.pack(side=tk.LEFT, padx=1)
-
         self.fill_words_entries = []
         parts = question.get('sentence_parts', [])
         answers = question.get('answers', [])
 
         if parts and isinstance(answers, list) and len(parts) >= len(answers):
-            for i in range(len(answers)):
-                for line in parts[i].split('\n'):
-                    pf = tk.Frame(self.options_frame)
-                    pf.pack(anchor=tk.W, fill=tk.X)
-                    lbl = tk.Label(pf, text=line, font=(FONT_OPTION[0], 14), wraplength=850, justify=tk.LEFT)
-                    lbl.pack(anchor=tk.W)
-
-                ef = tk.Frame(self.options_frame)
-                ef.pack(anchor=tk.W, fill=tk.X)
-                ent = tk.Entry(ef, font=(FONT_OPTION[0], 14), width=30)
-                ent.pack(anchor=tk.W)
+            def make_entry(text, i):
+                ent = tk.Entry(text, font=FONT_SENTENCE, width=15)
                 ent.bind("<FocusIn>", lambda e, ent=ent: setattr(self, 'last_focused_entry', ent))
                 self.fill_words_entries.append(ent)
+                return ent
 
-            for line in parts[-1].split('\n'):
-                lf = tk.Frame(self.options_frame)
-                lf.pack(anchor=tk.W, fill=tk.X)
-                lbl = tk.Label(lf, text=line, font=(FONT_OPTION[0], 14), wraplength=850, justify=tk.LEFT)
-                lbl.pack(anchor=tk.W)
+            self.sentence_text(self.options_frame, parts, len(answers), make_entry).pack(anchor=tk.W, fill=tk.X, pady=10)
         else:
             self.entry = tk.Entry(self.options_frame, font=FONT_OPTION, width=40)
             self.entry.pack()
             self.entry.bind("<FocusIn>", lambda e: setattr(self, 'last_focused_entry', self.entry))
 
+    def show_accent_palette(self):
+        """Show the accent buttons above the options; they type into the last focused entry.
+
+        The palette is built the first time and only packed/unpacked after that
+        (clear_widgets hides it), instead of 28 new buttons for every question.
+        """
+        if self.accent_frame is None:
+            self.accent_frame = tk.Frame(self.container)
+
+            def insert_accent(ch):
+                entry = self.last_focused_entry
+                if entry is not None and entry.winfo_exists():
+                    entry.insert(tk.INSERT, ch)
+
+            for row in ACCENT_ROWS:
+                rframe = tk.Frame(self.accent_frame)
+                rframe.pack(anchor=tk.W)
+                for ch in row:
+                    btn = tk.Button(rframe, text=ch, width=2, font=FONT_OPTION, command=lambda c=ch: insert_accent(c))
+                    btn.pack(side=tk.LEFT, padx=1)
+        self.accent_frame.pack(anchor=tk.W, pady=2, before=self.options_holder)
+
+    def sentence_text(self, parent, parts, n_blanks, make_blank):
+        """One read-only tk.Text with parts[0], blank 0, parts[1], blank 1, ... parts[n_blanks].
+
+        make_blank(text, i) creates the widget for blank i as a child of text, and it is
+        embedded inline. A long cloze passage is then a single widget plus its blanks
+        rather than a Frame and Label per line and fragment, and Tk does the wrapping.
+        """
+        char_w = text_metrics.width("0", FONT_SENTENCE, parent)
+        text = tk.Text(parent, font=FONT_SENTENCE, wrap=tk.WORD, width=SENTENCE_WRAP_PX // max(1, char_w), height=1,
+                       borderwidth=0, highlightthickness=0, background=parent.cget('background'),
+                       cursor='arrow', spacing1=3, spacing3=3)
+        for i in range(n_blanks):
+            if i < len(parts):
+                text.insert(tk.END, parts[i])
+            text.window_create(tk.END, window=make_blank(text, i), padx=5)
+        if len(parts) > n_blanks:
+            text.insert(tk.END, parts[n_blanks])
+        text.config(state=tk.DISABLED)
+
+        def fit_height(event=None):
+            # Tall enough for every wrapped line, so the passage never scrolls on its own
+            lines = text.count('1.0', 'end-1c', 'displaylines')
+            lines = (lines[0] if isinstance(lines, tuple) else lines) or 0
+            if int(text.cget('height')) != lines + 1:
+                text.config(height=lines + 1)
+
+        text.bind('<Configure>', fit_height)
+        return text
+
     def _display_list_pick(self, question):
         self.add_media_buttons(question.get('media'))
         self.listbox = tk.Listbox(self.options_frame, selectmode=tk.MULTIPLE, height=5, font=FONT_OPTION)
@@ -1422,16 +2310,9 @@ class WifeyMOOCApp:
             frm = tk.Frame(self.options_frame, relief=tk.RIDGE, borderwidth=1, padx=5, pady=5)
             frm.grid(row=r, column=c, padx=10, pady=10, sticky=tk.N)
 
-            try:
-                img = Image.open(self.resolve_media_path(pair['image_path']))
-                img = img.resize((150, 150))
-                tkimg = ImageTk.PhotoImage(img)
-                lbl = tk.Label(frm, image=tkimg)
-                lbl.image = tkimg
-                lbl.pack()
-                lbl.bind('<Button-1>', lambda e, p=self.resolve_media_path(pair['image_path']): self.show_full_image(p))
-            except Exception:
-                tk.Label(frm, text='[Image not found]', fg='red').pack()
+            lbl = self.thumbnail_label(frm, pair['image_path'], (150, 150))
+            lbl.pack()
+            lbl.bind('<Button-1>', lambda e, p=self.resolve_media_path(pair['image_path']): self.show_full_image(p))
 
             var = tk.StringVar()
             var.set(randomized_opts[0] if randomized_opts else '')
@@ -1447,11 +2328,9 @@ class WifeyMOOCApp:
         if stim:
             if 'image' in stim:
                 try:
-                    img = Image.open(self.resolve_media_path(stim['image']))
-                    img = img.resize((120, 120))
-                    tkimg = ImageTk.PhotoImage(img)
+                    img = open_image_at_size(self.resolve_media_path(stim['image']), (120, 120))
+                    tkimg = self.images.photo("question", img)
                     self.media_label.config(image=tkimg)
-                    self.media_label.image = tkimg
                     self.media_label.bind('<Button-1>', lambda e, p=self.resolve_media_path(stim['image']): self.show_full_image(p))
                 except Exception:
                     self.feedback_label.config(text=f"Stimulus image not found: {stim['image']}", fg='red')
@@ -1488,16 +2367,9 @@ class WifeyMOOCApp:
                 tk.Label(frm, text=obj_id, font=FONT_OPTION).pack()
             elif 'image' in stim:
                 obj_id = os.path.basename(stim['image'])
-                try:
-                    img = Image.open(self.resolve_media_path(stim['image']))
-                    img = img.resize((100, 100))
-                    tkimg = ImageTk.PhotoImage(img)
-                    lbl = tk.Label(frm, image=tkimg)
-                    lbl.image = tkimg
-                    lbl.pack()
-                    lbl.bind('<Button-1>', lambda e, p=self.resolve_media_path(stim['image']): self.show_full_image(p))
-                except Exception:
-                    tk.Label(frm, text=f"Image not found: {stim['image']}", fg='red').pack()
+                lbl = self.thumbnail_label(frm, stim['image'], (100, 100), missing_text=f"Image not found: {stim['image']}")
+                lbl.pack()
+                lbl.bind('<Button-1>', lambda e, p=self.resolve_media_path(stim['image']): self.show_full_image(p))
             else:
                 obj_id = f'obj_{idx}'
 
@@ -1566,36 +2438,16 @@ class WifeyMOOCApp:
         blanks = question.get('options_for_blanks', [])
         n_blanks = len(blanks)
 
-        sentence_frame = tk.Frame(self.options_frame)
-        sentence_frame.pack(anchor=tk.W, fill=tk.X, pady=10)
+        def make_dropdown(text, i):
+            options = blanks[i]
+            max_len = max(len(str(opt)) for opt in options) if options else 10
+            var = tk.StringVar()
+            var.set(options[0] if options else '')
+            self.fill_vars.append(var)
+            return ttk.Combobox(text, textvariable=var, values=options, state='readonly', width=max_len + 2,
+                                font=FONT_SENTENCE)
 
-        tokens = []
-        for i in range(n_blanks):
-            tokens.append(parts[i])
-            tokens.append(('dropdown', blanks[i]))
-        tokens.append(parts[-1])
-
-        current_row = tk.Frame(sentence_frame)
-        current_row.pack(anchor=tk.W, fill=tk.X)
-
-        for token in tokens:
-            if isinstance(token, str):
-                lines = token.split('\n')
-                for idx, line in enumerate(lines):
-                    if line:
-                        lbl = tk.Label(current_row, text=line, font=(FONT_OPTION[0], 14), anchor=tk.W, justify=tk.LEFT)
-                        lbl.pack(side=tk.LEFT)
-                    if idx < len(lines) - 1:
-                        current_row = tk.Frame(sentence_frame)
-                        current_row.pack(anchor=tk.W, fill=tk.X)
-            elif isinstance(token, tuple) and token[0] == 'dropdown':
-                options = token[1]
-                max_len = max(len(str(opt)) for opt in options) if options else 10
-                var = tk.StringVar()
-                var.set(options[0] if options else '')
-                cmb = ttk.Combobox(current_row, textvariable=var, values=options, state='readonly', width=max_len + 2)
-                cmb.pack(side=tk.LEFT, padx=5)
-                self.fill_vars.append(var)
+        self.sentence_text(self.options_frame, parts, n_blanks, make_dropdown).pack(anchor=tk.W, fill=tk.X, pady=10)
 
     def _display_match_phrases(self, question):
         self.add_media_buttons(question.get('media'))
@@ -1644,8 +2496,7 @@ class WifeyMOOCApp:
         if len(alternatives) > 1:
             def switch_alternative():
                 self.image_tagging_alt_idx = (self.image_tagging_alt_idx + 1) % len(alternatives)
-                if DEBUG:
-                    print(f"[DEBUG] Standalone image tagging: Switching to alternative {self.image_tagging_alt_idx}")
+                tag_log.debug("Standalone image tagging: Switching to alternative %s", self.image_tagging_alt_idx)
                 self._display_image_tagging(question)  # Don't pass alt_idx, let it use the updated index
             
             self.alt_image_button.config(
@@ -1667,14 +2518,13 @@ class WifeyMOOCApp:
             return
 
         try:
-            img = Image.open(self.resolve_media_path(img_path))
+            img = open_image_at_size(self.resolve_media_path(img_path))
             canvas_w, canvas_h = img.size
-            resample = getattr(Image, "Resampling", Image).LANCZOS if hasattr(Image, "Resampling") else Image.ANTIALIAS
-            img = img.resize((canvas_w, canvas_h), resample)
-            self.tag_bg_img = ImageTk.PhotoImage(img)
+            # The previous alternative's background goes as soon as this one replaces it
+            self.images.release("question/tagging")
+            self.tag_bg_img = self.images.photo("question/tagging", img)
             
-            if DEBUG:
-                print(f"[DEBUG] Standalone image tagging: Using original size {canvas_w}x{canvas_h}, alternative {self.image_tagging_alt_idx}")
+            tag_log.debug("Standalone image tagging: Using original size %sx%s, alternative %s", canvas_w, canvas_h, self.image_tagging_alt_idx)
                 
         except Exception as e:
             self.feedback_label.config(text=f"Failed to open image: {img_path}\n{e}", fg='red')
@@ -1750,9 +2600,6 @@ class WifeyMOOCApp:
         self.tag_canvas.bind("<Button-4>", on_mouse_wheel)
         self.tag_canvas.bind("<Button-5>", on_mouse_wheel)
 
-        # Clear existing tag items
-        self.tag_items = {}
-
         # Initialize tag positions dictionary if not exists
         if not hasattr(self, "tag_positions_dict"):
             self.tag_positions_dict = {}
@@ -1760,6 +2607,15 @@ class WifeyMOOCApp:
         # FIXED: Get positions for current alternative index
         curr_tag_pos = self.tag_positions_dict.setdefault(str(self.image_tagging_alt_idx), {})
 
+        def on_drop(tag_id, x, y):
+            # FIXED: Save to current alternative index
+            curr_tag_pos = self.tag_positions_dict.setdefault(str(self.image_tagging_alt_idx), {})
+            curr_tag_pos[tag_id] = [x, y]
+            self.dirty_tag_keys.add(str(self.image_tagging_alt_idx))
+            tag_log.debug("Standalone image tagging: Tag '%s' moved to (%s, %s) on alternative %s", tag_id, x, y, self.image_tagging_alt_idx)
+
+        self.tag_drag = TagDragEngine(self.tag_canvas, on_drop)
+
         # Create draggable tags
         for i, tag in enumerate(tags):
             tag_id = tag.get('id')
@@ -1773,97 +2629,12 @@ class WifeyMOOCApp:
                 y0 = TAG_START_Y + i * 40
                 curr_tag_pos[tag_id] = [x0, y0]
 
-            # Calculate text size
-            temp_text_id = self.tag_canvas.create_text(0, 0, text=label, font=FONT_TAG, anchor=tk.NW)
-            bbox = self.tag_canvas.bbox(temp_text_id)
-            text_w = bbox[2] - bbox[0]
-            text_h = bbox[3] - bbox[1]
-            self.tag_canvas.delete(temp_text_id)
-
-            # Create tag rectangle and text
-            rect_id = self.tag_canvas.create_rectangle(
-                x0, y0, x0 + text_w + 2 * PADDING_X, y0 + text_h + 2 * PADDING_Y,
-                fill="black", outline="yellow", tags=(tag_id, "draggable")
-            )
-
-            text_id = self.tag_canvas.create_text(
-                x0 + PADDING_X, y0 + PADDING_Y, text=label,
-                font=FONT_TAG, fill="yellow", anchor=tk.NW, tags=(tag_id, "draggable")
-            )
-
-            self.tag_items[tag_id] = (rect_id, text_id)
-
-        # Tag dragging functionality
-        def tag_canvas_start_drag(event):
-            canvas = event.widget
-            canvas_x = canvas.canvasx(event.x)
-            canvas_y = canvas.canvasy(event.y)
-            item = canvas.find_closest(canvas_x, canvas_y)
-            if not item:
-                return
-
-            item = item[0]
-            tag_id = None
-            for tid, (rect_id, text_id) in self.tag_items.items():
-                if item == rect_id or item == text_id:
-                    tag_id = tid
-                    break
-
-            if tag_id:
-                self.drag_data["tag_id"] = tag_id
-                self.drag_data["x"] = canvas_x
-                self.drag_data["y"] = canvas_y
-
-        def tag_canvas_drag(event):
-            canvas = event.widget
-            if not self.drag_data["tag_id"]:
-                return
-
-            canvas_x = canvas.canvasx(event.x)
-            canvas_y = canvas.canvasy(event.y)
-            dx = canvas_x - self.drag_data["x"]
-            dy = canvas_y - self.drag_data["y"]
-
-            tag_id = self.drag_data["tag_id"]
-            if tag_id in self.tag_items:
-                rect_id, text_id = self.tag_items[tag_id]
-                canvas.move(rect_id, dx, dy)
-                canvas.move(text_id, dx, dy)
-
-            self.drag_data["x"] = canvas_x
-            self.drag_data["y"] = canvas_y
-
-        def tag_canvas_end_drag(event):
-            if self.drag_data["tag_id"]:
-                tag_id = self.drag_data["tag_id"]
-                if tag_id in self.tag_items:
-                    rect_id, text_id = self.tag_items[tag_id]
-                    bbox = self.tag_canvas.bbox(rect_id)
-                    if bbox:
-                        x, y = bbox[0], bbox[1]
-                        # FIXED: Save to current alternative index
-                        curr_tag_pos = self.tag_positions_dict.setdefault(str(self.image_tagging_alt_idx), {})
-                        curr_tag_pos[tag_id] = [x, y]
-                        
-                        if DEBUG:
-                            print(f"[DEBUG] Standalone image tagging: Tag '{tag_id}' moved to ({x}, {y}) on alternative {self.image_tagging_alt_idx}")
-
-            self.drag_data["tag_id"] = None
-
-        # Bind drag events
-        self.tag_canvas.bind("<Button-1>", tag_canvas_start_drag)
-        self.tag_canvas.bind("<B1-Motion>", tag_canvas_drag)
-        self.tag_canvas.bind("<ButtonRelease-1>", tag_canvas_end_drag)
+            self.tag_drag.add_tag(tag_id, label, x0, y0)
 
     def display_media_image(self, path):
         try:
-            img = Image.open(path)
-            base_width = 200
-            wpercent = (base_width / float(img.size[0]))
-            hsize = int((float(img.size[1]) * float(wpercent)))
-            resample = getattr(Image, "Resampling", Image).LANCZOS if hasattr(Image, "Resampling") else Image.ANTIALIAS
-            img = img.resize((base_width, hsize), resample)
-            self.media_img = ImageTk.PhotoImage(img)
+            img = open_image_at_size(path, (200, None))
+            self.media_img = self.images.photo("question", img)
             self.media_label.config(image=self.media_img, cursor="hand2")
             self.media_label.bind("<Button-1>", lambda e, p=path: self.show_full_image(p))
         except Exception:
@@ -1878,8 +2649,7 @@ class WifeyMOOCApp:
 
         try:
             if qtype == "multi_questions":
-                if DEBUG:
-                    print(f"[DEBUG] Checking multi-questions block {self.current_question}")
+                check_log.debug("Checking multi-questions block %s", self.current_question)
                     
                 # Check all sub-questions
                 all_correct = True
@@ -1889,8 +2659,7 @@ class WifeyMOOCApp:
                     sub_key = f"{self.current_question}-{i}"
                     sub_qtype = sub_question.get('type')
                     
-                    if DEBUG:
-                        print(f"[DEBUG] Checking sub-question {i} of type {sub_qtype}")
+                    check_log.debug("Checking sub-question %s of type %s", i, sub_qtype)
                     
                     # Check each sub-question type
                     if sub_qtype == 'mcq_single':
@@ -1919,8 +2688,7 @@ class WifeyMOOCApp:
                         # For unsupported types in multi-questions, assume incorrect
                         correct = False
                     
-                    if DEBUG:
-                        print(f"[DEBUG] Sub-question {i} result: {correct}")
+                    check_log.debug("Sub-question %s result: %s", i, correct)
                     
                     if not correct:
                         all_correct = False
@@ -1933,12 +2701,12 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = "multi_question_completed"
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Some parts are incorrect, please try again.", fg='red')
 
             elif qtype == "mcq_single":
-                if DEBUG:
-                    print(f"[DEBUG] Checking mcq_single: selected={self.mcq_var.get()}, correct={question_block.get('answer', [])}")
+                check_log.debug("Checking mcq_single: selected=%s, correct=%s", self.mcq_var.get(), question_block.get('answer', []))
                     
                 if self.mcq_var.get() < 0:
                     self.feedback_label.config(text="Please select an answer.", fg='red')
@@ -1951,14 +2719,14 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = self.mcq_var.get()
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect, please try again.", fg='red')
 
             elif qtype == "mcq_multiple":
                 selected = [i for i, var in enumerate(self.mcq_vars) if var.get() == 1]
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking mcq_multiple: selected={selected}, correct={question_block.get('answer', [])}")
+                check_log.debug("Checking mcq_multiple: selected=%s, correct=%s", selected, question_block.get('answer', []))
                     
                 if not selected:
                     self.feedback_label.config(text="Please select at least one answer.", fg='red')
@@ -1971,14 +2739,14 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = selected
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect selection, please try again.", fg='red')
             elif qtype == "word_fill":
                 user_answers = [entry.get().strip() for entry in self.fill_words_entries]
                 correct_answers = question_block.get('answers', [])
 
-                if DEBUG:
-                    print(f"[DEBUG] Checking word_fill: user={user_answers}, correct={correct_answers}")
+                check_log.debug("Checking word_fill: user=%s, correct=%s", user_answers, correct_answers)
 
                 all_correct = (
                     len(user_answers) == len(correct_answers)
@@ -1992,14 +2760,14 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answers
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Some answers are incorrect, please try again.", fg='red')
             elif qtype == "list_pick":
                 selected_indices = list(self.listbox.curselection())
                 correct_answer = set(question_block.get('answer', []))
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking list_pick: selected={selected_indices}, correct={list(correct_answer)}")
+                check_log.debug("Checking list_pick: selected=%s, correct=%s", selected_indices, list(correct_answer))
                     
                 if not selected_indices:
                     self.feedback_label.config(text="Please select at least one option.", fg='red')
@@ -2011,6 +2779,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = selected_indices
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect selection, please try again.", fg='red')
 
@@ -2018,8 +2787,7 @@ class WifeyMOOCApp:
                 user_answer = {key: var.get() for key, var in self.match_vars.items()}
                 correct_answer = question_block.get('answer', {})
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking match_sentence: user={user_answer}, correct={correct_answer}")
+                check_log.debug("Checking match_sentence: user=%s, correct=%s", user_answer, correct_answer)
                     
                 if user_answer == correct_answer:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2028,6 +2796,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answer
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect matching, please try again.", fg='red')
 
@@ -2035,8 +2804,7 @@ class WifeyMOOCApp:
                 user_answer = self.categ_var.get()
                 correct_answer = question_block.get('correct', '')
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking categorization: user='{user_answer}', correct='{correct_answer}'")
+                check_log.debug("Checking categorization: user='%s', correct='%s'", user_answer, correct_answer)
                     
                 if user_answer == correct_answer:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2045,6 +2813,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answer
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect category, please try again.", fg='red')
 
@@ -2052,8 +2821,7 @@ class WifeyMOOCApp:
                 user_answer = {key: var.get() for key, var in self.cat_vars.items()}
                 correct_answer = question_block.get('answer', {})
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking categorization_multiple: user={user_answer}, correct={correct_answer}")
+                check_log.debug("Checking categorization_multiple: user=%s, correct=%s", user_answer, correct_answer)
                     
                 if user_answer == correct_answer:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2062,6 +2830,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answer
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="One or more categories incorrect, please try again.", fg='red')
 
@@ -2070,8 +2839,7 @@ class WifeyMOOCApp:
                     user_sequence = [int(entry.get()) - 1 for entry in self.seq_entries if entry.get()]
                     correct_sequence = question_block.get('answer', [])
                     
-                    if DEBUG:
-                        print(f"[DEBUG] Checking sequence_audio: user={user_sequence}, correct={correct_sequence}")
+                    check_log.debug("Checking sequence_audio: user=%s, correct=%s", user_sequence, correct_sequence)
                         
                     if len(user_sequence) != len(self.seq_entries):
                         self.feedback_label.config(text="Please complete the sequence.", fg='red')
@@ -2083,6 +2851,7 @@ class WifeyMOOCApp:
                         if self.current_question not in self.student_answers:
                             self.score += 1
                         self.student_answers[self.current_question] = user_sequence
+                        self.autosave()
                     else:
                         self.feedback_label.config(text="Incorrect sequence, please try again.", fg='red')
                 except ValueError:
@@ -2092,8 +2861,7 @@ class WifeyMOOCApp:
                 user_order = [var.get() for var in self.word_vars]
                 correct_order = question_block.get('answer', [])
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking order_phrase: user={user_order}, correct={correct_order}")
+                check_log.debug("Checking order_phrase: user=%s, correct=%s", user_order, correct_order)
                     
                 if user_order == correct_order:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2102,6 +2870,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_order
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect order, please try again.", fg='red')
 
@@ -2109,8 +2878,7 @@ class WifeyMOOCApp:
                 user_answers = [var.get() for var in self.fill_vars]
                 correct_answers = question_block.get('answers', [])
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking fill_blanks_dropdown: user={user_answers}, correct={correct_answers}")
+                check_log.debug("Checking fill_blanks_dropdown: user=%s, correct=%s", user_answers, correct_answers)
                     
                 if user_answers == correct_answers:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2119,6 +2887,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answers
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Some blanks are incorrect, please try again.", fg='red')
 
@@ -2126,8 +2895,7 @@ class WifeyMOOCApp:
                 user_answer = {key: var.get() for key, var in self.match_vars.items()}
                 correct_answer = question_block.get('answer', {})
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking match_phrases: user={user_answer}, correct={correct_answer}")
+                check_log.debug("Checking match_phrases: user=%s, correct=%s", user_answer, correct_answer)
                     
                 if user_answer == correct_answer:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2136,6 +2904,7 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answer
+                    self.autosave()
                 else:
                     self.feedback_label.config(text="Incorrect matching, please try again.", fg='red')
 
@@ -2144,8 +2913,7 @@ class WifeyMOOCApp:
                 alternatives = [question_block] + question_block.get("alternatives", [])
                 alt_idx = getattr(self, "image_tagging_alt_idx", 0)
                 
-                if DEBUG:
-                    print(f"[DEBUG] Checking image_tagging: alternative {alt_idx} of {len(alternatives)}")
+                check_log.debug("Checking image_tagging: alternative %s of %s", alt_idx, len(alternatives))
                 
                 if alt_idx < len(alternatives):
                     current_alternative = alternatives[alt_idx]
@@ -2158,21 +2926,16 @@ class WifeyMOOCApp:
                 
                 # Get correct answer
                 ans = current_alternative.get('answer', {})
-                tolerance = 50
-                correct = True
+                tolerances, default_tolerance = tag_tolerances(current_alternative, question_block.get('tolerance', TAG_TOLERANCE))
                 
-                if DEBUG:
-                    print(f"[DEBUG] Image tagging positions: {curr_tag_pos}")
-                    print(f"[DEBUG] Expected positions: {ans}")
+                check_log.debug("Image tagging positions: %s", curr_tag_pos)
+                check_log.debug("Expected positions: %s", ans)
                 
-                for tag_id, (cx, cy) in ans.items():
-                    ux, uy = curr_tag_pos.get(tag_id, [-10000, -10000])
-                    dist = ((cx - ux) ** 2 + (cy - uy) ** 2) ** 0.5
-                    if DEBUG:
-                        print(f"[DEBUG] Tag '{tag_id}': placed at ({ux:.1f},{uy:.1f}), expected ({cx},{cy}), distance {dist:.1f}")
-                    if dist > tolerance:
-                        correct = False
-                        break
+                tag_ids, distances, within = grade_tag_positions(ans, curr_tag_pos, tolerances, default_tolerance)
+                correct = bool(all(within))
+                if check_log.isEnabledFor(logging.DEBUG):
+                    for tag_id, dist in zip(tag_ids, distances):
+                        check_log.debug("Tag '%s': placed at %s, expected %s, distance %.1f", tag_id, curr_tag_pos.get(tag_id), ans[tag_id], dist)
 
                 if correct:
                     self.feedback_label.config(text="Correct!", fg='green')
@@ -2181,18 +2944,20 @@ class WifeyMOOCApp:
                     if self.current_question not in self.student_answers:
                         self.score += 1
                     self.student_answers[self.current_question] = user_answer
+                    self.autosave()
                 else:
-                    self.feedback_label.config(text="Incorrect, please try again.", fg='red')
+                    self.feedback_label.config(
+                        text=self._image_tagging_feedback(current_alternative, ans, curr_tag_pos, tag_ids, within),
+                        fg='red'
+                    )
 
             else:
-                if DEBUG:
-                    print(f"[DEBUG] Unsupported question type: {qtype}")
+                check_log.debug("Unsupported question type: %s", qtype)
                 self.feedback_label.config(text=f"Unsupported question type: {qtype}", fg='red')
                 return
 
         except Exception as e:
-            if DEBUG:
-                print(f"[DEBUG] Error checking answer: {e}")
+            check_log.exception("Error checking answer")
             self.feedback_label.config(text=f"Error checking answer: {e}", fg='red')
             return
 
@@ -2205,8 +2970,7 @@ class WifeyMOOCApp:
             return False
         correct_answer = question.get('answer', [])
         result = var.get() in correct_answer
-        if DEBUG:
-            print(f"[DEBUG] MCQ Single in frame {key}: selected={var.get()}, correct={correct_answer}, result={result}")
+        check_log.debug("MCQ Single in frame %s: selected=%s, correct=%s, result=%s", key, var.get(), correct_answer, result)
         return result
 
     def _check_mcq_multiple_in_frame(self, question, key):
@@ -2216,8 +2980,7 @@ class WifeyMOOCApp:
         selected = [i for i, var in enumerate(vars_list) if var.get() == 1]
         correct_answer = set(question.get('answer', []))
         result = set(selected) == correct_answer
-        if DEBUG:
-            print(f"[DEBUG] MCQ Multiple in frame {key}: selected={selected}, correct={list(correct_answer)}, result={result}")
+        check_log.debug("MCQ Multiple in frame %s: selected=%s, correct=%s, result=%s", key, selected, list(correct_answer), result)
         return result
 
     def _check_word_fill_in_frame(self, question, key):
@@ -2233,8 +2996,7 @@ class WifeyMOOCApp:
             and all(user.lower() == correct.lower() for user, correct in zip(user_answers, correct_answers))
         )
 
-        if DEBUG:
-            print(f"[DEBUG] Word Fill in frame {key}: user={user_answers}, correct={correct_answers}, result={result}")
+        check_log.debug("Word Fill in frame %s: user=%s, correct=%s, result=%s", key, user_answers, correct_answers, result)
 
         return result
 
@@ -2248,8 +3010,7 @@ class WifeyMOOCApp:
         selected_indices = list(listbox.curselection())
         correct_answer = set(question.get('answer', []))
         result = set(selected_indices) == correct_answer
-        if DEBUG:
-            print(f"[DEBUG] List Pick in frame {key}: selected={selected_indices}, correct={list(correct_answer)}, result={result}")
+        check_log.debug("List Pick in frame %s: selected=%s, correct=%s, result=%s", key, selected_indices, list(correct_answer), result)
         return result
 
     def _check_sequence_audio_in_frame(self, question, key):
@@ -2262,12 +3023,10 @@ class WifeyMOOCApp:
                 return False
             correct_sequence = question.get('answer', [])
             result = user_sequence == correct_sequence
-            if DEBUG:
-                print(f"[DEBUG] Sequence Audio in frame {key}: user={user_sequence}, correct={correct_sequence}, result={result}")
+            check_log.debug("Sequence Audio in frame %s: user=%s, correct=%s, result=%s", key, user_sequence, correct_sequence, result)
             return result
         except ValueError:
-            if DEBUG:
-                print(f"[DEBUG] Sequence Audio in frame {key}: Invalid number format")
+            check_log.debug("Sequence Audio in frame %s: Invalid number format", key)
             return False
 
     def _check_match_sentence_in_frame(self, question, key):
@@ -2277,8 +3036,7 @@ class WifeyMOOCApp:
         user_answer = {k: var.get() for k, var in match_vars.items()}
         correct_answer = question.get('answer', {})
         result = user_answer == correct_answer
-        if DEBUG:
-            print(f"[DEBUG] Match Sentence in frame {key}: user={user_answer}, correct={correct_answer}, result={result}")
+        check_log.debug("Match Sentence in frame %s: user=%s, correct=%s, result=%s", key, user_answer, correct_answer, result)
         return result
 
     def _check_match_phrases_in_frame(self, question, key):
@@ -2289,8 +3047,7 @@ class WifeyMOOCApp:
         user_answer = {k: var.get() for k, var in match_vars.items()}
         correct_answer = question.get('answer', {})
         result = user_answer == correct_answer
-        if DEBUG:
-            print(f"[DEBUG] Match Phrases in frame {key}: user={user_answer}, correct={correct_answer}, result={result}")
+        check_log.debug("Match Phrases in frame %s: user=%s, correct=%s, result=%s", key, user_answer, correct_answer, result)
         return result
 
     def _check_fill_blanks_dropdown_in_frame(self, question, key):
@@ -2300,8 +3057,7 @@ class WifeyMOOCApp:
         user_answers = [var.get() for var in fill_vars]
         correct_answers = question.get('answers', [])
         result = user_answers == correct_answers
-        if DEBUG:
-            print(f"[DEBUG] Fill Blanks Dropdown in frame {key}: user={user_answers}, correct={correct_answers}, result={result}")
+        check_log.debug("Fill Blanks Dropdown in frame %s: user=%s, correct=%s, result=%s", key, user_answers, correct_answers, result)
         return result
 
     def _check_order_phrase_in_frame(self, question, key):
@@ -2311,8 +3067,7 @@ class WifeyMOOCApp:
         user_order = [label['text'] for label in word_labels]
         correct_order = question.get('answer', [])
         result = user_order == correct_order
-        if DEBUG:
-            print(f"[DEBUG] Order Phrase in frame {key}: user={user_order}, correct={correct_order}, result={result}")
+        check_log.debug("Order Phrase in frame %s: user=%s, correct=%s, result=%s", key, user_order, correct_order, result)
         return result
 
     def _check_categorization_multiple_in_frame(self, question, key):
@@ -2322,8 +3077,7 @@ class WifeyMOOCApp:
         user_answer = {k: var.get() for k, var in cat_vars.items()}
         correct_answer = question.get('answer', {})
         result = user_answer == correct_answer
-        if DEBUG:
-            print(f"[DEBUG] Categorization Multiple in frame {key}: user={user_answer}, correct={correct_answer}, result={result}")
+        check_log.debug("Categorization Multiple in frame %s: user=%s, correct=%s, result=%s", key, user_answer, correct_answer, result)
         return result
 
     def _check_image_tagging_in_frame(self, question, key):
@@ -2346,25 +3100,35 @@ class WifeyMOOCApp:
         
         # Get correct answer
         ans = current_alternative.get('answer', {})
-        tolerance = 50
+        tolerances, default_tolerance = tag_tolerances(current_alternative, question.get('tolerance', TAG_TOLERANCE))
         
-        if DEBUG:
-            print(f"[DEBUG] Image Tagging in frame {key}: alternative {alt_idx}")
-            print(f"[DEBUG] User positions: {curr_tag_pos}")
-            print(f"[DEBUG] Expected positions: {ans}")
+        check_log.debug("Image Tagging in frame %s: alternative %s", key, alt_idx)
+        check_log.debug("User positions: %s", curr_tag_pos)
+        check_log.debug("Expected positions: %s", ans)
         
-        for tag_id, (cx, cy) in ans.items():
-            ux, uy = curr_tag_pos.get(tag_id, [-10000, -10000])
-            dist = ((cx - ux) ** 2 + (cy - uy) ** 2) ** 0.5
-            if DEBUG:
-                print(f"[DEBUG] Tag '{tag_id}': placed at ({ux}, {uy}), expected ({cx}, {cy}), distance {dist:.1f}")
-            if dist > tolerance:
-                return False
+        tag_ids, distances, within = grade_tag_positions(ans, curr_tag_pos, tolerances, default_tolerance)
+        if check_log.isEnabledFor(logging.DEBUG):
+            for tag_id, dist in zip(tag_ids, distances):
+                check_log.debug("Tag '%s': placed at %s, expected %s, distance %.1f", tag_id, curr_tag_pos.get(tag_id), ans[tag_id], dist)
         
-        return True
+        return bool(all(within))
+
+    def _image_tagging_feedback(self, question, ans, curr_tag_pos, tag_ids, within):
+        """Incorrect-answer text with a nudge for the first tag that sits on another tag's spot."""
+        n_ok = sum(1 for ok in within if ok)
+        text = f"Incorrect, please try again. ({n_ok}/{len(tag_ids)} tags in the right place)"
+
+        misplaced = [tag_id for tag_id, ok in zip(tag_ids, within) if not ok]
+        labels = {tag.get('id'): tag.get('label', tag.get('id')) for tag in question.get('tags', [])}
+        for tag_id, target_id in nearest_tag_targets(ans, curr_tag_pos, misplaced).items():
+            if target_id is not None and target_id != tag_id:
+                text += f"\n'{labels.get(tag_id, tag_id)}' is closest to where '{labels.get(target_id, target_id)}' goes."
+                break
+        return text
 
     def next_question(self):
         self.current_question += 1
+        self.autosave(answered=False)
         if self.current_question >= len(self.questions):
             self.activity_completed()
         else:
@@ -2372,6 +3136,7 @@ class WifeyMOOCApp:
 
     def skip_question(self):
         self.current_question += 1
+        self.autosave(answered=False)
         if self.current_question >= len(self.questions):
             self.activity_completed()
         else:
@@ -2379,15 +3144,19 @@ class WifeyMOOCApp:
 
     def activity_completed(self):
         messagebox.showinfo("Complete", f"Quiz completed! Your score: {self.score}/{len(self.questions)}")
-        self.root.destroy()
+        self.on_close()
 
     def show_full_image(self, path):
         try:
             top = tk.Toplevel(self.root)
+            self.preview_count += 1
+            owner = f"preview-{self.preview_count}"
+            top.bind('<Destroy>', lambda e: self.images.release(owner))
             top.title("Image Preview")
             top.geometry('700x500')
 
-            img = Image.open(path)
+            # Never bigger than the screen, so resizing the window stays cheap
+            img = open_image_at_size(path, (top.winfo_screenwidth(), top.winfo_screenheight()), upscale=False)
             w, h = img.size
 
             label = tk.Label(top, bg='black')
@@ -2409,9 +3178,9 @@ class WifeyMOOCApp:
 
                 resample = getattr(Image, "Resampling", Image).LANCZOS if hasattr(Image, "Resampling") else Image.ANTIALIAS
                 resized = img.resize((new_w, new_h), resample)
-                photo = ImageTk.PhotoImage(resized)
+                self.images.release(owner) # Only the current size is kept
+                photo = self.images.photo(owner, resized)
                 label.config(image=photo)
-                label.image = photo
 
             top.bind('<Configure>', resize)
             top.after(100, resize)
@@ -2423,6 +3192,7 @@ class WifeyMOOCApp:
             messagebox.showerror("Error", f"Failed to open image preview:\n{e}")
 
     def launch_file(self, path):
+        import platform, subprocess
         try:
             if platform.system() == 'Darwin':
                 subprocess.Popen(['open', path])
@@ -2436,6 +3206,7 @@ class WifeyMOOCApp:
             messagebox.showerror("Error", f"Failed to open file:\n{e}")
 
     def open_audio(self, path):
+        import platform, subprocess
         try:
             if platform.system() == 'Darwin':
                 mac_ver = platform.mac_ver()[0]
@@ -2475,12 +3246,40 @@ def main():
     parser = argparse.ArgumentParser(description='Wifey MOOC Application')
     parser.add_argument('--question-file', type=str, help='Path to the question file to load')
     parser.add_argument('--progress-file', type=str, help='Path to the progress file to load')
+    parser.add_argument('--log-level', type=str.upper, default=DEFAULT_LOG_LEVEL,
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        help=f'Console log verbosity (default: {DEFAULT_LOG_LEVEL})')
+    parser.add_argument('--profile-memory', nargs='?', const='memory-profile.txt', default=None, metavar='REPORT',
+                        help='Trace allocations with tracemalloc and write per-question / per-flashcard-batch '
+                             'diffs and a peak summary to REPORT (default: memory-profile.txt); much slower')
 
     args = parser.parse_args()
+    setup_logging(args.log_level)
+
+    memory_profile = None
+    if args.profile_memory:
+        from wifeymooc_memprofile import MemoryProfile # Profiling runs only
+        warm_up_imports() # Now rather than in the background, so their module code isn't in every snapshot
+        memory_profile = MemoryProfile(args.profile_memory)
 
     root = tk.Tk()
-    app = WifeyMOOCApp(root, args.question_file, args.progress_file)
+    # Exceptions raised inside Tk callbacks don't reach sys.excepthook
+    root.report_callback_exception = report_crash
+    # Paint the window (on the welcome screen) first, then load the quiz; Pillow and
+    # NumPy load in the background meanwhile, or on first use if that comes sooner
+    app = WifeyMOOCApp(root)
+    root.update()
+    threading.Thread(target=warm_up_imports, name="wifeymooc-imports", daemon=True).start()
+    if memory_profile:
+        app.memory_profile = memory_profile
+        app.memory_checkpoint("window shown")
+    if args.progress_file:
+        app.load_progress_from_file(args.progress_file)
+    elif args.question_file:
+        app.load_questions_from_file(args.question_file)
     root.mainloop()
+    if memory_profile:
+        print(f"🧠 Memory profile: {memory_profile.close()}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,224 @@
+"""
+Memory profiling for WifeyMOOC and json_to_paper (--profile-memory) 🧠
+
+Both entry points create one MemoryProfile when started with --profile-memory and
+call checkpoint() at fixed points: after a file loads, after each question or
+flashcard batch, after each exercise a worksheet renders. Every checkpoint takes
+a tracemalloc snapshot and appends to the report:
+
+    - traced memory now, and its peak since the previous checkpoint
+    - which subsystems grew: allocations are charged to the innermost function of
+      this repo in their traceback (e.g. FlashcardSession.load_progress), or to
+      the library they came from when no repo code was involved
+    - the top allocation diffs by source line
+    - anything else the caller passes along (Tk image count, attempts stored...)
+
+close() appends the peak summary. tracemalloc only sees Python's own allocations;
+Pillow's pixel buffers and Tk images are malloc'd outside it, so each checkpoint
+also records the process RSS. A snapshot costs time in proportion to the live
+allocations, and module code is a big share of those, so the entry points import
+their heavy libraries before tracing starts. Tracing still slows everything down.
+"""
+
+import ast
+import functools
+import linecache
+import os
+import resource
+import time
+import tracemalloc
+
+DEFAULT_REPORT = "memory-profile.txt"
+TRACE_FRAMES = 10 # Traceback depth kept per allocation, to find the repo function behind library code
+TOP_DIFFS = 10 # Source lines listed per checkpoint
+TOP_SUBSYSTEMS = 8 # Subsystems listed per checkpoint
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# tracemalloc.Snapshot.filter_traces() is too slow to run per checkpoint, so the
+# profiler's own allocations are left out while the snapshot is summarized instead
+OWN_FILES = {__file__, tracemalloc.__file__}
+
+
+def _mb(size):
+    return size / (1024 * 1024)
+
+
+def current_rss_mb():
+    """Resident set size now (Linux), else the peak so far"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # KB on Linux, bytes on macOS
+
+
+@functools.lru_cache(maxsize=None)
+def _function_lines(filename):
+    """{line number: "Class.method" or "function"} for one of the repo's files"""
+    try:
+        tree = ast.parse("".join(linecache.getlines(filename)))
+    except (SyntaxError, ValueError):
+        return {}
+    names = {}
+
+    def claim(node, name):
+        for line in range(node.lineno, node.end_lineno + 1):
+            names[line] = name
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            claim(node, node.name)
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    claim(item, f"{node.name}.{item.name}")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            claim(node, node.name)
+    return names
+
+
+def _library(filename):
+    """Short name of the library a file belongs to, e.g. PIL, tkinter, json"""
+    if filename.startswith("<"):
+        return filename # <frozen importlib._bootstrap>, <unknown>...
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts and parts.index(marker) + 1 < len(parts):
+            return parts[parts.index(marker) + 1].split(".")[0]
+    # Standard library: the package or module right under lib/pythonX.Y
+    for i, part in enumerate(parts[:-1]):
+        if part.startswith("python") and part[6:7].isdigit():
+            return os.path.splitext(parts[i + 1])[0]
+    return os.path.basename(filename)
+
+
+def _grouped_traces(snapshot):
+    """{frames: [size, count]} with frames as ((filename, lineno), ...), most recent first
+
+    Snapshot.statistics() builds a Traceback object per trace and is several times
+    slower, which adds up at one checkpoint per question, so the raw trace tuples
+    (Snapshot.traces._traces) are grouped directly when this Python has them.
+    """
+    groups = {}
+    raw = getattr(snapshot.traces, "_traces", None)
+    if raw is None:
+        for stat in snapshot.statistics("traceback"):
+            groups[tuple((f.filename, f.lineno) for f in reversed(stat.traceback))] = [stat.size, stat.count]
+        return groups
+    for trace in raw:
+        size, frames = trace[1], trace[2] # (domain, size, frames, total_nframe)
+        group = groups.get(frames)
+        if group is None:
+            groups[frames] = [size, 1]
+        else:
+            group[0] += size
+            group[1] += 1
+    return groups
+
+
+class MemoryProfile:
+    def __init__(self, report_path=DEFAULT_REPORT, frames=TRACE_FRAMES):
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.last_lines = {} # (file, line) -> (size, count) at the last checkpoint, for the line diffs
+        self.first_sizes = None # Per-subsystem sizes at the first checkpoint
+        self.last_sizes = {}
+        self.checkpoints = [] # (label, traced MB, peak MB since the previous one, RSS MB)
+        self.checkpoint_seconds = 0.0 # Time spent in checkpoint() itself
+        self.subsystems = {} # hash(frames) -> subsystem name; most tracebacks show up again at every checkpoint
+        tracemalloc.start(frames)
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            f.write(f"🧠 Memory profile, started {time.strftime('%Y-%m-%d %H:%M:%S')} ({frames} frames per allocation)\n")
+
+    def subsystem(self, frames):
+        """Innermost repo function in the traceback, else the library of the innermost frame
+
+        None for the profiler's own allocations (snapshots, parsed sources).
+        """
+        for filename, lineno in frames:
+            if filename in OWN_FILES:
+                return None
+            if filename.startswith(ROOT) and os.sep + "benchmarks" + os.sep not in filename:
+                name = _function_lines(filename).get(lineno)
+                module = os.path.splitext(os.path.basename(filename))[0]
+                return f"{module}: {name}" if name else f"{module}: <module>"
+        return _library(frames[0][0]) if frames else "<unknown>"
+
+    def checkpoint(self, label, extra=None):
+        """Snapshot now and append the diff against the previous checkpoint to the report"""
+        start = time.perf_counter()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        snapshot = tracemalloc.take_snapshot()
+        rss = current_rss_mb()
+
+        sizes = {}
+        # Per-line totals rather than the whole snapshot are kept for the next diff,
+        # so the profiler doesn't hold (and count) a copy of every trace
+        line_sizes = {}
+        for frames, (trace_size, trace_count) in _grouped_traces(snapshot).items():
+            # Keyed by hash, so the cache doesn't keep thousands of traced frame tuples alive
+            key = hash(frames)
+            name = self.subsystems.get(key, False)
+            if name is False:
+                name = self.subsystems[key] = self.subsystem(frames)
+            if name is None:
+                continue
+            size, count = sizes.get(name, (0, 0))
+            sizes[name] = (size + trace_size, count + trace_count)
+            if frames:
+                size, count = line_sizes.get(frames[0], (0, 0))
+                line_sizes[frames[0]] = (size + trace_size, count + trace_count)
+        del snapshot
+        current = sum(size for size, count in sizes.values())
+        if self.first_sizes is None:
+            self.first_sizes = sizes
+
+        growth = sorted(((size - self.last_sizes.get(name, (0, 0))[0], name, size)
+                         for name, (size, count) in sizes.items()), reverse=True)
+        lines = [f"\n=== #{len(self.checkpoints) + 1} {label} [t={start - self.started:.1f}s]",
+                 f"traced {_mb(current):.2f} MB, peak since last checkpoint {_mb(peak):.2f} MB, RSS {rss:.1f} MB"]
+        for key, value in (extra or {}).items():
+            lines.append(f"{key}: {value}")
+        lines.append("subsystems (change, now):")
+        for delta, name, size in [g for g in growth if g[0]][:TOP_SUBSYSTEMS]:
+            lines.append(f"  {delta / 1024:+10.1f} KiB  {size / 1024:10.1f} KiB  {name}")
+        if self.checkpoints:
+            lines.append("top allocation diffs:")
+            diffs = []
+            for key in line_sizes.keys() | self.last_lines.keys():
+                size, count = line_sizes.get(key, (0, 0))
+                old_size, old_count = self.last_lines.get(key, (0, 0))
+                if size != old_size:
+                    diffs.append((size - old_size, count - old_count, key))
+            for size_diff, count_diff, (filename, lineno) in sorted(diffs, key=lambda d: abs(d[0]), reverse=True)[:TOP_DIFFS]:
+                where = os.path.relpath(filename, ROOT) if filename.startswith(ROOT) else filename
+                lines.append(f"  {size_diff / 1024:+10.1f} KiB {count_diff:+8d} blocks  {where}:{lineno}")
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        self.last_sizes = sizes
+        self.last_lines = line_sizes
+        self.checkpoints.append((label, _mb(current), _mb(peak), rss))
+        self.checkpoint_seconds += time.perf_counter() - start
+
+    def close(self):
+        """Append the peak summary and stop tracing; returns the report path"""
+        if not tracemalloc.is_tracing():
+            return self.report_path
+        self.checkpoint("end")
+        tracemalloc.stop()
+        peak_label, _, peak_mb, _ = max(self.checkpoints, key=lambda c: c[2])
+        lines = [f"\n=== Summary ({len(self.checkpoints)} checkpoints, "
+                 f"{self.checkpoint_seconds:.1f}s of it spent taking snapshots)",
+                 f"peak traced: {peak_mb:.2f} MB, reached on the way to '{peak_label}'",
+                 f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB",
+                 "growth from the first checkpoint to the last, by subsystem:"]
+        growth = sorted(((size - self.first_sizes.get(name, (0, 0))[0], name, size)
+                         for name, (size, count) in self.last_sizes.items()), reverse=True)
+        for delta, name, size in growth[:TOP_SUBSYSTEMS]:
+            lines.append(f"  {delta / 1024:+10.1f} KiB  {size / 1024:10.1f} KiB  {name}")
+        lines.append(f"{'checkpoint':<48} {'traced':>10} {'peak':>10} {'RSS':>10}")
+        for label, current, peak, rss in self.checkpoints:
+            lines.append(f"{label[:48]:<48} {current:8.2f}MB {peak:8.2f}MB {rss:8.1f}MB")
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return self.report_path